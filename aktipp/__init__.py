@@ -1,3 +1,25 @@
-from . import etl, eval, normalize, scraping
+import importlib
 
-__all__ = ["etl", "eval", "normalize", "scraping"]
+__all__ = [
+    "etl",
+    "eval",
+    "live",
+    "models",
+    "normalize",
+    "scraping",
+    "serving",
+    "simulation",
+    "tracing",
+]
+
+
+def __getattr__(name: str):
+    # subpackages are imported on first access, so e.g. a scrape job does not pay
+    # for importing polars, NumPy and the rest of the pipeline
+    if name in __all__:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(__all__)
@@ -0,0 +1,127 @@
+import contextlib
+import gzip
+import json
+import os
+from collections.abc import Iterator
+from typing import BinaryIO
+
+# file extension of a raw season for every compression
+RAW_COMPRESSIONS = {None: ".json", "gzip": ".json.gz", "zstd": ".json.zst"}
+
+# the raw json repeats league names and team icon urls in every match, a season
+# shrinks about 25x with gzip and 30x with zstd at these levels in ~15 ms, higher
+# zstd levels gain another 10% for 30x the time
+_COMPRESSION_LEVELS = {"gzip": 9, "zstd": 10}
+
+
+def _validate_compression(compression: str | None) -> None:
+    if compression not in RAW_COMPRESSIONS:
+        raise ValueError(f"compression must be in {list(RAW_COMPRESSIONS)}")
+
+
+def _raw_season_path(
+    data_path: str, league: str, season: int, compression: str | None = None
+) -> str:
+    """Path of a raw season file named like 'league_season.json[.gz|.zst]'."""
+    _validate_compression(compression)
+    return f"{data_path}{league}_{season}{RAW_COMPRESSIONS[compression]}"
+
+
+def _find_raw_season(data_path: str, league: str, season: int) -> str | None:
+    """Path of the raw season file in any compression, None if there is none."""
+    for compression in RAW_COMPRESSIONS:
+        path = _raw_season_path(data_path, league, season, compression)
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def _write_raw_season(
+    data: list[dict],
+    data_path: str,
+    league: str,
+    season: int,
+    compression: str | None = None,
+) -> str:
+    """Dump a raw season as json, compressed while it is written. Files of the
+    season in the other compressions are removed, so _find_raw_season never finds
+    an outdated variant.
+
+    Parameters
+    ----------
+    data : list[dict]
+        Match records in the format of https://api.openligadb.de/getmatchdata.
+    data_path : str
+        Path where the data should be dumped.
+    league : str
+        String identifier from the league, e.g. 'bl1'.
+    season : int
+        Year indicating the start of a season, e.g. 2023 for the 2023/2024 season.
+    compression : str | None, default=None
+        None for plain json, "gzip" or "zstd".
+
+    Returns
+    -------
+    path : str
+        Path of the written file.
+    """
+    path = _raw_season_path(data_path, league, season, compression)
+    if compression is None:
+        with open(path, "w") as file:
+            json.dump(data, file)
+    else:
+        contents = json.dumps(data).encode()
+        if compression == "gzip":
+            with gzip.open(
+                path, "wb", compresslevel=_COMPRESSION_LEVELS["gzip"]
+            ) as file:
+                file.write(contents)
+        else:
+            import zstandard
+
+            compressor = zstandard.ZstdCompressor(level=_COMPRESSION_LEVELS["zstd"])
+            with open(path, "wb") as file:
+                file.write(compressor.compress(contents))
+
+    for other in RAW_COMPRESSIONS:
+        if other != compression:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(_raw_season_path(data_path, league, season, other))
+    return path
+
+
+@contextlib.contextmanager
+def _open_raw_season(path: str) -> Iterator[BinaryIO]:
+    """Open a raw season file for reading. Compressed files are decompressed as a
+    stream while they are read, the decompressed json never touches the disk.
+
+    Parameters
+    ----------
+    path : str
+        Path of the raw season file, the compression is derived from the extension.
+
+    Yields
+    ------
+    file : BinaryIO
+        Binary file object with the decompressed json.
+    """
+    if path.endswith(RAW_COMPRESSIONS["gzip"]):
+        with gzip.open(path, "rb") as file:
+            yield file
+    elif path.endswith(RAW_COMPRESSIONS["zstd"]):
+        import zstandard
+
+        decompressor = zstandard.ZstdDecompressor()
+        with open(path, "rb") as compressed, decompressor.stream_reader(
+            compressed
+        ) as file:
+            yield file
+    else:
+        with open(path, "rb") as file:
+            yield file
+
+
+def _read_raw_season(path: str) -> list[dict]:
+    """Load a raw season file in any compression."""
+    with _open_raw_season(path) as file:
+        return json.load(file)
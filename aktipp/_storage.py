@@ -0,0 +1,164 @@
+import polars as pl
+
+# named parquet storage profiles
+# - compression, compression_level: codec and level, None for the codec default
+# - row_group_size: rows per row group, None for the writer default
+# - statistics: write min/max statistics, which scans use to skip row groups
+# - dictionary: dictionary encode columns, the native polars writer always tries a
+#   dictionary first, without it the files are written by pyarrow
+# - sort: sort the rows by the sort order of the artifact, so row groups cover
+#   narrow ranges of league_id and match_day and filters skip most of them
+STORAGE_PROFILES = {
+    # the polars defaults, rows are written in the order they are created
+    "default": {
+        "compression": "zstd",
+        "compression_level": None,
+        "row_group_size": None,
+        "statistics": True,
+        "dictionary": True,
+        "sort": False,
+    },
+    # data that is read and filtered often, cheap to decode in small row groups
+    "hot": {
+        "compression": "lz4",
+        "compression_level": None,
+        "row_group_size": 16_384,
+        "statistics": True,
+        "dictionary": True,
+        "sort": True,
+    },
+    # data that is rarely read, as small as possible
+    "archive": {
+        "compression": "zstd",
+        "compression_level": 19,
+        "row_group_size": 1_048_576,
+        "statistics": True,
+        "dictionary": True,
+        "sort": True,
+    },
+}
+
+# sort order of every artifact, columns missing in an artifact are skipped, e.g.
+# league_id in the clean goals
+_SORT_ORDERS = {
+    "normalized": ["leagueId", "group.groupOrderID", "matchID"],
+    "clean": ["league_id", "match_day", "match_id"],
+    "standings": ["league_id", "match_day", "team_id"],
+    "performance": ["league_id", "match_day", "team_id"],
+    "ratings": ["league_id", "match_day", "team_id"],
+    "goal_events": ["league_id", "match_day", "team_id"],
+    "head_to_head": ["team_id_low", "team_id_high", "time_key"],
+}
+
+
+def _validate_storage_profile(storage_profile: str) -> None:
+    if storage_profile not in STORAGE_PROFILES:
+        raise ValueError(f"storage_profile must be in {list(STORAGE_PROFILES)}")
+
+
+def _write_parquet(
+    data: pl.DataFrame | pl.LazyFrame,
+    path: str,
+    artifact: str,
+    storage_profile: str = "default",
+) -> None:
+    """Write an artifact as parquet with the settings of a storage profile.
+
+    Parameters
+    ----------
+    data : pl.DataFrame | pl.LazyFrame
+        Data to be written. LazyFrames are streamed to the file if the profile
+        allows it.
+    path : str
+        Path of the parquet file.
+    artifact : str
+        Name of the artifact in _SORT_ORDERS, e.g. "standings". Artifacts without
+        a sort order are written unsorted.
+    storage_profile : str, default="default"
+        Name of the profile in STORAGE_PROFILES.
+    """
+    _validate_storage_profile(storage_profile)
+    profile = STORAGE_PROFILES[storage_profile]
+    options = {
+        "compression": profile["compression"],
+        "compression_level": profile["compression_level"],
+        "row_group_size": profile["row_group_size"],
+        "statistics": profile["statistics"],
+    }
+
+    is_lazy = isinstance(data, pl.LazyFrame)
+    if profile["sort"]:
+        schema = data.collect_schema() if is_lazy else data.schema
+        sort = [column for column in _SORT_ORDERS.get(artifact, []) if column in schema]
+        if sort:
+            data = data.sort(sort, maintain_order=True)
+
+    if is_lazy:
+        # the row groups of a sink follow the batches of the streaming engine, so
+        # sized row groups need the whole result
+        if profile["row_group_size"] is None and profile["dictionary"]:
+            data.sink_parquet(path, **options)
+            return
+        data = data.collect()
+
+    if profile["dictionary"]:
+        data.write_parquet(path, **options)
+    else:
+        data.write_parquet(
+            path,
+            **options,
+            use_pyarrow=True,
+            pyarrow_options={"use_dictionary": False},
+        )
+
+
+def _write_parquet_parts(
+    part_paths: list[str],
+    path: str,
+    artifact: str,
+    storage_profile: str = "default",
+) -> None:
+    """Concatenate parquet files into an artifact one part after the other, so only
+    a single part is in memory at a time. The parts are sorted on their own, so
+    they must already be in the order of the result, e.g. shards of ascending
+    league ranges for artifacts sorted by league_id first.
+
+    Parameters
+    ----------
+    part_paths : list[str]
+        Paths of the parquet files in the order of the result, all with the same
+        schema.
+    path : str
+        Path of the parquet file.
+    artifact : str
+        Name of the artifact in _SORT_ORDERS, e.g. "standings". Artifacts without
+        a sort order are written unsorted.
+    storage_profile : str, default="default"
+        Name of the profile in STORAGE_PROFILES.
+    """
+    import pyarrow.parquet as pq
+
+    _validate_storage_profile(storage_profile)
+    profile = STORAGE_PROFILES[storage_profile]
+
+    # the arrow schema polars stored in the first part keeps its Enums, the tables
+    # of polars are cast to it
+    schema = pq.read_schema(part_paths[0])
+    sort = [
+        column for column in _SORT_ORDERS.get(artifact, []) if column in schema.names
+    ]
+    with pq.ParquetWriter(
+        path,
+        schema,
+        compression=profile["compression"],
+        compression_level=profile["compression_level"],
+        use_dictionary=profile["dictionary"],
+        write_statistics=profile["statistics"],
+    ) as writer:
+        for part_path in part_paths:
+            part = pl.read_parquet(part_path)
+            if profile["sort"] and sort:
+                part = part.sort(sort, maintain_order=True)
+            writer.write_table(
+                part.to_arrow().cast(schema), row_group_size=profile["row_group_size"]
+            )
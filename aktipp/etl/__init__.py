@@ -1,13 +1,43 @@
-from . import feature_store
-from .clean import clean_openligadb
-from .feature_engineering import FeatureBuilderOpenligadb
-from .performance import create_performance_openligadb
-from .standings import create_standings_openligadb
+import importlib
+
+# attributes are imported on first access, see aktipp.__getattr__
+_LAZY_IMPORTS = {
+    "clean_openligadb": ".clean",
+    "create_goal_events_openligadb": ".goal_events",
+    "create_head_to_head_openligadb": ".head_to_head",
+    "create_performance_openligadb": ".performance",
+    "create_ratings_openligadb": ".ratings",
+    "create_standings_openligadb": ".standings",
+    "feature_store": None,
+    "FeatureBuilderOpenligadb": ".feature_engineering",
+    "GOALS_FEATURES": ".clean",
+    "required_columns_openligadb": ".clean",
+    "WIDE_FEATURES": ".clean",
+}
 
 __all__ = [
     "clean_openligadb",
+    "create_goal_events_openligadb",
+    "create_head_to_head_openligadb",
     "create_performance_openligadb",
+    "create_ratings_openligadb",
     "create_standings_openligadb",
     "feature_store",
     "FeatureBuilderOpenligadb",
+    "GOALS_FEATURES",
+    "required_columns_openligadb",
+    "WIDE_FEATURES",
 ]
+
+
+def __getattr__(name: str):
+    if name in _LAZY_IMPORTS:
+        if _LAZY_IMPORTS[name] is None:
+            return importlib.import_module(f".{name}", __name__)
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(__all__)
@@ -0,0 +1,234 @@
+import functools
+from importlib import resources
+
+import polars as pl
+
+from . import mapper
+
+DTYPE_PROFILES = ["compact", "wide"]
+
+# per team and match aggregates of the goal events, counted or in minutes
+_GOAL_EVENTS_COUNTS = [
+    "goals_first_half",
+    "goals_second_half",
+    "goals_late",
+    "conceded_first_half",
+    "conceded_second_half",
+    "conceded_late",
+    "comebacks",
+]
+_GOAL_EVENTS_MINUTES = ["minutes_leading", "minutes_trailing"]
+
+# columns of every artifact grouped by their value range
+_COLUMN_GROUPS = {
+    "clean": {
+        "id": ["match_id", "league_id", "team_id_1", "team_id_2"],
+        "goal_id": ["goal_id"],
+        "league_name": ["league_name"],
+        "match_day": ["match_day"],
+        "minute": ["match_minute"],
+        "goals": [
+            "goals_team_1",
+            "goals_team_2",
+            "half_time_goals_team_1",
+            "half_time_goals_team_2",
+            "score_team_1",
+            "score_team_2",
+        ],
+        "goals_diff": ["goals_diff"],
+        "class": ["result_class", "points_team_1", "points_team_2"],
+    },
+    "standings": {
+        "id": ["league_id", "team_id"],
+        "league_name": ["league_name"],
+        "match_day": ["match_day"],
+        "counter": ["games", "wins", "draws", "losses", "points"],
+        "goals_counter": ["goals_scored", "goals_conceded"],
+        "goals_diff_counter": ["goals_diff"],
+        "rank": ["rank"],
+    },
+    "performance": {
+        "id": ["match_id", "league_id", "team_id"],
+        "match_day": ["match_day"],
+        "class": ["home_team"],
+        "rolling": [
+            f"{kpi}_last_{n}_games"
+            for kpi in ["wins", "draws", "losses", "points"]
+            for n in [3, 5]
+        ],
+        "goals_rolling": [
+            f"{kpi}_last_{n}_games"
+            for kpi in ["goals_scored", "goals_conceded"]
+            for n in [3, 5]
+        ],
+        "goals_diff_rolling": [f"goals_diff_last_{n}_games" for n in [3, 5]],
+        "avg": [
+            f"{kpi}_avg"
+            for kpi in [
+                "wins",
+                "draws",
+                "losses",
+                "points",
+                "goals_scored",
+                "goals_conceded",
+                "goals_diff",
+            ]
+        ],
+    },
+    "ratings": {
+        "id": ["match_id", "league_id", "team_id"],
+        "match_day": ["match_day"],
+        "class": ["home_team"],
+        "rating": ["elo", "elo_opponent"],
+    },
+    "goal_events": {
+        "id": ["match_id", "league_id", "team_id"],
+        "match_day": ["match_day"],
+        "class": ["home_team"],
+        "goals_rolling": [
+            f"{kpi}_last_{n}_games" for kpi in _GOAL_EVENTS_COUNTS for n in [3, 5]
+        ],
+        "minutes_rolling": [
+            f"{kpi}_last_{n}_games" for kpi in _GOAL_EVENTS_MINUTES for n in [3, 5]
+        ],
+        "avg": [f"{kpi}_avg" for kpi in _GOAL_EVENTS_COUNTS + _GOAL_EVENTS_MINUTES],
+    },
+    "head_to_head": {
+        "id": ["match_id", "team_id_low", "team_id_high"],
+        "time": ["time_key"],
+        "counter": ["meetings"],
+        "rolling": ["wins_low", "draws", "wins_high"],
+        "goals_rolling": ["goals_low", "goals_high"],
+    },
+}
+
+# dtypes of every group, the wide profile keeps the dtypes polars infers
+_GROUP_DTYPES = {
+    "compact": {
+        "id": pl.UInt32,
+        "goal_id": pl.UInt64,
+        "match_day": pl.UInt8,
+        "minute": pl.UInt8,
+        "time": pl.UInt32,
+        "goals": pl.UInt8,
+        "goals_diff": pl.Int8,
+        "class": pl.Int8,
+        "counter": pl.UInt16,
+        "goals_counter": pl.UInt16,
+        "goals_diff_counter": pl.Int16,
+        "rank": pl.UInt16,
+        "rolling": pl.UInt8,
+        "goals_rolling": pl.UInt8,
+        "goals_diff_rolling": pl.Int8,
+        "minutes_rolling": pl.UInt16,
+        "avg": pl.Float32,
+        "rating": pl.Float32,
+    },
+    "wide": {
+        "id": pl.Int64,
+        "goal_id": pl.Int64,
+        "league_name": pl.String,
+        "match_day": pl.Int64,
+        "minute": pl.Int64,
+        "time": pl.Int64,
+        "goals": pl.Int64,
+        "goals_diff": pl.Int64,
+        "class": pl.Int32,
+        "counter": pl.Int32,
+        "goals_counter": pl.Int64,
+        "goals_diff_counter": pl.Int64,
+        "rank": pl.Int64,
+        "rolling": pl.Int32,
+        "goals_rolling": pl.Int64,
+        "goals_diff_rolling": pl.Int64,
+        "minutes_rolling": pl.Int64,
+        "avg": pl.Float64,
+        "rating": pl.Float64,
+    },
+}
+
+
+@functools.cache
+def _league_name_enum() -> pl.Enum:
+    """Enum of all unique league names in league_mapper.csv."""
+    league_mapper_path = resources.files(mapper) / "league_mapper.csv"
+    league_names = pl.read_csv(league_mapper_path)["league_name_unique"]
+    return pl.Enum(league_names.unique().sort())
+
+
+def _dtypes(artifact: str, dtype_profile: str) -> dict[str, pl.DataType]:
+    """Dtypes of the columns of an artifact.
+
+    Parameters
+    ----------
+    artifact : str
+        "clean", "standings", "performance", "ratings", "goal_events",
+        "head_to_head" or "features".
+    dtype_profile : str
+        "compact" - smallest integer types that fit the values, Float32 and Enum.
+        "wide" - the Int64, Int32, Float64 and String types polars infers.
+
+    Returns
+    -------
+    dtypes : dict[str, pl.DataType]
+        Dtype of every column.
+    """
+    if dtype_profile not in DTYPE_PROFILES:
+        raise ValueError(f"dtype_profile must be in {DTYPE_PROFILES}")
+
+    group_dtypes = {"league_name": _league_name_enum()} | _GROUP_DTYPES[dtype_profile]
+    if artifact == "features":
+        # features combine the match results with the outputs of the other stages
+        # for both teams
+        dtypes = _dtypes("clean", dtype_profile) | {
+            "home_team": group_dtypes["class"],
+            "goals": group_dtypes["goals"],
+            "rank_diff": pl.Int16 if dtype_profile == "compact" else pl.Int64,
+            "elo_diff": group_dtypes["rating"],
+            "h2h_meetings": group_dtypes["counter"],
+            "h2h_wins_1": group_dtypes["rolling"],
+            "h2h_draws": group_dtypes["rolling"],
+            "h2h_wins_2": group_dtypes["rolling"],
+            "h2h_goals_1": group_dtypes["goals_rolling"],
+            "h2h_goals_2": group_dtypes["goals_rolling"],
+        }
+        for other in ["standings", "performance", "ratings", "goal_events"]:
+            for column, dtype in _dtypes(other, dtype_profile).items():
+                if column not in ["match_id", "league_id", "match_day", "team_id"]:
+                    dtypes |= {f"{column}_1": dtype, f"{column}_2": dtype}
+        return dtypes
+
+    return {
+        column: group_dtypes[group]
+        for group, columns in _COLUMN_GROUPS[artifact].items()
+        for column in columns
+    }
+
+
+def _apply_dtype_profile(
+    data: pl.LazyFrame, artifact: str, dtype_profile: str
+) -> pl.LazyFrame:
+    """Cast the columns of an artifact to the dtypes of a profile. Casts are strict,
+    values that do not fit raise instead of overflowing. Unknown columns are kept.
+
+    Parameters
+    ----------
+    data : pl.LazyFrame
+        Data of the artifact.
+    artifact : str
+        "clean", "standings", "performance", "ratings", "goal_events",
+        "head_to_head" or "features".
+    dtype_profile : str
+        "compact" or "wide".
+
+    Returns
+    -------
+    data : pl.LazyFrame
+        Data with the dtypes of the profile.
+    """
+    schema = data.collect_schema()
+    return data.with_columns(
+        pl.col(column).cast(dtype)
+        for column, dtype in _dtypes(artifact, dtype_profile).items()
+        if column in schema and schema[column] != dtype
+    )
@@ -0,0 +1,116 @@
+import multiprocessing
+import os
+import tempfile
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+
+import polars as pl
+
+from .._storage import _write_parquet_parts
+
+
+def _league_shards(match_results_data_path: str, n_shards: int) -> list[list[int]]:
+    """Split the leagues of the match results into contiguous shards of about the
+    same number of rows.
+
+    Parameters
+    ----------
+    match_results_data_path : str
+        Path to the clean match results parquet files.
+    n_shards : int
+        Maximum number of shards.
+
+    Returns
+    -------
+    shards : list[list[int]]
+        League ids of every non-empty shard in ascending order.
+    """
+    leagues = (
+        pl.scan_parquet(match_results_data_path)
+        .group_by("league_id")
+        .len()
+        .sort("league_id")
+        .with_columns(
+            (
+                (pl.col("len").cum_sum() - pl.col("len"))
+                * n_shards
+                // pl.col("len").sum()
+            ).alias("shard")
+        )
+        .collect()
+    )
+    return [
+        shard["league_id"].to_list()
+        for shard in leagues.partition_by("shard", maintain_order=True)
+    ]
+
+
+def _write_shard(data: pl.LazyFrame, shard_data_path: str) -> None:
+    """Write the result of a shard. The window functions of the stages are not
+    supported by the streaming engine, so every shard is collected on its own."""
+    data.collect().write_parquet(shard_data_path, compression="lz4")
+
+
+def _run_sharded(
+    worker: Callable[..., None],
+    match_results_data_path: str,
+    result_data_path: str,
+    artifact: str,
+    storage_profile: str,
+    n_jobs: int,
+    *args,
+) -> None:
+    """Run a stage in worker processes, one shard of leagues per process, and merge
+    the shards into the result file. Only valid for stages whose windows are
+    partitioned by league_id, so the shards are independent.
+
+    Parameters
+    ----------
+    worker : Callable[..., None]
+        Module level function called as worker(match_results_data_path,
+        shard_data_path, league_ids, *args) in every process, which writes the
+        result of the leagues to shard_data_path.
+    match_results_data_path : str
+        Path to the clean match results parquet files.
+    result_data_path : str
+        Path to the result file.
+    artifact : str
+        Name of the artifact for _write_parquet_parts, e.g. "standings".
+    storage_profile : str
+        Name of the profile in STORAGE_PROFILES the result is written with.
+    n_jobs : int
+        Number of worker processes.
+    *args
+        Further arguments of the worker.
+    """
+    # without match results a single empty shard keeps the schema of the result
+    shards = _league_shards(match_results_data_path, n_jobs) or [[]]
+
+    # the shards are written next to the result, so they are on the same disk
+    with tempfile.TemporaryDirectory(
+        prefix=".shards-", dir=os.path.dirname(os.path.abspath(result_data_path))
+    ) as shards_path:
+        shard_data_paths = [
+            os.path.join(shards_path, f"part-{i:05d}.parquet")
+            for i in range(len(shards))
+        ]
+        with ProcessPoolExecutor(
+            max_workers=min(n_jobs, len(shards)),
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as executor:
+            futures = [
+                executor.submit(
+                    worker, match_results_data_path, shard_data_path, league_ids, *args
+                )
+                for shard_data_path, league_ids in zip(
+                    shard_data_paths, shards, strict=True
+                )
+            ]
+            for future in futures:
+                future.result()
+
+        # the shards cover ascending ranges of leagues, the merge appends them one
+        # after the other, so the result is never in memory as a whole
+        _write_parquet_parts(
+            shard_data_paths, result_data_path, artifact, storage_profile
+        )
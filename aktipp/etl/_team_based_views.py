@@ -32,6 +32,8 @@ def _create_team_based_views(
         raise ValueError("standing_class must be in ['home', 'away', 'overall']")
 
     # create team based views
+    # goals and points are widened, compact types overflow in cumulative sums and
+    # rolling sums are not implemented for them
     if team == 1:
         if standings_class in ["home", "overall"]:
             return (
@@ -57,10 +59,10 @@ def _create_team_based_views(
                     .then(1)
                     .otherwise(0)
                     .alias("losses"),
-                    pl.col("goals_team_1").alias("goals_scored"),
-                    pl.col("goals_team_2").alias("goals_conceded"),
-                    pl.col("goals_diff"),
-                    pl.col("points_team_1").alias("points"),
+                    pl.col("goals_team_1").cast(pl.Int64).alias("goals_scored"),
+                    pl.col("goals_team_2").cast(pl.Int64).alias("goals_conceded"),
+                    pl.col("goals_diff").cast(pl.Int64),
+                    pl.col("points_team_1").cast(pl.Int32).alias("points"),
                 )  # fmt: skip
             )
         else:
@@ -109,10 +111,10 @@ def _create_team_based_views(
                     .then(1)
                     .otherwise(0)
                     .alias("losses"),
-                    pl.col("goals_team_2").alias("goals_scored"),
-                    pl.col("goals_team_1").alias("goals_conceded"),
-                    (-1 * pl.col("goals_diff")).alias("goals_diff"),
-                    pl.col("points_team_2").alias("points"),
+                    pl.col("goals_team_2").cast(pl.Int64).alias("goals_scored"),
+                    pl.col("goals_team_1").cast(pl.Int64).alias("goals_conceded"),
+                    (-1 * pl.col("goals_diff").cast(pl.Int64)).alias("goals_diff"),
+                    pl.col("points_team_2").cast(pl.Int32).alias("points"),
                 )  # fmt: skip
             )
         else:
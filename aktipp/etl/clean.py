@@ -3,6 +3,9 @@ import polars as pl
 
 from . import feature_store
 from . import mapper
+from ._schema import _apply_dtype_profile
+from .._storage import _validate_storage_profile, _write_parquet
+from ..tracing import trace_stage
 
 
 def _build_features(features: list[str]) -> list[pl.Expr]:
@@ -11,21 +14,18 @@ def _build_features(features: list[str]) -> list[pl.Expr]:
     Parameters
     ----------
     features : list[str]
-        List of feature names.
+        List of feature names registered in feature_store.FEATURES.
 
     Returns
     -------
     built_features : list[pl.Expr]
         List of polars expressions to build the features.
     """
-    built_features = []
-    for feature in features:
-        fname = f"_{feature}"
-        if hasattr(feature_store, fname):
-            built_features.append(getattr(feature_store, fname)())
-        else:
-            print(f"There is no aggregation for {feature}.")
-    return built_features
+    return [feature_store.get_feature(feature).build() for feature in features]
+
+
+# meta data needed to resolve leagues and teams, independent of the features
+CLEAN_META = ["leagueId", "leagueName", "team1.teamId", "team2.teamId"]
 
 
 DEFAULT_FEATURES = [
@@ -48,9 +48,53 @@ DEFAULT_FEATURES = [
     "points_team_2",
 ]
 
+# features of the match results normalized with layout="wide", which keep the half
+# time result in the row of the final result
+WIDE_FEATURES = [
+    *DEFAULT_FEATURES,
+    "half_time_goals_team_1",
+    "half_time_goals_team_2",
+]
+
+# features of the goals records, the match itself is described by the match results
+GOALS_FEATURES = [
+    "match_id",
+    "goal_id",
+    "match_minute",
+    "score_team_1",
+    "score_team_2",
+    "is_penalty",
+    "is_own_goal",
+    "is_overtime",
+]
+
+
+def required_columns_openligadb(
+    features: list[str] = DEFAULT_FEATURES,
+) -> tuple[list[str], list[str]]:
+    """Columns of the normalized records needed to clean them up into the features.
+    Pass them to the normalization, so only these columns are written.
+
+    Parameters
+    ----------
+    features : list[str], default=DEFAULT_FEATURES
+        List of features to be used in cleaned up data set.
+
+    Returns
+    -------
+    columns : tuple[list[str], list[str]]
+        Meta data and record keys needed.
+    """
+    meta = list(dict.fromkeys(CLEAN_META + feature_store.required_meta(features)))
+    return meta, feature_store.required_record_keys(features)
+
 
 def clean_openligadb(
-    data_path: str, records: str, features: list[str] = DEFAULT_FEATURES
+    data_path: str,
+    records: str,
+    features: list[str] = DEFAULT_FEATURES,
+    dtype_profile: str = "compact",
+    storage_profile: str = "default",
 ) -> None:
     """Clean up all openligadb files for one type of record data into a single parquet
     file. Clean up consists of:
@@ -66,13 +110,60 @@ def clean_openligadb(
         List of the records to be normalized.
     features : list[str], default=DEFAULT_FEATURES
         List of features to be used in cleaned up data set.
+    dtype_profile : str, default="compact"
+        "compact" - smallest integer types that fit the values, Float32 and Enum.
+        "wide" - the Int64, Int32, Float64 and String types polars infers.
+    storage_profile : str, default="default"
+        "default" - the polars defaults, unsorted.
+        "hot" - lz4 and small row groups sorted by league and match day.
+        "archive" - zstd level 19 and large row groups sorted by league and match day.
     """
 
-    # Lazy load data
-    # leagues 50 & 4570 are incomplete and should be disregarded
-    records_data = pl.scan_parquet(data_path + f"*{records}.parquet").filter(
-        ~pl.col("leagueId").is_in([50, 4570])
-    )
+    _validate_storage_profile(storage_profile)
+
+    with trace_stage("clean_openligadb", records=records) as stage:
+        # Lazy load data
+        # leagues 50 & 4570 are incomplete and should be disregarded
+        records_data = pl.scan_parquet(data_path + f"*{records}.parquet")
+
+        # only read the columns the features need
+        columns = sum(required_columns_openligadb(features), [])
+        schema = records_data.collect_schema()
+        columns_missing = [column for column in columns if column not in schema]
+        if columns_missing:
+            raise ValueError(f"{columns_missing} are not in the normalized {records}.")
+
+        records_data = records_data.select(columns).filter(
+            ~pl.col("leagueId").is_in([50, 4570])
+        )
+
+        query = _clean_openligadb(records_data, features, dtype_profile)
+        stage.capture_plan(query)
+        _write_parquet(
+            query, data_path + f"{records}_clean.parquet", "clean", storage_profile
+        )
+        stage.add_output(data_path + f"{records}_clean.parquet")
+
+
+def _clean_openligadb(
+    records_data: pl.LazyFrame, features: list[str], dtype_profile: str = "compact"
+) -> pl.LazyFrame:
+    """Resolve ambigious entities and build the features of normalized records.
+
+    Parameters
+    ----------
+    records_data : pl.LazyFrame
+        Normalized openligadb records.
+    features : list[str]
+        List of features to be used in cleaned up data set.
+    dtype_profile : str, default="compact"
+        "compact" or "wide", see clean_openligadb.
+
+    Returns
+    -------
+    clean : pl.LazyFrame
+        LazyFrame with the cleaned up records.
+    """
 
     # Lazy load mappers
     league_mapper_path = resources.files(mapper) / "league_mapper.csv"
@@ -81,7 +172,7 @@ def clean_openligadb(
     team_mapper_path = resources.files(mapper) / "team_mapper.csv"
     team_mapper = pl.scan_csv(team_mapper_path)
 
-    records_data.with_columns(feature_store._league_name_raw()) \
+    clean = records_data.with_columns(feature_store._league_name_raw()) \
     .join(other=league_mapper, on="league_name_raw", how="left") \
     .join(
         other=team_mapper.select(["team_id_raw", "team_id_unique"]).rename(
@@ -99,5 +190,6 @@ def clean_openligadb(
         right_on="team_id_raw",
         how="left",
     ) \
-    .select(*_build_features(features)) \
-    .sink_parquet(data_path + f"{records}_clean.parquet")  # fmt: skip
+    .select(*_build_features(features))  # fmt: skip
+
+    return _apply_dtype_profile(clean, "clean", dtype_profile)
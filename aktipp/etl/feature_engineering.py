@@ -1,10 +1,28 @@
 import polars as pl
 
 from ._helper import _suffix_alias
+from ._schema import DTYPE_PROFILES, _apply_dtype_profile
+from .head_to_head import _pair_keys, _time_key
+from ..tracing import trace_stage
 
 
 class FeatureBuilderOpenligadb:
-    def __init__(self): ...
+    """Build features from the clean match results and the outputs of the other
+    pipeline stages.
+
+    Parameters
+    ----------
+    dtype_profile : str, default="compact"
+        "compact" - smallest integer types that fit the values, Float32 and Enum.
+        "wide" - the Int64, Int32, Float64 and String types polars infers.
+        Inputs are cast to the profile as well, so they can be joined regardless
+        of the profile they were written with.
+    """
+
+    def __init__(self, dtype_profile: str = "compact"):
+        if dtype_profile not in DTYPE_PROFILES:
+            raise ValueError(f"dtype_profile must be in {DTYPE_PROFILES}")
+        self.dtype_profile = dtype_profile
 
     def _load_match_results(self, match_results_data_path: str) -> pl.LazyFrame:
         """Load match results.
@@ -20,7 +38,9 @@ class FeatureBuilderOpenligadb:
             match_results.
         """
 
-        match_results = pl.scan_parquet(match_results_data_path)
+        match_results = _apply_dtype_profile(
+            pl.scan_parquet(match_results_data_path), "clean", self.dtype_profile
+        )
 
         # Filter match results
         # - Only consider final results
@@ -29,7 +49,7 @@ class FeatureBuilderOpenligadb:
         match_results_filtered = match_results.filter(
             (pl.col("result_name")=="Endergebnis")
             & (~pl.col("match_day_name").str.to_lowercase().str.contains("relegation"))
-            & (pl.col("result_class").is_not_nan())
+            & (pl.col("result_class").is_not_null())
         )  # fmt: skip
 
         return match_results_filtered
@@ -45,6 +65,7 @@ class FeatureBuilderOpenligadb:
         ).select(
             pl.col("match_id"),
             pl.col("league_id"),
+            pl.col("season_name"),
             pl.col("match_day"),
             pl.col("team_id_1"),
             pl.col("team_name_1"),
@@ -62,6 +83,7 @@ class FeatureBuilderOpenligadb:
         ).select(
             pl.col("match_id"),
             pl.col("league_id"),
+            pl.col("season_name"),
             pl.col("match_day"),
             pl.col("team_id_2").alias("team_id_1"),
             pl.col("team_name_2").alias("team_name_1"),
@@ -94,6 +116,7 @@ class FeatureBuilderOpenligadb:
         goals_scored_home_team = match_results.select(
             pl.col("match_id"),
             pl.col("league_id"),
+            pl.col("season_name"),
             pl.col("match_day"),
             pl.col("team_id_1"),
             pl.col("team_name_1"),
@@ -106,6 +129,7 @@ class FeatureBuilderOpenligadb:
         goals_scored_away_team = match_results.select(
             pl.col("match_id"),
             pl.col("league_id"),
+            pl.col("season_name"),
             pl.col("match_day"),
             pl.col("team_id_2").alias("team_id_1"),
             pl.col("team_name_2").alias("team_name_1"),
@@ -138,7 +162,9 @@ class FeatureBuilderOpenligadb:
 
         """
 
-        standings = pl.scan_parquet(standings_data_path)
+        standings = _apply_dtype_profile(
+            pl.scan_parquet(standings_data_path), "standings", self.dtype_profile
+        )
 
         standings_select_columns = ["team_id", "games", "rank"]
 
@@ -165,7 +191,11 @@ class FeatureBuilderOpenligadb:
                 on=["league_id", "team_id_2", "match_day"],
                 how="left",
             )
-            .with_columns((pl.col("rank_1") - pl.col("rank_2")).alias("rank_diff"))
+            .with_columns(
+                (
+                    pl.col("rank_1").cast(pl.Int64) - pl.col("rank_2").cast(pl.Int64)
+                ).alias("rank_diff")
+            )
         )
 
     def _add_overall_performance(
@@ -187,7 +217,9 @@ class FeatureBuilderOpenligadb:
 
         """
 
-        performance = pl.scan_parquet(performance_data_path)
+        performance = _apply_dtype_profile(
+            pl.scan_parquet(performance_data_path), "performance", self.dtype_profile
+        )
 
         performance_select_columns = [
             "team_id",
@@ -236,6 +268,176 @@ class FeatureBuilderOpenligadb:
             how="left",
         )
 
+    def _add_goal_events(
+        self, base: pl.LazyFrame, goal_events_data_path: str
+    ) -> pl.LazyFrame:
+        """Add goal event KPIs from previous match day.
+
+        Parameters
+        ----------
+        base : pl.Lazyframe
+            Base Frame.
+        goal_events_data_path : str
+            Path to the goal events parquet file.
+
+        Returns
+        -------
+        result : pl.LazyFrame
+            Result frame with goal events data.
+
+        """
+
+        goal_events = _apply_dtype_profile(
+            pl.scan_parquet(goal_events_data_path), "goal_events", self.dtype_profile
+        )
+
+        goal_events_select_columns = [
+            column
+            for column in goal_events.collect_schema()
+            if column not in ["match_id", "league_id", "match_day", "home_team"]
+        ]
+
+        goal_events_team_1 = goal_events.select(
+            pl.col("league_id"),
+            (pl.col("match_day") + 1).alias("match_day"),
+            *_suffix_alias(goal_events_select_columns, suffix="_1"),
+        )
+
+        goal_events_team_2 = goal_events.select(
+            pl.col("league_id"),
+            (pl.col("match_day") + 1).alias("match_day"),
+            *_suffix_alias(goal_events_select_columns, suffix="_2"),
+        )
+
+        return base.join(
+            other=goal_events_team_1,
+            on=["league_id", "team_id_1", "match_day"],
+            how="left",
+        ).join(
+            other=goal_events_team_2,
+            on=["league_id", "team_id_2", "match_day"],
+            how="left",
+        )
+
+    def _add_elo_ratings(
+        self, base: pl.LazyFrame, ratings_data_path: str
+    ) -> pl.LazyFrame:
+        """Add the pre-match elo ratings of both teams.
+
+        Parameters
+        ----------
+        base : pl.Lazyframe
+            Base Frame.
+        ratings_data_path : str
+            Path to the ratings parquet file.
+
+        Returns
+        -------
+        result : pl.LazyFrame
+            Result frame with the elo ratings.
+
+        """
+
+        ratings = _apply_dtype_profile(
+            pl.scan_parquet(ratings_data_path), "ratings", self.dtype_profile
+        )
+
+        return (
+            base.join(
+                other=ratings.select(
+                    pl.col("match_id"),
+                    pl.col("team_id").alias("team_id_1"),
+                    pl.col("elo").alias("elo_1"),
+                ),
+                on=["match_id", "team_id_1"],
+                how="left",
+            )
+            .join(
+                other=ratings.select(
+                    pl.col("match_id"),
+                    pl.col("team_id").alias("team_id_2"),
+                    pl.col("elo").alias("elo_2"),
+                ),
+                on=["match_id", "team_id_2"],
+                how="left",
+            )
+            .with_columns((pl.col("elo_1") - pl.col("elo_2")).alias("elo_diff"))
+        )
+
+    def _add_head_to_head(
+        self, base: pl.LazyFrame, head_to_head_data_path: str
+    ) -> pl.LazyFrame:
+        """Add the statistics of the last meetings of both teams before the match.
+        The last meeting is looked up with an as-of join on the pair index.
+
+        Parameters
+        ----------
+        base : pl.Lazyframe
+            Base Frame.
+        head_to_head_data_path : str
+            Path to the head-to-head parquet file.
+
+        Returns
+        -------
+        result : pl.LazyFrame
+            Result frame with head-to-head data.
+
+        """
+
+        head_to_head = _apply_dtype_profile(
+            pl.scan_parquet(head_to_head_data_path), "head_to_head", self.dtype_profile
+        )
+        time_key_dtype = head_to_head.collect_schema()["time_key"]
+
+        # the as-of join matches the last meeting before the time key, so the
+        # match itself is excluded by looking up one match day earlier
+        meetings = (
+            base.select(
+                pl.col("match_id"),
+                pl.col("team_id_1"),
+                *_pair_keys("team_id_1", "team_id_2"),
+                (_time_key() - 1).cast(time_key_dtype),
+            )
+            .unique(["match_id", "team_id_1"])
+            .sort("time_key")
+            .join_asof(
+                head_to_head.drop("match_id").sort("time_key"),
+                on="time_key",
+                by=["team_id_low", "team_id_high"],
+                strategy="backward",
+            )
+        )
+
+        low_is_team_1 = pl.col("team_id_1") == pl.col("team_id_low")
+        meetings = meetings.select(
+            pl.col("match_id"),
+            pl.col("team_id_1"),
+            pl.col("meetings").fill_null(0).alias("h2h_meetings"),
+            pl.when(low_is_team_1)
+            .then(pl.col("wins_low"))
+            .otherwise(pl.col("wins_high"))
+            .fill_null(0)
+            .alias("h2h_wins_1"),
+            pl.col("draws").fill_null(0).alias("h2h_draws"),
+            pl.when(low_is_team_1)
+            .then(pl.col("wins_high"))
+            .otherwise(pl.col("wins_low"))
+            .fill_null(0)
+            .alias("h2h_wins_2"),
+            pl.when(low_is_team_1)
+            .then(pl.col("goals_low"))
+            .otherwise(pl.col("goals_high"))
+            .fill_null(0)
+            .alias("h2h_goals_1"),
+            pl.when(low_is_team_1)
+            .then(pl.col("goals_high"))
+            .otherwise(pl.col("goals_low"))
+            .fill_null(0)
+            .alias("h2h_goals_2"),
+        )
+
+        return base.join(meetings, on=["match_id", "team_id_1"], how="left")
+
     def get_features(
         self,
         match_results_data_path: str,
@@ -243,21 +445,28 @@ class FeatureBuilderOpenligadb:
         features: dict[str:str],
         target: str = "goals",
     ) -> None:
-        if target == "goals":
-            base = self._goals_scored_base_view(
-                self._load_match_results(match_results_data_path)
-            )
-        elif target == "result_class":
-            base = self._result_class_base_view(
-                self._load_match_results(match_results_data_path)
-            )
-        else:
-            raise NotImplementedError()
-
-        if len(features) > 0:
-            for feature in features:
-                fname = f"_add_{feature}"
-                if hasattr(self, fname):
-                    base = getattr(self, fname)(base, features[feature])
+        # the features are returned as a lazy query executed by the caller, so the
+        # stage only measures building the query, its execution is measured by the
+        # query profile of trace(profile=True)
+        with trace_stage("build_features_query", target=target) as stage:
+            if target == "goals":
+                base = self._goals_scored_base_view(
+                    self._load_match_results(match_results_data_path)
+                )
+            elif target == "result_class":
+                base = self._result_class_base_view(
+                    self._load_match_results(match_results_data_path)
+                )
+            else:
+                raise NotImplementedError()
+
+            if len(features) > 0:
+                for feature in features:
+                    fname = f"_add_{feature}"
+                    if hasattr(self, fname):
+                        base = getattr(self, fname)(base, features[feature])
+
+            base = _apply_dtype_profile(base, "features", self.dtype_profile)
+            stage.capture_plan(base)
 
         return base
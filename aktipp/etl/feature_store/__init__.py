@@ -1,38 +1,70 @@
 from ._features_openligadb import (
+    _goal_id,
     _goals_team_1,
     _goals_team_2,
     _goals_diff,
+    _half_time_goals_team_1,
+    _half_time_goals_team_2,
+    _is_own_goal,
+    _is_overtime,
+    _is_penalty,
     _league_id,
     _league_name,
     _league_name_raw,
     _match_day,
     _match_day_name,
     _match_id,
+    _match_minute,
     _points_team_1,
     _points_team_2,
     _result_class,
     _result_name,
+    _score_team_1,
+    _score_team_2,
     _season_name,
     _team_id_1,
     _team_id_2,
     _team_name_1,
     _team_name_2,
 )
+from ._registry import (
+    FEATURES,
+    Feature,
+    get_feature,
+    register_feature,
+    required_meta,
+    required_record_keys,
+)
 
 __all__ = [
+    "FEATURES",
+    "Feature",
+    "get_feature",
+    "register_feature",
+    "required_meta",
+    "required_record_keys",
+    "_goal_id",
     "_goals_team_1",
     "_goals_team_2",
     "_goals_diff",
+    "_half_time_goals_team_1",
+    "_half_time_goals_team_2",
+    "_is_own_goal",
+    "_is_overtime",
+    "_is_penalty",
     "_league_id",
     "_league_name",
     "_league_name_raw",
     "_match_day",
     "_match_day_name",
     "_match_id",
+    "_match_minute",
     "_points_team_1",
     "_points_team_2",
     "_result_class",
     "_result_name",
+    "_score_team_1",
+    "_score_team_2",
     "_season_name",
     "_team_id_1",
     "_team_id_2",
@@ -1,44 +1,91 @@
 import polars as pl
 
+from ._registry import register_feature
 
+
+@register_feature("goal_id", record_keys=["goalID"])
+def _goal_id():
+    return pl.col("goalID").alias("goal_id")
+
+
+@register_feature("goals_team_1", record_keys=["pointsTeam1"])
 def _goals_team_1():
     return pl.coalesce(pl.col("pointsTeam1"), 0).alias("goals_team_1")
 
 
+@register_feature("goals_team_2", record_keys=["pointsTeam2"])
 def _goals_team_2():
     return pl.coalesce(pl.col("pointsTeam2"), 0).alias("goals_team_2")
 
 
+@register_feature("goals_diff", record_keys=["pointsTeam1", "pointsTeam2"])
 def _goals_diff():
     return pl.coalesce(pl.col("pointsTeam1") - pl.col("pointsTeam2"), 0).alias(
         "goals_diff"
     )
 
 
+@register_feature("half_time_goals_team_1", record_keys=["halfTimePointsTeam1"])
+def _half_time_goals_team_1():
+    return pl.col("halfTimePointsTeam1").alias("half_time_goals_team_1")
+
+
+@register_feature("half_time_goals_team_2", record_keys=["halfTimePointsTeam2"])
+def _half_time_goals_team_2():
+    return pl.col("halfTimePointsTeam2").alias("half_time_goals_team_2")
+
+
+@register_feature("is_own_goal", record_keys=["isOwnFoal"])
+def _is_own_goal():
+    return pl.col("isOwnFoal").alias("is_own_goal")
+
+
+@register_feature("is_overtime", record_keys=["isOvertime"])
+def _is_overtime():
+    return pl.col("isOvertime").alias("is_overtime")
+
+
+@register_feature("is_penalty", record_keys=["isPenalty"])
+def _is_penalty():
+    return pl.col("isPenalty").alias("is_penalty")
+
+
+@register_feature("league_id", meta=["leagueId"])
 def _league_id():
     return pl.col("leagueId").alias("league_id")
 
 
+@register_feature("league_name", meta=["leagueName"])
 def _league_name():
     return pl.col("league_name_unique").alias("league_name")
 
 
+@register_feature("league_name_raw", meta=["leagueName"])
 def _league_name_raw():
     return pl.col("leagueName").str.head(-10).alias("league_name_raw")
 
 
+@register_feature("match_day", meta=["group.groupOrderID"])
 def _match_day():
     return pl.col("group.groupOrderID").alias("match_day")
 
 
+@register_feature("match_day_name", meta=["group.groupName"])
 def _match_day_name():
     return pl.col("group.groupName").alias("match_day_name")
 
 
+@register_feature("match_id", meta=["matchID"])
 def _match_id():
     return pl.col("matchID").alias("match_id")
 
 
+@register_feature("match_minute", record_keys=["matchMinute"])
+def _match_minute():
+    return pl.col("matchMinute").alias("match_minute")
+
+
+@register_feature("points_team_1", record_keys=["pointsTeam1", "pointsTeam2"])
 def _points_team_1():
     return (
         pl.when(pl.col("pointsTeam1") > pl.col("pointsTeam2"))
@@ -52,6 +99,7 @@ def _points_team_1():
     )
 
 
+@register_feature("points_team_2", record_keys=["pointsTeam1", "pointsTeam2"])
 def _points_team_2():
     return (
         pl.when(pl.col("pointsTeam1") > pl.col("pointsTeam2"))
@@ -65,6 +113,7 @@ def _points_team_2():
     )
 
 
+@register_feature("result_class", record_keys=["pointsTeam1", "pointsTeam2"])
 def _result_class():
     return (
         pl.when(pl.col("pointsTeam1") > pl.col("pointsTeam2"))
@@ -78,25 +127,41 @@ def _result_class():
     )
 
 
+@register_feature("result_name", record_keys=["resultName"])
 def _result_name():
     return pl.col("resultName").alias("result_name")
 
 
+@register_feature("score_team_1", record_keys=["scoreTeam1"])
+def _score_team_1():
+    return pl.col("scoreTeam1").alias("score_team_1")
+
+
+@register_feature("score_team_2", record_keys=["scoreTeam2"])
+def _score_team_2():
+    return pl.col("scoreTeam2").alias("score_team_2")
+
+
+@register_feature("season_name", meta=["leagueName"])
 def _season_name():
     return pl.col("leagueName").str.tail(9).alias("season_name")
 
 
+@register_feature("team_id_1", meta=["team1.teamId"])
 def _team_id_1():
     return pl.col("team_id_unique_1").alias("team_id_1")
 
 
+@register_feature("team_id_2", meta=["team2.teamId"])
 def _team_id_2():
     return pl.col("team_id_unique_2").alias("team_id_2")
 
 
+@register_feature("team_name_1", meta=["team1.teamName"])
 def _team_name_1():
     return pl.col("team1.teamName").alias("team_name_1")
 
 
+@register_feature("team_name_2", meta=["team2.teamName"])
 def _team_name_2():
     return pl.col("team2.teamName").alias("team_name_2")
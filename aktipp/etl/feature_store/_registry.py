@@ -0,0 +1,107 @@
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+
+import polars as pl
+
+
+@dataclass(frozen=True)
+class Feature:
+    """A feature of the cleaned up data set together with its inputs.
+
+    Parameters
+    ----------
+    name : str
+        Name of the feature, i.e. the name of the built column.
+    build : Callable[[], pl.Expr]
+        Function returning the polars expression that builds the feature.
+    meta : tuple[str, ...], default=()
+        Meta data of the normalized records the expression reads, e.g. "matchID".
+    record_keys : tuple[str, ...], default=()
+        Record keys of the normalized records the expression reads, e.g.
+        "pointsTeam1".
+    """
+
+    name: str
+    build: Callable[[], pl.Expr]
+    meta: tuple[str, ...] = ()
+    record_keys: tuple[str, ...] = ()
+
+
+FEATURES: dict[str, Feature] = {}
+
+
+def register_feature(
+    name: str, meta: Iterable[str] = (), record_keys: Iterable[str] = ()
+) -> Callable[[Callable[[], pl.Expr]], Callable[[], pl.Expr]]:
+    """Register a function building a feature in FEATURES. The function itself is
+    returned unchanged.
+
+    Parameters
+    ----------
+    name : str
+        Name of the feature.
+    meta : Iterable[str], default=()
+        Meta data of the normalized records the feature reads.
+    record_keys : Iterable[str], default=()
+        Record keys of the normalized records the feature reads.
+    """
+
+    def decorator(build: Callable[[], pl.Expr]) -> Callable[[], pl.Expr]:
+        FEATURES[name] = Feature(name, build, tuple(meta), tuple(record_keys))
+        return build
+
+    return decorator
+
+
+def get_feature(name: str) -> Feature:
+    """Look up a registered feature.
+
+    Parameters
+    ----------
+    name : str
+        Name of the feature.
+
+    Returns
+    -------
+    feature : Feature
+        The registered feature.
+    """
+    if name not in FEATURES:
+        raise ValueError(f"{name} is not in {list(FEATURES)}.")
+    return FEATURES[name]
+
+
+def required_meta(features: Iterable[str]) -> list[str]:
+    """Meta data the features read, in order of first use.
+
+    Parameters
+    ----------
+    features : Iterable[str]
+        List of feature names.
+
+    Returns
+    -------
+    meta : list[str]
+        List of the meta data without duplicates.
+    """
+    meta = (column for name in features for column in get_feature(name).meta)
+    return list(dict.fromkeys(meta))
+
+
+def required_record_keys(features: Iterable[str]) -> list[str]:
+    """Record keys the features read, in order of first use.
+
+    Parameters
+    ----------
+    features : Iterable[str]
+        List of feature names.
+
+    Returns
+    -------
+    record_keys : list[str]
+        List of the record keys without duplicates.
+    """
+    record_keys = (
+        column for name in features for column in get_feature(name).record_keys
+    )
+    return list(dict.fromkeys(record_keys))
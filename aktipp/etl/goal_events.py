@@ -0,0 +1,249 @@
+import polars as pl
+
+from ._schema import _GOAL_EVENTS_COUNTS, _GOAL_EVENTS_MINUTES, _apply_dtype_profile
+from .._storage import _validate_storage_profile, _write_parquet
+from ..tracing import trace_stage
+
+# last minute of the first half, first minute of a late goal and regular full time
+_HALF_TIME = 45
+_LATE_MINUTE = 76
+_FULL_TIME = 90
+
+
+def _goal_stream(goals: pl.LazyFrame) -> pl.LazyFrame:
+    """Sort the goal events by match and score and derive the scoring team, the
+    lead after the goal and the minutes until the next goal or full time. Matches
+    are contiguous segments of the sorted stream, so neighbouring goals are accessed
+    with plain shifts masked at the segment boundaries instead of a window per match.
+
+    Parameters
+    ----------
+    goals : pl.LazyFrame
+        Clean goals records.
+
+    Returns
+    -------
+    goal_stream : pl.LazyFrame
+        One row per goal.
+    """
+    score_team_1 = pl.col("score_team_1").cast(pl.Int32)
+    score_team_2 = pl.col("score_team_2").cast(pl.Int32)
+    minute = pl.col("match_minute").cast(pl.Int32)
+
+    # the total score increases with every goal, even if the minute is unknown
+    stream = (
+        goals.filter(pl.col("goal_id").is_not_null())
+        .select(
+            pl.col("match_id"),
+            score_team_1.alias("score_team_1"),
+            score_team_2.alias("score_team_2"),
+            minute.alias("minute"),
+        )
+        .sort(["match_id", pl.col("score_team_1") + pl.col("score_team_2")])
+    )
+    first_goal = (pl.col("match_id") != pl.col("match_id").shift(1)).fill_null(True)
+    last_goal = (pl.col("match_id") != pl.col("match_id").shift(-1)).fill_null(True)
+
+    return stream.select(
+        pl.col("match_id"),
+        pl.col("minute"),
+        (
+            pl.col("score_team_1")
+            > pl.when(first_goal).then(0).otherwise(pl.col("score_team_1").shift(1))
+        ).alias("scored_by_1"),
+        (pl.col("score_team_1") - pl.col("score_team_2")).alias("lead"),
+        (
+            pl.when(last_goal)
+            .then(pl.max_horizontal(pl.lit(_FULL_TIME), pl.col("minute")))
+            .otherwise(pl.col("minute").shift(-1))
+            - pl.col("minute")
+        )
+        .clip(lower_bound=0)
+        .alias("duration"),
+    )
+
+
+def _goal_events_openligadb(
+    match_results: pl.LazyFrame, goals: pl.LazyFrame
+) -> pl.LazyFrame:
+    """Aggregate the goal events into counts and minutes per team and match.
+
+    Parameters
+    ----------
+    match_results : pl.LazyFrame
+        Clean match results with final results only.
+    goals : pl.LazyFrame
+        Clean goals records.
+
+    Returns
+    -------
+    goal_events : pl.LazyFrame
+        One row per team and match.
+    """
+    minute, scored_by_1 = pl.col("minute"), pl.col("scored_by_1")
+    halves = {
+        "first_half": minute <= _HALF_TIME,
+        "second_half": minute > _HALF_TIME,
+        "late": minute >= _LATE_MINUTE,
+    }
+
+    # goals of unknown minutes only count in the total score
+    per_match = (
+        _goal_stream(goals)
+        .group_by("match_id")
+        .agg(
+            *[
+                (scorer & half).sum().alias(f"goals_{name}_{team}")
+                for name, half in halves.items()
+                for team, scorer in [(1, scored_by_1), (2, ~scored_by_1)]
+            ],
+            pl.col("duration").filter(pl.col("lead") > 0).sum().alias("leading_1"),
+            pl.col("duration").filter(pl.col("lead") < 0).sum().alias("leading_2"),
+            (pl.col("lead") < 0).any().alias("trailed_1"),
+            (pl.col("lead") > 0).any().alias("trailed_2"),
+        )
+    )
+
+    matches = match_results.select(
+        "match_id", "league_id", "match_day", "team_id_1", "team_id_2", "result_class"
+    ).join(per_match, on="match_id", how="left")
+
+    def team_view(team: int) -> pl.LazyFrame:
+        other = 3 - team
+        return matches.select(
+            pl.col("match_id"),
+            pl.col("league_id"),
+            pl.col("match_day"),
+            pl.col(f"team_id_{team}").alias("team_id"),
+            pl.lit(2 - team).alias("home_team"),
+            *[
+                pl.col(f"goals_{name}_{team}").fill_null(0).alias(f"goals_{name}")
+                for name in halves
+            ],
+            *[
+                pl.col(f"goals_{name}_{other}").fill_null(0).alias(f"conceded_{name}")
+                for name in halves
+            ],
+            (
+                pl.col(f"trailed_{team}").fill_null(False)
+                & (pl.col("result_class") == (1 if team == 1 else -1))
+            )
+            .cast(pl.Int32)
+            .alias("comebacks"),
+            pl.col(f"leading_{team}").fill_null(0).alias("minutes_leading"),
+            pl.col(f"leading_{other}").fill_null(0).alias("minutes_trailing"),
+        )
+
+    return pl.concat([team_view(1), team_view(2)], how="vertical")
+
+
+def _rolling_goal_events(goal_events: pl.LazyFrame) -> pl.LazyFrame:
+    """Sum the goal events over the last 3 and 5 games and average them over all
+    games of a team, like the performance statistics.
+
+    Parameters
+    ----------
+    goal_events : pl.LazyFrame
+        Goal events per team and match.
+
+    Returns
+    -------
+    goal_events_rolling : pl.LazyFrame
+        One row per team and match including the match itself.
+    """
+    group_vars = ["league_id", "team_id"]
+    kpis = [
+        pl.col(kpi).cast(pl.Int32) for kpi in _GOAL_EVENTS_COUNTS + _GOAL_EVENTS_MINUTES
+    ]
+
+    return goal_events.select(
+        pl.col("match_id"),
+        pl.col("league_id"),
+        pl.col("match_day"),
+        pl.col("team_id"),
+        pl.col("home_team"),
+        *[
+            kpi.rolling_sum(n)
+            .over(group_vars, order_by="match_day")
+            .name.suffix(f"_last_{n}_games")
+            for kpi in kpis
+            for n in [3, 5]
+        ],
+        *[
+            (
+                kpi.cum_sum().over(group_vars, order_by="match_day")
+                / kpi.cum_count().over(group_vars, order_by="match_day")
+            ).name.suffix("_avg")
+            for kpi in kpis
+        ],
+    )
+
+
+def create_goal_events_openligadb(
+    match_results_data_path: str,
+    goals_data_path: str,
+    goal_events_data_path: str,
+    dtype_profile: str = "compact",
+    storage_profile: str = "default",
+) -> None:
+    """Create goal event statistics of every team and match based on the openligadb
+    goals records, e.g. first and second half goals, late goals, comebacks and the
+    minutes in the lead. The statistics are summed over the last 3 and 5 games and
+    averaged over all games like the performance statistics.
+    - Only consider final results
+    - Disregard relegation games
+    - Disregard games without a final result or unknown teams
+
+    Parameters
+    ----------
+    match_results_data_path : str
+        Path to the clean match results parquet files.
+    goals_data_path : str
+        Path to the clean goals parquet files, e.g. from clean_openligadb with
+        records="goals" and features=GOALS_FEATURES.
+    goal_events_data_path : str
+        Path to the result file.
+    dtype_profile : str, default="compact"
+        "compact" - smallest integer types that fit the values, Float32 and Enum.
+        "wide" - the Int64, Int32, Float64 and String types polars infers.
+    storage_profile : str, default="default"
+        "default" - the polars defaults, unsorted.
+        "hot" - lz4 and small row groups sorted by league and match day.
+        "archive" - zstd level 19 and large row groups sorted by league and match day.
+    """
+
+    _validate_storage_profile(storage_profile)
+
+    with trace_stage("create_goal_events_openligadb") as stage:
+        match_results = _apply_dtype_profile(
+            pl.scan_parquet(match_results_data_path), "clean", dtype_profile
+        )
+        goals = _apply_dtype_profile(
+            pl.scan_parquet(goals_data_path), "clean", dtype_profile
+        )
+
+        # Filter match results
+        # - Only consider final results
+        # - Disregard relegation games
+        # - Disregard games without a final result or unknown teams
+        match_results_filtered = match_results.filter(
+            (pl.col("result_name")=="Endergebnis")
+            & (~pl.col("match_day_name").str.to_lowercase().str.contains("relegation"))
+            & (pl.col("result_class").is_not_null())
+            & (pl.col("team_id_1").is_not_null())
+            & (pl.col("team_id_2").is_not_null())
+        )  # fmt: skip
+        stage.add_rows_in(goals)
+
+        goal_events = _apply_dtype_profile(
+            _rolling_goal_events(
+                _goal_events_openligadb(match_results_filtered, goals)
+            ),
+            "goal_events",
+            dtype_profile,
+        )
+        stage.capture_plan(goal_events)
+        _write_parquet(
+            goal_events.collect(), goal_events_data_path, "goal_events", storage_profile
+        )
+        stage.add_output(goal_events_data_path)
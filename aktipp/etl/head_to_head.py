@@ -0,0 +1,150 @@
+import polars as pl
+
+from ._schema import _apply_dtype_profile
+from .._storage import _validate_storage_profile, _write_parquet
+from ..tracing import trace_stage
+
+
+def _time_key() -> pl.Expr:
+    """Chronological key of a match from the season start and the match day."""
+    return (
+        pl.col("season_name").str.head(4).cast(pl.Int64) * 100 + pl.col("match_day")
+    ).alias("time_key")
+
+
+def _pair_keys(team_1: str, team_2: str) -> list[pl.Expr]:
+    """Unordered team pair as the lower and the higher team id."""
+    return [
+        pl.min_horizontal(team_1, team_2).alias("team_id_low"),
+        pl.max_horizontal(team_1, team_2).alias("team_id_high"),
+    ]
+
+
+def _create_head_to_head_openligadb(
+    match_results: pl.LazyFrame, n_meetings: int = 5
+) -> pl.LazyFrame:
+    """Statistics of the last meetings of every team pair including the current one.
+
+    Parameters
+    ----------
+    match_results : pl.LazyFrame
+        Clean match results with final results only.
+    n_meetings : int, default=5
+        Number of meetings the wins, draws and goals are summed over.
+
+    Returns
+    -------
+    head_to_head : pl.LazyFrame
+        One row per match sorted by the team pair and time.
+    """
+    low_is_team_1 = pl.col("team_id_1") == pl.col("team_id_low")
+    pair = ["team_id_low", "team_id_high"]
+
+    def last_meetings(expr: pl.Expr) -> pl.Expr:
+        return (
+            expr.cast(pl.Int32)
+            .rolling_sum(n_meetings, min_periods=1)
+            .over(pair, order_by="time_key")
+        )
+
+    return (
+        match_results.with_columns(*_pair_keys("team_id_1", "team_id_2"), _time_key())
+        .select(
+            pl.col("match_id"),
+            *pair,
+            pl.col("time_key"),
+            pl.col("match_id")
+            .cum_count()
+            .over(pair, order_by="time_key")
+            .alias("meetings"),
+            last_meetings(
+                pl.when(low_is_team_1)
+                .then(pl.col("result_class") == 1)
+                .otherwise(pl.col("result_class") == -1)
+            ).alias("wins_low"),
+            last_meetings(pl.col("result_class") == 0).alias("draws"),
+            last_meetings(
+                pl.when(low_is_team_1)
+                .then(pl.col("result_class") == -1)
+                .otherwise(pl.col("result_class") == 1)
+            ).alias("wins_high"),
+            last_meetings(
+                pl.when(low_is_team_1)
+                .then(pl.col("goals_team_1"))
+                .otherwise(pl.col("goals_team_2"))
+            ).alias("goals_low"),
+            last_meetings(
+                pl.when(low_is_team_1)
+                .then(pl.col("goals_team_2"))
+                .otherwise(pl.col("goals_team_1"))
+            ).alias("goals_high"),
+        )
+        .sort([*pair, "time_key"])
+    )
+
+
+def create_head_to_head_openligadb(
+    match_results_data_path: str,
+    head_to_head_data_path: str,
+    n_meetings: int = 5,
+    dtype_profile: str = "compact",
+    storage_profile: str = "default",
+) -> None:
+    """Create the head-to-head history of every team pair based on the openligadb
+    match results. The history is keyed by the unordered team pair, i.e. the lower
+    and the higher team id, and sorted by time, so the meetings before a match can be
+    looked up with an as-of join instead of a self join.
+    - Only consider final results
+    - Disregard relegation games
+    - Disregard games without a final result or unknown teams
+
+    Parameters
+    ----------
+    match_results_data_path : str
+        Path to the clean match results parquet files.
+    head_to_head_data_path : str
+        Path to the result file.
+    n_meetings : int, default=5
+        Number of meetings the wins, draws and goals are summed over.
+    dtype_profile : str, default="compact"
+        "compact" - smallest integer types that fit the values, Float32 and Enum.
+        "wide" - the Int64, Int32, Float64 and String types polars infers.
+    storage_profile : str, default="default"
+        "default" - the polars defaults, unsorted.
+        "hot" - lz4 and small row groups sorted by league and match day.
+        "archive" - zstd level 19 and large row groups sorted by league and match day.
+    """
+
+    _validate_storage_profile(storage_profile)
+
+    with trace_stage("create_head_to_head_openligadb", n_meetings=n_meetings) as stage:
+        match_results = _apply_dtype_profile(
+            pl.scan_parquet(match_results_data_path), "clean", dtype_profile
+        )
+
+        # Filter match results
+        # - Only consider final results
+        # - Disregard relegation games
+        # - Disregard games without a final result or unknown teams
+        match_results_filtered = match_results.filter(
+            (pl.col("result_name")=="Endergebnis")
+            & (~pl.col("match_day_name").str.to_lowercase().str.contains("relegation"))
+            & (pl.col("result_class").is_not_null())
+            & (pl.col("team_id_1").is_not_null())
+            & (pl.col("team_id_2").is_not_null())
+        )  # fmt: skip
+        stage.add_rows_in(match_results_filtered)
+
+        head_to_head = _apply_dtype_profile(
+            _create_head_to_head_openligadb(match_results_filtered, n_meetings),
+            "head_to_head",
+            dtype_profile,
+        )
+        stage.capture_plan(head_to_head)
+        _write_parquet(
+            head_to_head.collect(),
+            head_to_head_data_path,
+            "head_to_head",
+            storage_profile,
+        )
+        stage.add_output(head_to_head_data_path)
@@ -1,6 +1,10 @@
 import polars as pl
 
+from ._schema import _apply_dtype_profile
+from ._sharding import _run_sharded, _write_shard
 from ._team_based_views import _create_team_based_views
+from .._storage import _validate_storage_profile, _write_parquet
+from ..tracing import trace_stage
 
 
 def _performance_openligadb(
@@ -89,25 +93,36 @@ def _performance_openligadb(
     )  # fmt: skip
 
 
-def create_performance_openligadb(
+def _performance_query_openligadb(
     match_results_data_path: str,
-    performance_data_path: str,
-    performance_class: str = "overall",
-) -> pl.LazyFrame:
-    """Create a base table with an idiciator which team is the home team.
+    performance_class: str,
+    dtype_profile: str,
+    league_ids: list[int] | None = None,
+) -> tuple[pl.LazyFrame, pl.LazyFrame]:
+    """Query of the performance of create_performance_openligadb.
 
     Parameters
     ----------
     match_results_data_path : str
         Path to the clean match results parquet files.
-    performance_data_path : str
-        Path to the result file.
-    performance_class : str default='overall'
-        "overall" - all games
-        "home_away" - home_away games seperated
-    """
+    performance_class : str
+        "overall" or "home_away", see create_performance_openligadb.
+    dtype_profile : str
+        Name of the dtype profile.
+    league_ids : list[int] | None, default=None
+        Leagues to be included, None for all leagues.
 
+    Returns
+    -------
+    match_results_filtered : pl.LazyFrame
+        Match results the performance is based on.
+    performance : pl.LazyFrame
+        LazyFrame with the performance statistics.
+    """
     match_results = pl.scan_parquet(match_results_data_path)
+    if league_ids is not None:
+        match_results = match_results.filter(pl.col("league_id").is_in(league_ids))
+    match_results = _apply_dtype_profile(match_results, "clean", dtype_profile)
 
     # Filter match results
     # - Only consider final results
@@ -116,7 +131,7 @@ def create_performance_openligadb(
     match_results_filtered = match_results.filter(
         (pl.col("result_name")=="Endergebnis")
         & (~pl.col("match_day_name").str.to_lowercase().str.contains("relegation"))
-        & (pl.col("result_class").is_not_nan())
+        & (pl.col("result_class").is_not_null())
     )  # fmt: skip
 
     # Create team based views
@@ -127,6 +142,92 @@ def create_performance_openligadb(
         match_results_filtered, team=2, standings_class="overall"
     )
 
-    _performance_openligadb(
-        match_results_team1, match_results_team2, performance_class
-    ).collect().write_parquet(performance_data_path)
+    performance = _apply_dtype_profile(
+        _performance_openligadb(
+            match_results_team1, match_results_team2, performance_class
+        ),
+        "performance",
+        dtype_profile,
+    )
+    return match_results_filtered, performance
+
+
+def _create_performance_shard_openligadb(
+    match_results_data_path: str,
+    shard_data_path: str,
+    league_ids: list[int],
+    performance_class: str,
+    dtype_profile: str,
+) -> None:
+    """Worker of the sharded mode of create_performance_openligadb."""
+    _, performance = _performance_query_openligadb(
+        match_results_data_path, performance_class, dtype_profile, league_ids
+    )
+    _write_shard(performance, shard_data_path)
+
+
+def create_performance_openligadb(
+    match_results_data_path: str,
+    performance_data_path: str,
+    performance_class: str = "overall",
+    dtype_profile: str = "compact",
+    storage_profile: str = "default",
+    n_jobs: int = 1,
+) -> pl.LazyFrame:
+    """Create a base table with an idiciator which team is the home team.
+
+    Parameters
+    ----------
+    match_results_data_path : str
+        Path to the clean match results parquet files.
+    performance_data_path : str
+        Path to the result file.
+    performance_class : str default='overall'
+        "overall" - all games
+        "home_away" - home_away games seperated
+    dtype_profile : str, default="compact"
+        "compact" - smallest integer types that fit the values, Float32 and Enum.
+        "wide" - the Int64, Int32, Float64 and String types polars infers.
+    storage_profile : str, default="default"
+        "default" - the polars defaults, unsorted.
+        "hot" - lz4 and small row groups sorted by league and match day.
+        "archive" - zstd level 19 and large row groups sorted by league and match day.
+    n_jobs : int, default=1
+        Number of worker processes. With more than one, the leagues are split into
+        shards of about the same size, every worker writes the performance of its
+        shard to a file of its own and the files are merged into the result.
+    """
+
+    _validate_storage_profile(storage_profile)
+    if n_jobs < 1:
+        raise ValueError("n_jobs must be at least 1.")
+
+    with trace_stage(
+        "create_performance_openligadb",
+        performance_class=performance_class,
+        n_jobs=n_jobs,
+    ) as stage:
+        match_results_filtered, performance = _performance_query_openligadb(
+            match_results_data_path, performance_class, dtype_profile
+        )
+        stage.add_rows_in(match_results_filtered)
+        stage.capture_plan(performance)
+        if n_jobs == 1:
+            _write_parquet(
+                performance.collect(),
+                performance_data_path,
+                "performance",
+                storage_profile,
+            )
+        else:
+            _run_sharded(
+                _create_performance_shard_openligadb,
+                match_results_data_path,
+                performance_data_path,
+                "performance",
+                storage_profile,
+                n_jobs,
+                performance_class,
+                dtype_profile,
+            )
+        stage.add_output(performance_data_path)
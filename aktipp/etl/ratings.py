@@ -0,0 +1,309 @@
+import os
+
+import numpy as np
+import polars as pl
+
+from ._schema import _apply_dtype_profile
+from .._storage import _validate_storage_profile, _write_parquet
+from ..tracing import trace_stage
+
+
+def _update_elo(
+    ratings: np.ndarray,
+    seasons: np.ndarray,
+    team_1: np.ndarray,
+    team_2: np.ndarray,
+    goals_1: np.ndarray,
+    goals_2: np.ndarray,
+    season: int,
+    k: float,
+    home_advantage: float,
+    carry_over: float,
+    initial_rating: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Update the ratings in place with all matches of one round. Every team plays at
+    most once per round, so all matches are updated at once.
+
+    Parameters
+    ----------
+    ratings : np.ndarray
+        Current rating of every team.
+    seasons : np.ndarray
+        Season of the last match of every team, -1 for teams without matches.
+    team_1 : np.ndarray
+        Index of the home team of every match.
+    team_2 : np.ndarray
+        Index of the away team of every match.
+    goals_1 : np.ndarray
+        Goals of the home team.
+    goals_2 : np.ndarray
+        Goals of the away team.
+    season : int
+        Season of the round.
+    k : float
+        Maximum rating change of a match with a margin of one goal.
+    home_advantage : float
+        Rating points added to the home team for the expected result.
+    carry_over : float
+        Share of the distance to initial_rating kept at the start of a new season.
+    initial_rating : float
+        Rating of new teams.
+
+    Returns
+    -------
+    ratings_pre : tuple[np.ndarray, np.ndarray]
+        Ratings of the home and the away teams before the matches.
+    """
+    # regress the ratings of teams starting a new season towards the initial rating
+    teams = np.concatenate([team_1, team_2])
+    new_season = teams[(seasons[teams] != season) & (seasons[teams] != -1)]
+    ratings[new_season] = initial_rating + carry_over * (
+        ratings[new_season] - initial_rating
+    )
+    seasons[teams] = season
+
+    rating_1, rating_2 = ratings[team_1], ratings[team_2]
+    expected = 1 / (1 + 10 ** ((rating_2 - rating_1 - home_advantage) / 400))
+    result = (np.sign(goals_1 - goals_2) + 1) / 2
+
+    # margin of victory multiplier of the world football elo ratings
+    margin = np.abs(goals_1 - goals_2)
+    multiplier = np.where(
+        margin <= 1, 1.0, np.where(margin == 2, 1.5, (11 + margin) / 8)
+    )
+
+    change = k * multiplier * (result - expected)
+    np.add.at(ratings, team_1, change)
+    np.add.at(ratings, team_2, -change)
+
+    return rating_1, rating_2
+
+
+def _elo_ratings_openligadb(
+    match_results: pl.DataFrame,
+    state: pl.DataFrame | None = None,
+    k: float = 20.0,
+    home_advantage: float = 65.0,
+    carry_over: float = 0.8,
+    initial_rating: float = 1500.0,
+) -> tuple[pl.DataFrame, pl.DataFrame]:
+    """Compute the pre-match elo ratings of both teams of every match.
+
+    Parameters
+    ----------
+    match_results : pl.DataFrame
+        Clean match results with final results only.
+    state : pl.DataFrame | None, default=None
+        Ratings after the previously processed matches with the columns team_id,
+        elo and season. None to start with initial_rating for every team.
+    k, home_advantage, carry_over, initial_rating
+        See create_ratings_openligadb.
+
+    Returns
+    -------
+    ratings : tuple[pl.DataFrame, pl.DataFrame]
+        Ratings with one row per team and match and the new state.
+    """
+    if state is None:
+        state = pl.DataFrame(
+            schema={"team_id": pl.Int64, "elo": pl.Float64, "season": pl.Int64}
+        )
+
+    match_columns = ["match_id", "league_id", "season_name", "match_day"]
+    if len(match_results) == 0:
+        # nothing to rate, e.g. an incremental run without new matches
+        elo = match_results.select(
+            *match_columns,
+            pl.col("team_id_1").alias("team_id"),
+            pl.lit(1).alias("home_team"),
+            pl.lit(None, pl.Float64).alias("elo"),
+            pl.lit(None, pl.Float64).alias("elo_opponent"),
+        )
+        return elo, state
+
+    match_results = match_results.with_columns(
+        pl.col("season_name").str.head(4).cast(pl.Int64).alias("season")
+    ).sort(["season", "match_day", "match_id"])
+
+    # dense team indices over the known and the new teams
+    team_ids, team_index = np.unique(
+        np.concatenate(
+            [
+                state["team_id"].to_numpy(),
+                match_results["team_id_1"].to_numpy(),
+                match_results["team_id_2"].to_numpy(),
+            ]
+        ),
+        return_inverse=True,
+    )
+    n_state, n_matches = len(state), len(match_results)
+    team_1 = team_index[n_state : n_state + n_matches]
+    team_2 = team_index[n_state + n_matches :]
+
+    ratings = np.full(len(team_ids), initial_rating)
+    ratings[team_index[:n_state]] = state["elo"].to_numpy()
+    seasons = np.full(len(team_ids), -1)
+    seasons[team_index[:n_state]] = state["season"].to_numpy()
+
+    goals_1 = match_results["goals_team_1"].to_numpy().astype(np.int64)
+    goals_2 = match_results["goals_team_2"].to_numpy().astype(np.int64)
+    season = match_results["season"].to_numpy()
+    match_day = match_results["match_day"].to_numpy().astype(np.int64)
+
+    # rounds are contiguous blocks of matches, because the data is sorted
+    round_key = season * 1_000 + match_day
+    boundaries = np.concatenate(
+        [[0], np.flatnonzero(np.diff(round_key)) + 1, [n_matches]]
+    ).astype(np.int64)
+
+    rating_1 = np.empty(n_matches)
+    rating_2 = np.empty(n_matches)
+    for start, end in zip(boundaries[:-1], boundaries[1:], strict=True):
+        rating_1[start:end], rating_2[start:end] = _update_elo(
+            ratings,
+            seasons,
+            team_1[start:end],
+            team_2[start:end],
+            goals_1[start:end],
+            goals_2[start:end],
+            int(season[start]),
+            k,
+            home_advantage,
+            carry_over,
+            initial_rating,
+        )
+
+    match_results = match_results.with_columns(
+        pl.Series("elo_1", rating_1), pl.Series("elo_2", rating_2)
+    )
+    elo = pl.concat(
+        [
+            match_results.select(
+                *match_columns,
+                pl.col("team_id_1").alias("team_id"),
+                pl.lit(1).alias("home_team"),
+                pl.col("elo_1").alias("elo"),
+                pl.col("elo_2").alias("elo_opponent"),
+            ),
+            match_results.select(
+                *match_columns,
+                pl.col("team_id_2").alias("team_id"),
+                pl.lit(0).alias("home_team"),
+                pl.col("elo_2").alias("elo"),
+                pl.col("elo_1").alias("elo_opponent"),
+            ),
+        ],
+        how="vertical",
+    )
+
+    played = seasons != -1
+    state = pl.DataFrame(
+        {"team_id": team_ids[played], "elo": ratings[played], "season": seasons[played]}
+    )
+    return elo, state
+
+
+def create_ratings_openligadb(
+    match_results_data_path: str,
+    ratings_data_path: str,
+    state_data_path: str | None = None,
+    k: float = 20.0,
+    home_advantage: float = 65.0,
+    carry_over: float = 0.8,
+    initial_rating: float = 1500.0,
+    dtype_profile: str = "compact",
+    storage_profile: str = "default",
+) -> None:
+    """Create the pre-match elo ratings of every team and match based on the
+    openligadb match results. The ratings of all leagues are computed together and
+    carried over between seasons via the unique team ids, so promoted and relegated
+    teams keep their strength.
+    - Only consider final results
+    - Disregard relegation games
+    - Disregard games without a final result or unknown teams
+
+    The matches are processed round by round, i.e. per season and match day, with
+    all matches of a round updated at once.
+
+    Parameters
+    ----------
+    match_results_data_path : str
+        Path to the clean match results parquet files.
+    ratings_data_path : str
+        Path to the result file.
+    state_data_path : str | None, default=None
+        Path to a parquet file with the ratings after the last processed match. If
+        it exists together with the result file, only matches missing in the result
+        file are processed and appended, otherwise all matches are processed. The
+        file is written in both cases. None to always process all matches.
+    k : float, default=20.0
+        Maximum rating change of a match with a margin of one goal.
+    home_advantage : float, default=65.0
+        Rating points added to the home team for the expected result.
+    carry_over : float, default=0.8
+        Share of the distance to initial_rating kept at the start of a new season.
+    initial_rating : float, default=1500.0
+        Rating of new teams.
+    dtype_profile : str, default="compact"
+        "compact" - smallest integer types that fit the values, Float32 and Enum.
+        "wide" - the Int64, Int32, Float64 and String types polars infers.
+    storage_profile : str, default="default"
+        "default" - the polars defaults, unsorted.
+        "hot" - lz4 and small row groups sorted by league and match day.
+        "archive" - zstd level 19 and large row groups sorted by league and match day.
+    """
+
+    _validate_storage_profile(storage_profile)
+
+    with trace_stage("create_ratings_openligadb") as stage:
+        match_results = _apply_dtype_profile(
+            pl.scan_parquet(match_results_data_path), "clean", dtype_profile
+        )
+
+        # Filter match results
+        # - Only consider final results
+        # - Disregard relegation games
+        # - Disregard games without a final result or unknown teams
+        match_results_filtered = match_results.filter(
+            (pl.col("result_name")=="Endergebnis")
+            & (~pl.col("match_day_name").str.to_lowercase().str.contains("relegation"))
+            & (pl.col("result_class").is_not_null())
+            & (pl.col("team_id_1").is_not_null())
+            & (pl.col("team_id_2").is_not_null())
+        )  # fmt: skip
+
+        incremental = (
+            state_data_path is not None
+            and os.path.isfile(state_data_path)
+            and os.path.isfile(ratings_data_path)
+        )
+        if incremental:
+            ratings_previous = pl.read_parquet(ratings_data_path)
+            state = pl.read_parquet(state_data_path)
+            match_results_filtered = match_results_filtered.join(
+                ratings_previous.lazy().select(pl.col("match_id").unique()),
+                on="match_id",
+                how="anti",
+            )
+        else:
+            state = None
+
+        match_results_filtered = match_results_filtered.collect()
+        stage.add_rows_in(match_results_filtered)
+
+        ratings, state = _elo_ratings_openligadb(
+            match_results_filtered, state, k, home_advantage, carry_over, initial_rating
+        )
+        ratings = _apply_dtype_profile(
+            ratings.lazy(), "ratings", dtype_profile
+        ).collect()
+        if incremental:
+            ratings = pl.concat(
+                [ratings_previous.cast(dict(ratings.schema)), ratings],
+                how="vertical",
+            )
+
+        _write_parquet(ratings, ratings_data_path, "ratings", storage_profile)
+        stage.add_output(ratings_data_path)
+        if state_data_path is not None:
+            _write_parquet(state, state_data_path, "ratings_state", storage_profile)
@@ -1,11 +1,15 @@
 import polars as pl
 
+from ._schema import _apply_dtype_profile
+from ._sharding import _run_sharded, _write_shard
 from ._team_based_views import _create_team_based_views
+from .._storage import _validate_storage_profile, _write_parquet
+from ..tracing import trace_stage
 
 
 def _create_standings_openligadb(
     match_results_team1: pl.LazyFrame, match_results_team2: pl.LazyFrame
-) -> pl.DataFrame:
+) -> pl.LazyFrame:
     """Aggregations for the standings.
 
     Parameters
@@ -17,8 +21,8 @@ def _create_standings_openligadb(
 
     Returns
     -------
-    standings : pl.DataFrame
-        DataFrame with the aggreageted standings.
+    standings : pl.LazyFrame
+        LazyFrame with the aggreageted standings.
     """
 
     return (
@@ -69,34 +73,40 @@ def _create_standings_openligadb(
             .over(["league_id", "match_day"])
             .cast(pl.Int64)
             .alias("rank")
-        )
-        .collect()  # fmt: skip
+        )  # fmt: skip
     )
 
 
-def create_standings_openligadb(
+def _standings_query_openligadb(
     match_results_data_path: str,
-    standings_data_path: str,
-    standings_class: str = "overall",
-) -> None:
-    """Create a history of all standings based on the openligadb match results.
-    - Only consider final results
-    - Disregard relegation games
-    - Disregard games without a final result
+    standings_class: str,
+    dtype_profile: str,
+    league_ids: list[int] | None = None,
+) -> tuple[pl.LazyFrame, pl.LazyFrame]:
+    """Query of the standings of create_standings_openligadb.
 
     Parameters
     ----------
     match_results_data_path : str
         Path to the clean match results parquet files.
-    standings_data_path : str
-        Path to the result file.
-    standings_class : str, default='overall'
-        "overall" - the KPIs will be generated for both teams.
-        "home" - the KPIs will only be generated for the home team.
-        "away" - the KPIs will only be generated for the away team.
-    """
+    standings_class : str
+        "overall", "home" or "away", see create_standings_openligadb.
+    dtype_profile : str
+        Name of the dtype profile.
+    league_ids : list[int] | None, default=None
+        Leagues to be included, None for all leagues.
 
+    Returns
+    -------
+    match_results_filtered : pl.LazyFrame
+        Match results the standings are based on.
+    standings : pl.LazyFrame
+        LazyFrame with the standings.
+    """
     match_results = pl.scan_parquet(match_results_data_path)
+    if league_ids is not None:
+        match_results = match_results.filter(pl.col("league_id").is_in(league_ids))
+    match_results = _apply_dtype_profile(match_results, "clean", dtype_profile)
 
     # Filter match results
     # - Only consider final results
@@ -105,7 +115,7 @@ def create_standings_openligadb(
     match_results_filtered = match_results.filter(
         (pl.col("result_name")=="Endergebnis")
         & (~pl.col("match_day_name").str.to_lowercase().str.contains("relegation"))
-        & (pl.col("result_class").is_not_nan())
+        & (pl.col("result_class").is_not_null())
     )  # fmt: skip
 
     # Create team based views
@@ -117,6 +127,89 @@ def create_standings_openligadb(
     )
 
     # Create standings
-    _create_standings_openligadb(
-        match_results_team1, match_results_team2
-    ).write_parquet(standings_data_path)
+    standings = _apply_dtype_profile(
+        _create_standings_openligadb(match_results_team1, match_results_team2),
+        "standings",
+        dtype_profile,
+    )
+    return match_results_filtered, standings
+
+
+def _create_standings_shard_openligadb(
+    match_results_data_path: str,
+    shard_data_path: str,
+    league_ids: list[int],
+    standings_class: str,
+    dtype_profile: str,
+) -> None:
+    """Worker of the sharded mode of create_standings_openligadb."""
+    _, standings = _standings_query_openligadb(
+        match_results_data_path, standings_class, dtype_profile, league_ids
+    )
+    _write_shard(standings, shard_data_path)
+
+
+def create_standings_openligadb(
+    match_results_data_path: str,
+    standings_data_path: str,
+    standings_class: str = "overall",
+    dtype_profile: str = "compact",
+    storage_profile: str = "default",
+    n_jobs: int = 1,
+) -> None:
+    """Create a history of all standings based on the openligadb match results.
+    - Only consider final results
+    - Disregard relegation games
+    - Disregard games without a final result
+
+    Parameters
+    ----------
+    match_results_data_path : str
+        Path to the clean match results parquet files.
+    standings_data_path : str
+        Path to the result file.
+    standings_class : str, default='overall'
+        "overall" - the KPIs will be generated for both teams.
+        "home" - the KPIs will only be generated for the home team.
+        "away" - the KPIs will only be generated for the away team.
+    dtype_profile : str, default="compact"
+        "compact" - smallest integer types that fit the values, Float32 and Enum.
+        "wide" - the Int64, Int32, Float64 and String types polars infers.
+    storage_profile : str, default="default"
+        "default" - the polars defaults, unsorted.
+        "hot" - lz4 and small row groups sorted by league and match day.
+        "archive" - zstd level 19 and large row groups sorted by league and match day.
+    n_jobs : int, default=1
+        Number of worker processes. With more than one, the leagues are split into
+        shards of about the same size, every worker writes the standings of its
+        shard to a file of its own and the files are merged into the result.
+    """
+
+    _validate_storage_profile(storage_profile)
+    if n_jobs < 1:
+        raise ValueError("n_jobs must be at least 1.")
+
+    with trace_stage(
+        "create_standings_openligadb", standings_class=standings_class, n_jobs=n_jobs
+    ) as stage:
+        match_results_filtered, standings = _standings_query_openligadb(
+            match_results_data_path, standings_class, dtype_profile
+        )
+        stage.add_rows_in(match_results_filtered)
+        stage.capture_plan(standings)
+        if n_jobs == 1:
+            _write_parquet(
+                standings.collect(), standings_data_path, "standings", storage_profile
+            )
+        else:
+            _run_sharded(
+                _create_standings_shard_openligadb,
+                match_results_data_path,
+                standings_data_path,
+                "standings",
+                storage_profile,
+                n_jobs,
+                standings_class,
+                dtype_profile,
+            )
+        stage.add_output(standings_data_path)
@@ -0,0 +1,151 @@
+import polars as pl
+import pytest
+
+from aktipp.etl import (
+    GOALS_FEATURES,
+    WIDE_FEATURES,
+    clean_openligadb,
+    create_performance_openligadb,
+    create_standings_openligadb,
+    feature_store,
+    required_columns_openligadb,
+)
+from aktipp.etl.clean import DEFAULT_FEATURES
+from aktipp.normalize import normalize_many_seasons_openligadb
+from aktipp.scraping import generate_many_seasons_openligadb
+
+
+def test_feature_registry():
+    assert set(DEFAULT_FEATURES) <= set(feature_store.FEATURES)
+    assert feature_store.required_meta(["match_id", "league_id"]) == [
+        "matchID",
+        "leagueId",
+    ]
+    assert feature_store.required_record_keys(["goals_diff", "goals_team_1"]) == [
+        "pointsTeam1",
+        "pointsTeam2",
+    ]
+    # registered functions stay callable from the feature store
+    assert feature_store._match_id().meta.output_name() == "match_id"
+    with pytest.raises(ValueError):
+        feature_store.get_feature("unknown")
+
+
+def test_clean_with_required_columns(tmp_path):
+    data_path = f"{tmp_path}/"
+    generate_many_seasons_openligadb(["bl1"], [2023], data_path, n_teams=4)
+    normalize_many_seasons_openligadb(["bl1"], [2023], data_path)
+    clean_openligadb(data_path, "matchResults")
+    clean = pl.read_parquet(data_path + "matchResults_clean.parquet")
+
+    # by default only the columns of the default features are normalized
+    for records, layout, features in [
+        ("matchResults", "long", DEFAULT_FEATURES),
+        ("matchResults", "wide", WIDE_FEATURES),
+        ("goals", "long", GOALS_FEATURES),
+    ]:
+        normalize_many_seasons_openligadb(
+            ["bl1"], [2023], data_path, records=records, layout=layout
+        )
+        meta, record_keys = required_columns_openligadb(features)
+        schema = pl.read_parquet_schema(data_path + f"bl1_2023_{records}.parquet")
+        assert schema.keys() == set(meta + record_keys)
+        assert "team1.teamIconUrl" not in schema
+    normalize_many_seasons_openligadb(["bl1"], [2023], data_path)
+
+    features = ["match_id", "season_name", "team_id_1", "goals_team_1"]
+    meta, record_keys = required_columns_openligadb(features)
+    assert meta == ["leagueId", "leagueName", "team1.teamId", "team2.teamId", "matchID"]
+    assert record_keys == ["pointsTeam1"]
+
+    # normalize only the required columns
+    normalize_many_seasons_openligadb(
+        ["bl1"], [2023], data_path, meta=meta, record_keys=record_keys
+    )
+    assert pl.read_parquet_schema(
+        data_path + "bl1_2023_matchResults.parquet"
+    ).keys() == set(meta + record_keys)
+    clean_openligadb(data_path, "matchResults", features)
+    assert pl.read_parquet(data_path + "matchResults_clean.parquet").equals(
+        clean.select(features)
+    )
+
+    with pytest.raises(ValueError):
+        clean_openligadb(data_path, "matchResults", ["match_day"])
+
+
+def test_dtype_profile(tmp_path):
+    data_path = f"{tmp_path}/"
+    generate_many_seasons_openligadb(["bl1"], [2022, 2023], data_path, n_teams=4)
+    normalize_many_seasons_openligadb(["bl1"], [2022, 2023], data_path)
+
+    standings = {}
+    for dtype_profile in ["compact", "wide"]:
+        clean_openligadb(data_path, "matchResults", dtype_profile=dtype_profile)
+        create_standings_openligadb(
+            data_path + "matchResults_clean.parquet",
+            data_path + f"standings_{dtype_profile}.parquet",
+            dtype_profile=dtype_profile,
+        )
+        standings[dtype_profile] = pl.read_parquet(
+            data_path + f"standings_{dtype_profile}.parquet"
+        )
+
+    assert standings["compact"]["rank"].dtype == pl.UInt16
+    assert standings["compact"]["goals_diff"].dtype == pl.Int16
+    assert standings["wide"]["rank"].dtype == pl.Int64
+    assert (
+        standings["compact"]
+        .cast(dict(standings["wide"].schema))
+        .equals(standings["wide"])
+    )
+
+    with pytest.raises(ValueError):
+        clean_openligadb(data_path, "matchResults", dtype_profile="tiny")
+
+
+def test_wide_layout(tmp_path):
+    data_path = f"{tmp_path}/"
+    generate_many_seasons_openligadb(["bl1"], [2022, 2023], data_path, n_teams=4)
+    normalize_many_seasons_openligadb(
+        ["bl1"], [2022, 2023], data_path, meta="all", record_keys="all"
+    )
+    long = pl.read_parquet(data_path + "bl1_2023_matchResults.parquet")
+    clean_openligadb(data_path, "matchResults")
+    stages = {
+        "standings": create_standings_openligadb,
+        "performance": create_performance_openligadb,
+    }
+    for name, stage in stages.items():
+        stage(data_path + "matchResults_clean.parquet", data_path + f"{name}.parquet")
+
+    normalize_many_seasons_openligadb(["bl1"], [2022, 2023], data_path, layout="wide")
+    wide = pl.read_parquet(data_path + "bl1_2023_matchResults.parquet")
+    assert len(wide) == long["matchID"].n_unique() < len(long)
+    assert wide["halfTimePointsTeam1"].dtype == pl.Int64
+    half_time = (
+        long.filter(pl.col("resultTypeID") == 1)
+        .select("matchID", pl.col("pointsTeam1").alias("halfTimePointsTeam1"))
+        .join(wide.select("matchID", "halfTimePointsTeam1"), on="matchID")
+    )
+    assert half_time["halfTimePointsTeam1"].equals(
+        half_time["halfTimePointsTeam1_right"], check_names=False
+    )
+
+    # the downstream stages are unchanged, only the half time rows are gone
+    clean_openligadb(data_path, "matchResults", WIDE_FEATURES)
+    clean = pl.read_parquet(data_path + "matchResults_clean.parquet")
+    assert clean["half_time_goals_team_1"].dtype == pl.UInt8
+    assert (clean["result_name"] == "Endergebnis").all()
+    for name, stage in stages.items():
+        stage(data_path + "matchResults_clean.parquet", data_path + "wide.parquet")
+        assert pl.read_parquet(data_path + "wide.parquet").equals(
+            pl.read_parquet(data_path + f"{name}.parquet")
+        )
+
+    with pytest.raises(ValueError):
+        normalize_many_seasons_openligadb(["bl1"], [2023], data_path, layout="flat")
+    with pytest.raises(ValueError):
+        normalize_many_seasons_openligadb(
+            ["bl1"], [2023], data_path, records="goals", layout="wide"
+        )
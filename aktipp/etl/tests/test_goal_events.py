@@ -0,0 +1,88 @@
+import polars as pl
+
+from aktipp.etl import (
+    GOALS_FEATURES,
+    FeatureBuilderOpenligadb,
+    clean_openligadb,
+    create_goal_events_openligadb,
+)
+from aktipp.etl.goal_events import _goal_events_openligadb
+from aktipp.normalize import normalize_many_seasons_openligadb
+from aktipp.scraping import generate_season_openligadb
+
+
+def test_goal_events(tmp_path):
+    data_path = f"{tmp_path}/"
+    generate_season_openligadb("bl1", 2023, data_path, n_teams=6, match_days_played=8)
+    for records in ["matchResults", "goals"]:
+        normalize_many_seasons_openligadb(["bl1"], [2023], data_path, records=records)
+    clean_openligadb(data_path, "matchResults")
+    clean_openligadb(data_path, "goals", features=GOALS_FEATURES)
+    create_goal_events_openligadb(
+        data_path + "matchResults_clean.parquet",
+        data_path + "goals_clean.parquet",
+        data_path + "goal_events.parquet",
+    )
+
+    match_results = pl.read_parquet(data_path + "matchResults_clean.parquet").filter(
+        (pl.col("result_name") == "Endergebnis") & pl.col("result_class").is_not_null()
+    )
+    goals = pl.read_parquet(data_path + "goals_clean.parquet")
+    goal_events = _goal_events_openligadb(match_results.lazy(), goals.lazy()).collect()
+    assert len(goal_events) == 2 * len(match_results)
+
+    # naive replay of the goals of every match
+    for match in match_results.iter_rows(named=True):
+        match_goals = goals.filter(
+            (pl.col("match_id") == match["match_id"]) & pl.col("goal_id").is_not_null()
+        ).sort("match_minute")
+        score, lead_1, lead_2, trailed = (0, 0), 0, 0, {1: False, 2: False}
+        counts = {1: [0, 0, 0], 2: [0, 0, 0]}
+        minutes = match_goals["match_minute"].to_list() + [90]
+        for goal, end in zip(match_goals.iter_rows(named=True), minutes[1:]):
+            team = 1 if goal["score_team_1"] > score[0] else 2
+            score = (goal["score_team_1"], goal["score_team_2"])
+            minute = goal["match_minute"]
+            counts[team][0 if minute <= 45 else 1] += 1
+            counts[team][2] += minute >= 76
+            lead_1 += (end - minute) * (score[0] > score[1])
+            lead_2 += (end - minute) * (score[1] > score[0])
+            trailed[1] |= score[0] < score[1]
+            trailed[2] |= score[1] < score[0]
+
+        for team, other, won, leading, trailing in [
+            (1, 2, match["result_class"] == 1, lead_1, lead_2),
+            (2, 1, match["result_class"] == -1, lead_2, lead_1),
+        ]:
+            row = goal_events.row(
+                by_predicate=(pl.col("match_id") == match["match_id"])
+                & (pl.col("team_id") == match[f"team_id_{team}"]),
+                named=True,
+            )
+            assert [row["goals_first_half"], row["goals_second_half"]] == counts[team][
+                :2
+            ]
+            assert row["goals_late"] == counts[team][2]
+            assert row["conceded_first_half"] == counts[other][0]
+            assert row["conceded_late"] == counts[other][2]
+            assert row["minutes_leading"] == leading
+            assert row["minutes_trailing"] == trailing
+            assert row["comebacks"] == int(trailed[team] and won)
+
+    # the features of a match only contain the goal events of earlier match days
+    features = (
+        FeatureBuilderOpenligadb()
+        .get_features(
+            data_path + "matchResults_clean.parquet",
+            "",
+            {"goal_events": data_path + "goal_events.parquet"},
+        )
+        .collect()
+    )
+    rolling = pl.read_parquet(data_path + "goal_events.parquet")
+    row = features.filter(pl.col("match_day") == 6).row(0, named=True)
+    expected = rolling.filter(
+        (pl.col("team_id") == row["team_id_1"]) & (pl.col("match_day") == 5)
+    )
+    assert row["goals_late_last_3_games_1"] == expected["goals_late_last_3_games"][0]
+    assert row["minutes_leading_avg_1"] == expected["minutes_leading_avg"][0]
@@ -0,0 +1,69 @@
+import polars as pl
+
+from aktipp.etl import (
+    FeatureBuilderOpenligadb,
+    clean_openligadb,
+    create_head_to_head_openligadb,
+)
+from aktipp.normalize import normalize_many_seasons_openligadb
+from aktipp.scraping import generate_many_seasons_openligadb
+
+
+def test_head_to_head(tmp_path):
+    data_path = f"{tmp_path}/"
+    generate_many_seasons_openligadb(["bl1"], [2021, 2022, 2023], data_path, n_teams=4)
+    normalize_many_seasons_openligadb(["bl1"], [2021, 2022, 2023], data_path)
+    clean_openligadb(data_path, "matchResults")
+    create_head_to_head_openligadb(
+        data_path + "matchResults_clean.parquet",
+        data_path + "head_to_head.parquet",
+        n_meetings=3,
+    )
+    features = (
+        FeatureBuilderOpenligadb()
+        .get_features(
+            data_path + "matchResults_clean.parquet",
+            "",
+            {"head_to_head": data_path + "head_to_head.parquet"},
+        )
+        .collect()
+    )
+
+    # naive self join over all earlier meetings of the same teams
+    matches = (
+        pl.read_parquet(data_path + "matchResults_clean.parquet")
+        .filter(pl.col("result_name") == "Endergebnis")
+        .with_columns(
+            (
+                pl.col("season_name").str.head(4).cast(pl.Int64) * 100
+                + pl.col("match_day")
+            ).alias("time")
+        )
+    )
+    times = dict(zip(matches["match_id"], matches["time"], strict=True))
+    for row in features.iter_rows(named=True):
+        team_1, team_2 = row["team_id_1"], row["team_id_2"]
+        earlier = (
+            matches.filter(
+                pl.col("time") < times[row["match_id"]],
+                pl.col("team_id_1").is_in([team_1, team_2]),
+                pl.col("team_id_2").is_in([team_1, team_2]),
+            )
+            .sort("time")
+            .with_columns(
+                pl.when(pl.col("team_id_1") == team_1)
+                .then(pl.col("goals_team_1"))
+                .otherwise(pl.col("goals_team_2"))
+                .alias("goals_1"),
+                pl.when(pl.col("team_id_1") == team_1)
+                .then(pl.col("result_class"))
+                .otherwise(-pl.col("result_class"))
+                .alias("result_1"),
+            )
+        )
+        last = earlier.tail(3)
+        assert row["h2h_meetings"] == len(earlier)
+        assert row["h2h_goals_1"] == last["goals_1"].sum()
+        assert row["h2h_wins_1"] == (last["result_1"] == 1).sum()
+        assert row["h2h_draws"] == (last["result_1"] == 0).sum()
+        assert row["h2h_wins_2"] == (last["result_1"] == -1).sum()
@@ -0,0 +1,113 @@
+import polars as pl
+
+from aktipp.etl import (
+    FeatureBuilderOpenligadb,
+    clean_openligadb,
+    create_ratings_openligadb,
+)
+from aktipp.normalize import normalize_many_seasons_openligadb
+from aktipp.scraping import generate_many_seasons_openligadb
+
+
+def _elo_loop(match_results: pl.DataFrame) -> dict[tuple[int, int], float]:
+    """Reference implementation updating one match after the other."""
+    ratings, seasons, pre_match = {}, {}, {}
+    for match in match_results.sort(["season_name", "match_day"]).iter_rows(named=True):
+        season = match["season_name"]
+        team_1, team_2 = match["team_id_1"], match["team_id_2"]
+        for team in [team_1, team_2]:
+            if team in seasons and seasons[team] != season:
+                ratings[team] = 1500 + 0.8 * (ratings[team] - 1500)
+            seasons[team] = season
+        rating_1, rating_2 = ratings.get(team_1, 1500.0), ratings.get(team_2, 1500.0)
+        pre_match[match["match_id"], team_1] = rating_1
+        pre_match[match["match_id"], team_2] = rating_2
+
+        margin = abs(match["goals_team_1"] - match["goals_team_2"])
+        multiplier = 1 if margin <= 1 else 1.5 if margin == 2 else (11 + margin) / 8
+        result = (match["result_class"] + 1) / 2
+        expected = 1 / (1 + 10 ** ((rating_2 - rating_1 - 65) / 400))
+        change = 20 * multiplier * (result - expected)
+        ratings[team_1] = rating_1 + change
+        ratings[team_2] = rating_2 - change
+    return pre_match
+
+
+def test_create_ratings(tmp_path):
+    data_path = f"{tmp_path}/"
+    generate_many_seasons_openligadb(["bl1"], [2022, 2023], data_path, n_teams=6)
+
+    # first season, then the second season incrementally
+    normalize_many_seasons_openligadb(["bl1"], [2022], data_path)
+    clean_openligadb(data_path, "matchResults", dtype_profile="wide")
+    create_ratings_openligadb(
+        data_path + "matchResults_clean.parquet",
+        data_path + "ratings_incremental.parquet",
+        data_path + "state.parquet",
+        dtype_profile="wide",
+    )
+    normalize_many_seasons_openligadb(["bl1"], [2023], data_path)
+    clean_openligadb(data_path, "matchResults", dtype_profile="wide")
+    create_ratings_openligadb(
+        data_path + "matchResults_clean.parquet",
+        data_path + "ratings_incremental.parquet",
+        data_path + "state.parquet",
+        dtype_profile="wide",
+    )
+    create_ratings_openligadb(
+        data_path + "matchResults_clean.parquet",
+        data_path + "ratings.parquet",
+        dtype_profile="wide",
+    )
+
+    ratings = pl.read_parquet(data_path + "ratings.parquet")
+    ratings_incremental = pl.read_parquet(data_path + "ratings_incremental.parquet")
+    assert ratings.sort(["match_id", "team_id"]).equals(
+        ratings_incremental.sort(["match_id", "team_id"])
+    )
+
+    match_results = pl.read_parquet(data_path + "matchResults_clean.parquet").filter(
+        pl.col("result_name") == "Endergebnis"
+    )
+    expected = _elo_loop(match_results)
+    assert len(ratings) == len(expected)
+    for match_id, team_id, elo in ratings.select(
+        "match_id", "team_id", "elo"
+    ).iter_rows():
+        assert abs(elo - expected[match_id, team_id]) < 1e-9
+
+    features = (
+        FeatureBuilderOpenligadb()
+        .get_features(
+            data_path + "matchResults_clean.parquet",
+            "",
+            {"elo_ratings": data_path + "ratings.parquet"},
+        )
+        .collect()
+    )
+    assert features["elo_1"].null_count() == 0
+    assert features["elo_diff"].dtype == pl.Float32
+
+
+def test_create_ratings_unchanged(tmp_path):
+    data_path = f"{tmp_path}/"
+    generate_many_seasons_openligadb(["bl1"], [2023], data_path, n_teams=6)
+    normalize_many_seasons_openligadb(["bl1"], [2023], data_path)
+    clean_openligadb(data_path, "matchResults")
+
+    # a rerun without new matches keeps the ratings and the state
+    outputs = []
+    for _ in range(2):
+        create_ratings_openligadb(
+            data_path + "matchResults_clean.parquet",
+            data_path + "ratings.parquet",
+            data_path + "state.parquet",
+        )
+        outputs.append(
+            (
+                pl.read_parquet(data_path + "ratings.parquet"),
+                pl.read_parquet(data_path + "state.parquet"),
+            )
+        )
+    assert outputs[1][0].equals(outputs[0][0])
+    assert outputs[1][1].equals(outputs[0][1])
@@ -0,0 +1,53 @@
+import os
+
+import polars as pl
+from polars.testing import assert_frame_equal
+
+from aktipp.etl import (
+    clean_openligadb,
+    create_performance_openligadb,
+    create_standings_openligadb,
+)
+from aktipp.normalize import normalize_many_seasons_openligadb
+from aktipp.scraping import generate_many_seasons_openligadb
+
+
+def test_sharded_standings_and_performance(tmp_path):
+    data_path = f"{tmp_path}/"
+    leagues = ["bl1", "bl2", "bl3"]
+    generate_many_seasons_openligadb(leagues, [2022, 2023], data_path, n_teams=6)
+    normalize_many_seasons_openligadb(leagues, [2022, 2023], data_path)
+    clean_openligadb(data_path, "matchResults")
+    match_results_path = data_path + "matchResults_clean.parquet"
+
+    for create, name, sort in [
+        (
+            create_standings_openligadb,
+            "standings",
+            ["league_id", "match_day", "team_id"],
+        ),
+        (
+            create_performance_openligadb,
+            "performance",
+            ["league_id", "match_day", "team_id"],
+        ),
+    ]:
+        create(match_results_path, data_path + f"{name}.parquet")
+        create(match_results_path, data_path + f"{name}_sharded.parquet", n_jobs=2)
+
+        expected = pl.read_parquet(data_path + f"{name}.parquet")
+        result = pl.read_parquet(data_path + f"{name}_sharded.parquet")
+        assert_frame_equal(result.sort(sort), expected.sort(sort))
+
+        # the shards are appended in league order, each sorted by the profile
+        create(
+            match_results_path,
+            data_path + f"{name}_hot.parquet",
+            storage_profile="hot",
+            n_jobs=2,
+        )
+        result = pl.read_parquet(data_path + f"{name}_hot.parquet")
+        assert_frame_equal(result, expected.sort(sort, maintain_order=True))
+
+    # the shards are removed after the merge
+    assert not [path for path in os.listdir(tmp_path) if path.startswith(".shards-")]
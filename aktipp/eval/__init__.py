@@ -1,4 +1,44 @@
-from .ak_score import ak_score, mean_ak_score
+import importlib
+
+# the NumPy based metrics are imported eagerly, their modules share names with
+# the functions they export
+from .ak_score import ak_score, batch_ak_score, mean_ak_score
 from .metrics import multi_mean_poisson_deviance
+from .optimal_tip import expected_ak_score, optimal_tip, poisson_score_probabilities
+
+# polars based attributes are imported on first access, see aktipp.__getattr__
+_LAZY_IMPORTS = {
+    "GroupedTimeSeriesSplit": ".model_selection",
+    "ak_score_expr": ".polars_metrics",
+    "evaluation_report": ".polars_metrics",
+    "multi_mean_poisson_deviance_expr": ".polars_metrics",
+    "poisson_deviance_expr": ".polars_metrics",
+    "walk_forward_backtest": ".backtest",
+}
+
+__all__ = [
+    "GroupedTimeSeriesSplit",
+    "ak_score",
+    "ak_score_expr",
+    "batch_ak_score",
+    "evaluation_report",
+    "expected_ak_score",
+    "mean_ak_score",
+    "multi_mean_poisson_deviance",
+    "multi_mean_poisson_deviance_expr",
+    "optimal_tip",
+    "poisson_deviance_expr",
+    "poisson_score_probabilities",
+    "walk_forward_backtest",
+]
+
+
+def __getattr__(name: str):
+    if name in _LAZY_IMPORTS:
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
-__all__ = ["ak_score", "mean_ak_score", "multi_mean_poisson_deviance"]
+def __dir__() -> list[str]:
+    return sorted(__all__)
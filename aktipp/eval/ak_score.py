@@ -66,3 +66,56 @@ def mean_ak_score(y_true: ArrayLike, y_pred: ArrayLike):
         Mean ak_score.
     """
     return np.mean(ak_score(y_true, y_pred))
+
+
+def batch_ak_score(
+    y_true: ArrayLike, y_pred: ArrayLike, out: np.ndarray | None = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """Calculate the ak_score for a stack of prediction sets against the same ground
+    truth. The ground truth tendencies are computed once and all intermediate arrays
+    use small integer dtypes. Goals are cast to int16, so predictions should already
+    be rounded to whole goals.
+
+    Parameters
+    ----------
+    y_true: np.ArrayLike
+        ArrayLike of shape (n_matches, 2) containing the values for goals_team_1 and
+        goals_team_2.
+    y_pred: np.ArrayLike
+        ArrayLike of shape (n_models, n_matches, 2) containing the values for
+        goals_team_1_pred and goals_team_2_pred. Any shape that broadcasts against
+        y_true is accepted.
+    out: np.ndarray | None, default=None
+        Optional int8 buffer of shape (n_models, n_matches) for the scores.
+
+    Returns
+    -------
+    mean_ak_score: np.ndarray
+        Mean ak_score for every model.
+    ak_score: np.ndarray
+        Calculated score for every model and game.
+    """
+    y_true = np.asarray(y_true).astype(np.int16, copy=False)
+    y_pred = np.asarray(y_pred).astype(np.int16, copy=False)
+
+    shape = np.broadcast_shapes(y_true.shape, y_pred.shape)[:-1]
+    if out is None:
+        out = np.empty(shape, dtype=np.int8)
+    elif out.shape != shape or out.dtype != np.int8:
+        raise ValueError(f"out must be an int8 array of shape {shape}.")
+
+    # ground truth tendencies, computed once for all models
+    tendency_true = np.sign(y_true[..., 0] - y_true[..., 1]).astype(np.int8)
+
+    # correct tendency, 2 points
+    tendency_pred = np.subtract(y_pred[..., 0], y_pred[..., 1])
+    np.sign(tendency_pred, out=tendency_pred)
+    correct = np.equal(tendency_pred, tendency_true)
+    np.multiply(correct, 2, out=out)
+
+    # exact result, another point (an exact result implies the correct tendency)
+    np.equal(y_pred[..., 0], y_true[..., 0], out=correct)
+    correct &= y_pred[..., 1] == y_true[..., 1]
+    out += correct
+
+    return out.mean(axis=-1), out
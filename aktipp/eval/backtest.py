@@ -0,0 +1,193 @@
+import copy
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import polars as pl
+
+from .ak_score import mean_ak_score
+from .metrics import multi_mean_poisson_deviance
+from .optimal_tip import optimal_tip
+
+# feature matrix and estimator of a worker process, set by _init_worker
+_WORKER_STATE = {}
+
+
+def _init_worker(
+    shm_name: str, shape: tuple[int, int], estimator, max_goals: int
+) -> None:
+    """Attach a worker process to the shared feature matrix.
+
+    Parameters
+    ----------
+    shm_name : str
+        Name of the shared memory block with the feature matrix and the target.
+    shape : tuple[int, int]
+        Shape of the shared float64 array. The last column is the target.
+    estimator : object
+        Estimator with fit and predict methods.
+    max_goals : int
+        Highest number of goals per team considered for the tips.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    _WORKER_STATE["shm"] = shm
+    _WORKER_STATE["data"] = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+    _WORKER_STATE["estimator"] = estimator
+    _WORKER_STATE["max_goals"] = max_goals
+
+
+def _run_fold(
+    data: np.ndarray, estimator, max_goals: int, start: int, end: int
+) -> tuple[float, float]:
+    """Train on all rows before start, predict rows start to end and score them.
+
+    Parameters
+    ----------
+    data : np.ndarray
+        Feature matrix with the target as last column, sorted by time. The rows of a
+        match are adjacent with the home team first.
+    estimator : object
+        Estimator with fit and predict methods, copied for every fold.
+    max_goals : int
+        Highest number of goals per team considered for the tips.
+    start : int
+        First row of the test fold.
+    end : int
+        Row after the last row of the test fold.
+
+    Returns
+    -------
+    scores : tuple[float, float]
+        mean_ak_score and multi_mean_poisson_deviance of the test fold.
+    """
+    model = copy.deepcopy(estimator)
+    model.fit(data[:start, :-1], data[:start, -1])
+
+    # one row per match with the goals for team_1 and team_2
+    y_true = data[start:end, -1].reshape(-1, 2)
+    y_pred = np.clip(model.predict(data[start:end, :-1]), 1e-6, None).reshape(-1, 2)
+    tips, _ = optimal_tip(y_pred, max_goals)
+
+    return (
+        float(mean_ak_score(y_true, tips)),
+        multi_mean_poisson_deviance(y_true, y_pred),
+    )
+
+
+def _run_fold_in_worker(start: int, end: int) -> tuple[float, float]:
+    return _run_fold(
+        _WORKER_STATE["data"],
+        _WORKER_STATE["estimator"],
+        _WORKER_STATE["max_goals"],
+        start,
+        end,
+    )
+
+
+def walk_forward_backtest(
+    features: pl.DataFrame | pl.LazyFrame,
+    estimator,
+    feature_columns: list[str],
+    target: str = "goals",
+    min_train_match_days: int = 1,
+    max_goals: int = 10,
+    n_jobs: int = 1,
+) -> pl.DataFrame:
+    """Walk-forward backtest over all (season, match_day) cutoffs. For every cutoff
+    the estimator is trained on all games strictly before it, predicts the expected
+    goals of the games at the cutoff and the optimal tips are scored.
+
+    Parameters
+    ----------
+    features : pl.DataFrame | pl.LazyFrame
+        Output of FeatureBuilderOpenligadb.get_features with target="goals", i.e. two
+        rows per match, one from the perspective of every team.
+    estimator : object
+        Estimator with fit(X, y) and predict(X) methods predicting the expected
+        goals, e.g. sklearn's PoissonRegressor. It is copied for every fold.
+    feature_columns : list[str]
+        Columns used as features. Nulls are passed to the estimator as NaN.
+    target : str, default="goals"
+        Column with the goals scored.
+    min_train_match_days : int, default=1
+        Number of match days used for training before the first cutoff.
+    max_goals : int, default=10
+        Highest number of goals per team considered for the tips.
+    n_jobs : int, default=1
+        Number of worker processes. The feature matrix is shared with the workers
+        via shared memory instead of being pickled for every fold.
+
+    Returns
+    -------
+    backtest : pl.DataFrame
+        DataFrame with one row per cutoff containing the number of training rows,
+        the number of games, the mean_ak_score and the multi_mean_poisson_deviance.
+    """
+    data = (
+        features.lazy()
+        .sort(
+            ["season_name", "match_day", "match_id", "home_team"],
+            descending=[False, False, False, True],
+        )
+        .with_columns(
+            pl.struct(["season_name", "match_day"]).rle_id().alias("__period__")
+        )
+        .collect()
+    )
+
+    # validate that the rows of every match are adjacent
+    match_ids = data["match_id"].to_numpy()
+    home_team = data["home_team"].to_numpy()
+    if (
+        len(data) % 2 != 0
+        or np.any(match_ids[0::2] != match_ids[1::2])
+        or np.any(home_team[0::2] != 1)
+        or np.any(home_team[1::2] != 0)
+    ):
+        raise ValueError("features need exactly one home and one away row per match.")
+
+    # folds are contiguous blocks of rows, because the data is sorted by time
+    period = data["__period__"].to_numpy()
+    boundaries = np.concatenate([[0], np.flatnonzero(np.diff(period)) + 1, [len(data)]])
+    folds = [
+        (int(boundaries[i]), int(boundaries[i + 1]))
+        for i in range(min_train_match_days, len(boundaries) - 1)
+    ]
+
+    values = np.ascontiguousarray(
+        data.select(
+            *[pl.col(column).cast(pl.Float64) for column in feature_columns],
+            pl.col(target).cast(pl.Float64).alias("__target__"),
+        ).to_numpy()
+    )
+
+    if n_jobs == 1 or len(folds) == 0:
+        scores = [_run_fold(values, estimator, max_goals, *fold) for fold in folds]
+    else:
+        shm = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+        try:
+            np.ndarray(values.shape, dtype=np.float64, buffer=shm.buf)[:] = values
+            with ProcessPoolExecutor(
+                max_workers=n_jobs,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(shm.name, values.shape, estimator, max_goals),
+            ) as executor:
+                scores = list(executor.map(_run_fold_in_worker, *zip(*folds)))
+        finally:
+            shm.close()
+            shm.unlink()
+
+    first_rows = [start for start, _ in folds]
+    return pl.DataFrame(
+        {
+            "season_name": data["season_name"].gather(first_rows),
+            "match_day": data["match_day"].gather(first_rows),
+            "train_size": first_rows,
+            "games": [(end - start) // 2 for start, end in folds],
+            "mean_ak_score": [score[0] for score in scores],
+            "multi_mean_poisson_deviance": [score[1] for score in scores],
+        },
+        schema_overrides={"train_size": pl.Int64, "games": pl.Int64},
+    )
@@ -0,0 +1,164 @@
+import numpy as np
+import polars as pl
+
+
+class GroupedTimeSeriesSplit:
+    """Time series cross validation over match days that keeps all rows of a match
+    in the same fold. The features of FeatureBuilderOpenligadb contain two rows per
+    match, one from the perspective of every team, a random split would put one of
+    them into the training data of the other.
+
+    The match days, i.e. the (season, match_day) combinations, are split like
+    sklearn's TimeSeriesSplit: the last n_splits blocks of test_size match days
+    are the test folds and every test fold is trained on the match days before it.
+    The folds are computed once by fit as int32 row indices into the features, so
+    they can be reused for many models and passed as cv to sklearn, e.g.
+    cross_validate(estimator, X, y, cv=splitter).
+
+    Parameters
+    ----------
+    n_splits : int, default=5
+        Number of folds.
+    test_size : int | None, default=None
+        Number of match days per test fold. None for the number of match days
+        divided by n_splits + 1.
+    gap : int, default=0
+        Number of match days between the training and the test data.
+    max_train_size : int | None, default=None
+        Maximum number of match days to train on, None for all earlier ones.
+    """
+
+    def __init__(
+        self,
+        n_splits: int = 5,
+        test_size: int | None = None,
+        gap: int = 0,
+        max_train_size: int | None = None,
+    ):
+        if n_splits < 1:
+            raise ValueError("n_splits must be at least 1.")
+        if test_size is not None and test_size < 1:
+            raise ValueError("test_size must be at least 1.")
+        if gap < 0:
+            raise ValueError("gap must be non-negative.")
+        if max_train_size is not None and max_train_size < 1:
+            raise ValueError("max_train_size must be at least 1.")
+        self.n_splits = n_splits
+        self.test_size = test_size
+        self.gap = gap
+        self.max_train_size = max_train_size
+        self.folds_ = None
+
+    def fit(
+        self,
+        features: pl.DataFrame | pl.LazyFrame,
+        group_column: str = "match_id",
+        time_columns: list[str] | None = None,
+    ) -> "GroupedTimeSeriesSplit":
+        """Compute the folds of the features.
+
+        Parameters
+        ----------
+        features : pl.DataFrame | pl.LazyFrame
+            Features in the row order of the feature matrix the folds index, e.g.
+            the output of FeatureBuilderOpenligadb.get_features.
+        group_column : str, default="match_id"
+            Column with the groups, which are never split between folds.
+        time_columns : list[str] | None, default=None
+            Columns the match days are ordered by. None for
+            ["season_name", "match_day"].
+
+        Returns
+        -------
+        self : GroupedTimeSeriesSplit
+            Splitter with the folds in folds_.
+        """
+        if time_columns is None:
+            time_columns = ["season_name", "match_day"]
+
+        # number the match days in time order
+        data = (
+            features.lazy()
+            .select(
+                (pl.struct(time_columns).rank("dense").cast(pl.Int32) - 1).alias(
+                    "__period__"
+                ),
+                pl.col(group_column),
+            )
+            .collect()
+        )
+        if len(data) == 0:
+            raise ValueError("features must not be empty.")
+
+        split_groups = (
+            data.group_by(group_column)
+            .agg(
+                pl.col("__period__").min().alias("first"),
+                pl.col("__period__").max().alias("last"),
+            )
+            .filter(pl.col("first") != pl.col("last"))
+        )
+        if len(split_groups) > 0:
+            raise ValueError(
+                f"{len(split_groups)} values of {group_column} span several match "
+                f"days, e.g. {split_groups[group_column][0]}."
+            )
+
+        # the stable sort keeps the rows of a match day in the order of the features
+        period = data["__period__"].to_numpy()
+        order = np.argsort(period, kind="stable").astype(np.int32)
+        order.flags.writeable = False
+        period = period[order]
+        n_periods = int(period[-1]) + 1
+
+        test_size = self.test_size or n_periods // (self.n_splits + 1)
+        n_train_periods = n_periods - self.n_splits * test_size - self.gap
+        if test_size < 1 or n_train_periods < 1:
+            raise ValueError(
+                f"{n_periods} match days are too few for {self.n_splits} splits "
+                f"with test_size={test_size} and gap={self.gap}."
+            )
+
+        # first row of every match day, the folds are views of the ordered rows
+        bounds = np.searchsorted(period, np.arange(n_periods + 1))
+        self.folds_ = []
+        for test_start in range(
+            n_periods - self.n_splits * test_size, n_periods, test_size
+        ):
+            train_end = test_start - self.gap
+            train_start = (
+                0
+                if self.max_train_size is None
+                else max(0, train_end - self.max_train_size)
+            )
+            self.folds_.append(
+                (
+                    order[bounds[train_start] : bounds[train_end]],
+                    order[bounds[test_start] : bounds[test_start + test_size]],
+                )
+            )
+        return self
+
+    def split(self, X=None, y=None, groups=None):
+        """Yield the training and test indices of every fold.
+
+        Parameters
+        ----------
+        X, y, groups : object
+            Ignored, the folds are computed by fit. Exist for compatibility with
+            sklearn's cross validation.
+
+        Yields
+        ------
+        train : np.ndarray
+            int32 indices of the training rows.
+        test : np.ndarray
+            int32 indices of the test rows.
+        """
+        if self.folds_ is None:
+            raise ValueError("The splitter is not fitted, call fit first.")
+        yield from self.folds_
+
+    def get_n_splits(self, X=None, y=None, groups=None) -> int:
+        """Number of folds."""
+        return self.n_splits
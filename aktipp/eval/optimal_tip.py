@@ -0,0 +1,144 @@
+import numpy as np
+from numpy.typing import ArrayLike
+
+from .ak_score import ak_score
+
+
+def _candidate_scores(max_goals: int) -> np.ndarray:
+    """Enumerate all results from 0:0 up to max_goals:max_goals.
+
+    Parameters
+    ----------
+    max_goals : int
+        Highest number of goals per team.
+
+    Returns
+    -------
+    candidates : np.ndarray
+        Array of shape ((max_goals + 1) ** 2, 2) in row-major order of the score
+        grid, i.e. candidate k corresponds to grid cell divmod(k, max_goals + 1).
+    """
+    goals = np.arange(max_goals + 1)
+    return np.stack(np.meshgrid(goals, goals, indexing="ij"), axis=-1).reshape(-1, 2)
+
+
+def _ak_score_matrix(max_goals: int) -> np.ndarray:
+    """Points for every combination of tip (rows) and actual result (columns).
+
+    Parameters
+    ----------
+    max_goals : int
+        Highest number of goals per team.
+
+    Returns
+    -------
+    ak_score_matrix : np.ndarray
+        Array of shape ((max_goals + 1) ** 2, (max_goals + 1) ** 2).
+    """
+    candidates = _candidate_scores(max_goals)
+    return ak_score(candidates[np.newaxis, :, :], candidates[:, np.newaxis, :])
+
+
+def poisson_score_probabilities(y_pred: ArrayLike, max_goals: int = 10) -> np.ndarray:
+    """Calculate the probability of every result from 0:0 up to max_goals:max_goals
+    under independent poisson distributed goals.
+
+    Parameters
+    ----------
+    y_pred : ArrayLike
+        ArrayLike with two columns containing the expected goals for team_1 and
+        team_2.
+    max_goals : int, default=10
+        Highest number of goals per team. Results with more goals are not part of the
+        grid, so the probabilities of a match sum up to slightly less than 1.
+
+    Returns
+    -------
+    score_probabilities : np.ndarray
+        Array of shape (n_matches, max_goals + 1, max_goals + 1). The element
+        [i, g1, g2] is the probability of the result g1:g2 in match i.
+    """
+    rates = np.asarray(y_pred, dtype=np.float64)
+    if rates.ndim != 2 or rates.shape[1] != 2:
+        raise ValueError("y_pred must have the shape (n_matches, 2).")
+    if np.any(rates < 0):
+        raise ValueError("Expected goals must be non-negative.")
+
+    # poisson pmf via the recursion p(k) = p(k - 1) * rate / k
+    goals = np.arange(1, max_goals + 1)
+    pmf = np.empty(rates.shape + (max_goals + 1,))
+    pmf[..., 0] = 1.0
+    pmf[..., 1:] = rates[..., np.newaxis] / goals
+    np.cumprod(pmf, axis=-1, out=pmf)
+    pmf *= np.exp(-rates)[..., np.newaxis]
+
+    return pmf[:, 0, :, np.newaxis] * pmf[:, 1, np.newaxis, :]
+
+
+def expected_ak_score(score_probabilities: ArrayLike) -> np.ndarray:
+    """Calculate the expected ak_score of every possible tip.
+
+    Parameters
+    ----------
+    score_probabilities : ArrayLike
+        ArrayLike of shape (n_matches, max_goals + 1, max_goals + 1) with the
+        probability of every result, e.g. from poisson_score_probabilities.
+
+    Returns
+    -------
+    expected_ak_score : np.ndarray
+        Array of shape (n_matches, max_goals + 1, max_goals + 1). The element
+        [i, g1, g2] is the expected ak_score of tipping g1:g2 in match i.
+    """
+    probabilities = np.asarray(score_probabilities, dtype=np.float64)
+    if probabilities.ndim != 3 or probabilities.shape[1] != probabilities.shape[2]:
+        raise ValueError(
+            "score_probabilities must have the shape "
+            "(n_matches, max_goals + 1, max_goals + 1)."
+        )
+    n_matches, n_goals, _ = probabilities.shape
+
+    points = _ak_score_matrix(n_goals - 1).astype(np.float64)
+    expected = probabilities.reshape(n_matches, -1) @ points.T
+
+    return expected.reshape(n_matches, n_goals, n_goals)
+
+
+def optimal_tip(
+    y_pred: ArrayLike, max_goals: int = 10
+) -> tuple[np.ndarray, np.ndarray]:
+    """Find the tip with the highest expected ak_score for every match.
+
+    Parameters
+    ----------
+    y_pred : ArrayLike
+        Either an ArrayLike with two columns containing the expected goals for
+        team_1 and team_2 or an ArrayLike of shape
+        (n_matches, max_goals + 1, max_goals + 1) with the probability of every
+        result.
+    max_goals : int, default=10
+        Highest number of goals per team, if y_pred contains expected goals.
+        Ignored for score probabilities.
+
+    Returns
+    -------
+    tips : np.ndarray
+        Array of shape (n_matches, 2) with the optimal tip for goals_team_1 and
+        goals_team_2.
+    expected_ak_score : np.ndarray
+        Expected ak_score of the optimal tip for every match.
+    """
+    y_pred = np.asarray(y_pred, dtype=np.float64)
+    if y_pred.ndim == 2:
+        score_probabilities = poisson_score_probabilities(y_pred, max_goals)
+    else:
+        score_probabilities = y_pred
+
+    expected = expected_ak_score(score_probabilities)
+    n_matches, n_goals, _ = expected.shape
+
+    expected = expected.reshape(n_matches, -1)
+    best = np.argmax(expected, axis=1)
+    tips = np.stack(np.divmod(best, n_goals), axis=-1)
+
+    return tips, expected[np.arange(n_matches), best]
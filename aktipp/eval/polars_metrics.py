@@ -0,0 +1,154 @@
+import polars as pl
+
+
+def ak_score_expr(
+    goals_team_1: str = "goals_team_1",
+    goals_team_2: str = "goals_team_2",
+    goals_team_1_pred: str = "goals_team_1_pred",
+    goals_team_2_pred: str = "goals_team_2_pred",
+) -> pl.Expr:
+    """Polars expression equivalent of ak_score.
+
+    Parameters
+    ----------
+    goals_team_1 : str, default="goals_team_1"
+        Column with the true goals of team_1.
+    goals_team_2 : str, default="goals_team_2"
+        Column with the true goals of team_2.
+    goals_team_1_pred : str, default="goals_team_1_pred"
+        Column with the predicted goals of team_1.
+    goals_team_2_pred : str, default="goals_team_2_pred"
+        Column with the predicted goals of team_2.
+
+    Returns
+    -------
+    ak_score : pl.Expr
+        Expression with the calculated score for every game.
+    """
+    tendency_true = (pl.col(goals_team_1) - pl.col(goals_team_2)).sign()
+    tendency_pred = (pl.col(goals_team_1_pred) - pl.col(goals_team_2_pred)).sign()
+
+    return (
+        pl.when(
+            (pl.col(goals_team_1) == pl.col(goals_team_1_pred))
+            & (pl.col(goals_team_2) == pl.col(goals_team_2_pred))
+        )
+        .then(3)  # exact result
+        .when(tendency_true == tendency_pred)
+        .then(2)  # correct tendency
+        .otherwise(0)
+        .alias("ak_score")
+    )
+
+
+def poisson_deviance_expr(y_true: str, y_pred: str) -> pl.Expr:
+    """Polars expression for the unit poisson deviance of every row.
+
+    Parameters
+    ----------
+    y_true : str
+        Column with the true values.
+    y_pred : str
+        Column with the predicted values.
+
+    Returns
+    -------
+    poisson_deviance : pl.Expr
+        Expression with the poisson deviance for every row.
+    """
+    true = pl.col(y_true)
+    pred = pl.col(y_pred)
+    # y * log(y / mu) is defined as 0 for y == 0
+    xlogy = pl.when(true > 0).then(true * (true / pred).log()).otherwise(0.0)
+
+    return (2 * (xlogy - true + pred)).alias(f"poisson_deviance_{y_true}")
+
+
+def multi_mean_poisson_deviance_expr(
+    y_true: str | list[str], y_pred: str | list[str]
+) -> pl.Expr:
+    """Polars expression equivalent of multi_mean_poisson_deviance. As an
+    aggregation, it can be used in a group_by context.
+
+    Parameters
+    ----------
+    y_true : str | list[str]
+        Column(s) with the true values.
+    y_pred : str | list[str]
+        Column(s) with the predicted values, in the same order as y_true.
+
+    Returns
+    -------
+    multi_mean_poisson_deviance : pl.Expr
+        Expression with the mean poisson deviance averaged over all targets.
+    """
+    if isinstance(y_true, str):
+        y_true = [y_true]
+    if isinstance(y_pred, str):
+        y_pred = [y_pred]
+    if len(y_true) != len(y_pred):
+        raise ValueError("y_true and y_pred need the same number of columns.")
+
+    return pl.mean_horizontal(
+        poisson_deviance_expr(true, pred).mean()
+        for true, pred in zip(y_true, y_pred, strict=True)
+    ).alias("multi_mean_poisson_deviance")
+
+
+def evaluation_report(
+    predictions: pl.LazyFrame,
+    group_by: list[str] | None = None,
+    goals_team_1: str = "goals_team_1",
+    goals_team_2: str = "goals_team_2",
+    goals_team_1_pred: str = "goals_team_1_pred",
+    goals_team_2_pred: str = "goals_team_2_pred",
+    expected_goals_team_1: str | None = None,
+    expected_goals_team_2: str | None = None,
+) -> pl.LazyFrame:
+    """Create a grouped evaluation report in a single lazy query.
+
+    Parameters
+    ----------
+    predictions : pl.LazyFrame
+        LazyFrame with one row per game containing the true goals, the tips and
+        optionally the expected goals.
+    group_by : list[str] | None, default=None
+        Columns to group the evaluation by. None for
+        ["league_id", "season_name", "match_day"].
+    goals_team_1 : str, default="goals_team_1"
+        Column with the true goals of team_1.
+    goals_team_2 : str, default="goals_team_2"
+        Column with the true goals of team_2.
+    goals_team_1_pred : str, default="goals_team_1_pred"
+        Column with the tipped goals of team_1.
+    goals_team_2_pred : str, default="goals_team_2_pred"
+        Column with the tipped goals of team_2.
+    expected_goals_team_1 : str | None, default=None
+        Column with the expected goals of team_1. If both expected goals columns
+        are passed, the report contains the multi_mean_poisson_deviance.
+    expected_goals_team_2 : str | None, default=None
+        Column with the expected goals of team_2.
+
+    Returns
+    -------
+    evaluation_report : pl.LazyFrame
+        LazyFrame with one row per group.
+    """
+    if group_by is None:
+        group_by = ["league_id", "season_name", "match_day"]
+
+    aggregations = [
+        pl.len().alias("games"),
+        ak_score_expr(goals_team_1, goals_team_2, goals_team_1_pred, goals_team_2_pred)
+        .mean()
+        .alias("mean_ak_score"),
+    ]
+    if expected_goals_team_1 is not None and expected_goals_team_2 is not None:
+        aggregations.append(
+            multi_mean_poisson_deviance_expr(
+                [goals_team_1, goals_team_2],
+                [expected_goals_team_1, expected_goals_team_2],
+            )
+        )
+
+    return predictions.group_by(group_by).agg(aggregations).sort(group_by)
@@ -1,5 +1,6 @@
+import numpy as np
 from numpy.testing import assert_array_equal
-from aktipp.eval import ak_score
+from aktipp.eval import ak_score, batch_ak_score, mean_ak_score
 
 
 def test_ak_score():
@@ -45,3 +46,17 @@ def test_ak_score():
     ak_score_test = ak_score(y_true, y_pred)
 
     assert_array_equal(ak_score_true, ak_score_test)
+
+
+def test_batch_ak_score():
+    rng = np.random.default_rng(0)
+    y_true = rng.integers(0, 5, size=(100, 2))
+    y_pred = rng.integers(0, 5, size=(3, 100, 2))
+
+    out = np.empty((3, 100), dtype=np.int8)
+    mean_ak_score_test, ak_score_test = batch_ak_score(y_true, y_pred, out=out)
+
+    assert ak_score_test is out
+    for i in range(3):
+        assert_array_equal(ak_score(y_true, y_pred[i]), ak_score_test[i])
+        assert mean_ak_score_test[i] == mean_ak_score(y_true, y_pred[i])
@@ -0,0 +1,67 @@
+import numpy as np
+import polars as pl
+from numpy.testing import assert_allclose
+from aktipp.eval import walk_forward_backtest
+
+
+class HomeAdvantageEstimator:
+    """Predict the mean goals of home and away teams seen during training."""
+
+    def fit(self, X, y):
+        self.means_ = [y[X[:, 0] == home_team].mean() for home_team in [0, 1]]
+        return self
+
+    def predict(self, X):
+        return np.where(X[:, 0] == 1, self.means_[1], self.means_[0])
+
+
+def _features(n_seasons: int = 2, n_match_days: int = 4, n_games: int = 3):
+    rng = np.random.default_rng(0)
+    rows = []
+    match_id = 0
+    for season in range(n_seasons):
+        for match_day in range(1, n_match_days + 1):
+            for _ in range(n_games):
+                for home_team in [0, 1]:
+                    rows.append(
+                        {
+                            "match_id": match_id,
+                            "season_name": f"{2020 + season}/{2021 + season}",
+                            "match_day": match_day,
+                            "home_team": home_team,
+                            "goals": int(rng.poisson(1.2 + 0.4 * home_team)),
+                        }
+                    )
+                match_id += 1
+    # shuffle the rows, the backtest has to restore the order
+    return pl.DataFrame(rows).sample(fraction=1.0, shuffle=True, seed=1)
+
+
+def test_walk_forward_backtest():
+    features = _features()
+
+    backtest = walk_forward_backtest(
+        features, HomeAdvantageEstimator(), ["home_team"], min_train_match_days=2
+    )
+
+    assert len(backtest) == 6
+    assert backtest["season_name"].to_list()[:3] == ["2020/2021"] * 2 + ["2021/2022"]
+    assert backtest["match_day"].to_list()[:3] == [3, 4, 1]
+    assert backtest["train_size"].to_list() == [12, 18, 24, 30, 36, 42]
+    assert backtest["games"].to_list() == [3] * 6
+
+    backtest_parallel = walk_forward_backtest(
+        features,
+        HomeAdvantageEstimator(),
+        ["home_team"],
+        min_train_match_days=2,
+        n_jobs=2,
+    )
+    assert_allclose(
+        backtest["mean_ak_score"].to_numpy(),
+        backtest_parallel["mean_ak_score"].to_numpy(),
+    )
+    assert_allclose(
+        backtest["multi_mean_poisson_deviance"].to_numpy(),
+        backtest_parallel["multi_mean_poisson_deviance"].to_numpy(),
+    )
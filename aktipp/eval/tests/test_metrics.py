@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose
+from sklearn.metrics import mean_poisson_deviance
+from aktipp.eval import multi_mean_poisson_deviance
+
+
+def test_multi_mean_poisson_deviance():
+    rng = np.random.default_rng(0)
+    y_true = rng.integers(0, 5, size=(500, 2))
+    y_pred = rng.uniform(0.1, 4.0, size=(500, 2))
+    sample_weight = rng.uniform(0.0, 1.0, size=500)
+
+    for weights in [None, sample_weight]:
+        deviance_per_target = [
+            mean_poisson_deviance(y_true[:, i], y_pred[:, i], sample_weight=weights)
+            for i in range(2)
+        ]
+
+        assert_allclose(
+            multi_mean_poisson_deviance(
+                y_true, y_pred, sample_weight=weights, multioutput="raw_values"
+            ),
+            deviance_per_target,
+        )
+        assert_allclose(
+            multi_mean_poisson_deviance(y_true, y_pred, sample_weight=weights),
+            np.mean(deviance_per_target),
+        )
+
+    # single target
+    assert_allclose(
+        multi_mean_poisson_deviance(y_true[:, 0], y_pred[:, 0]),
+        mean_poisson_deviance(y_true[:, 0], y_pred[:, 0]),
+    )
+
+    with pytest.raises(ValueError):
+        multi_mean_poisson_deviance(y_true, np.zeros_like(y_pred))
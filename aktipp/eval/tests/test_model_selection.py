@@ -0,0 +1,58 @@
+import numpy as np
+import polars as pl
+import pytest
+from sklearn.linear_model import PoissonRegressor
+from sklearn.model_selection import cross_validate
+
+from aktipp.eval import GroupedTimeSeriesSplit
+
+from .test_backtest import _features
+
+
+def test_grouped_time_series_split():
+    features = _features(n_seasons=2, n_match_days=6)
+    periods = features.select(
+        pl.col("season_name").rank("dense") * 100 + pl.col("match_day")
+    ).to_series()
+
+    splitter = GroupedTimeSeriesSplit(n_splits=3, gap=1).fit(features)
+
+    folds = list(splitter.split())
+    assert len(folds) == splitter.get_n_splits() == 3
+    # 12 match days in blocks of 3, the last one before each test fold is the gap
+    assert [len(test) for _, test in folds] == [18] * 3
+    assert [len(train) for train, _ in folds] == [12, 30, 48]
+    for train, test in folds:
+        assert train.dtype == test.dtype == np.int32
+        assert periods[train].max() < periods[test].min()
+        assert not set(features["match_id"][train]) & set(features["match_id"][test])
+        # both rows of every test match are in the fold
+        assert (features[test]["match_id"].value_counts()["count"] == 2).all()
+
+    rolling = GroupedTimeSeriesSplit(n_splits=3, max_train_size=2).fit(features)
+    assert [len(train) for train, _ in rolling.split()] == [12] * 3
+
+    # the folds index the rows of the features and are reusable across models
+    X = features.select("home_team").to_numpy()
+    y = features["goals"].to_numpy()
+    scores = cross_validate(PoissonRegressor(), X, y, cv=splitter)
+    assert len(scores["test_score"]) == 3
+
+
+def test_grouped_time_series_split_invalid():
+    features = _features(n_seasons=1, n_match_days=4)
+
+    with pytest.raises(ValueError, match="too few"):
+        GroupedTimeSeriesSplit(n_splits=4).fit(features)
+    with pytest.raises(ValueError, match="not fitted"):
+        next(GroupedTimeSeriesSplit().split())
+
+    # a match on two match days would leak into the training data
+    features = features.with_columns(
+        pl.when(pl.col("home_team") == 1)
+        .then(pl.col("match_day"))
+        .otherwise(pl.col("match_day") % 4 + 1)
+        .alias("match_day")
+    )
+    with pytest.raises(ValueError, match="span several match days"):
+        GroupedTimeSeriesSplit(n_splits=2).fit(features)
@@ -0,0 +1,50 @@
+import math
+
+from numpy.testing import assert_allclose, assert_array_equal
+from aktipp.eval import (
+    ak_score,
+    expected_ak_score,
+    optimal_tip,
+    poisson_score_probabilities,
+)
+
+
+def test_poisson_score_probabilities():
+    y_pred = [[1.5, 0.8], [0.0, 2.0]]
+
+    score_probabilities = poisson_score_probabilities(y_pred, max_goals=3)
+
+    for i, (rate_1, rate_2) in enumerate(y_pred):
+        for g1 in range(4):
+            for g2 in range(4):
+                p1 = math.exp(-rate_1) * rate_1**g1 / math.factorial(g1)
+                p2 = math.exp(-rate_2) * rate_2**g2 / math.factorial(g2)
+                assert math.isclose(score_probabilities[i, g1, g2], p1 * p2)
+
+
+def test_optimal_tip():
+    y_pred = [[1.7, 1.1], [0.9, 0.9], [0.6, 2.3], [3.5, 0.4]]
+    max_goals = 6
+
+    score_probabilities = poisson_score_probabilities(y_pred, max_goals)
+    tips, expected = optimal_tip(y_pred, max_goals)
+
+    # brute force over every match, tip and result
+    for i in range(len(y_pred)):
+        best_tip, best_expected = None, -1.0
+        for t1 in range(max_goals + 1):
+            for t2 in range(max_goals + 1):
+                candidate = sum(
+                    score_probabilities[i, g1, g2] * ak_score([g1, g2], [t1, t2])
+                    for g1 in range(max_goals + 1)
+                    for g2 in range(max_goals + 1)
+                )
+                if candidate > best_expected + 1e-12:
+                    best_tip, best_expected = [t1, t2], candidate
+        assert_array_equal(tips[i], best_tip)
+        assert_allclose(expected[i], best_expected)
+
+    # full score probability matrices lead to the same tips
+    tips_from_matrix, _ = optimal_tip(score_probabilities)
+    assert_array_equal(tips, tips_from_matrix)
+    assert expected_ak_score(score_probabilities).shape == (4, 7, 7)
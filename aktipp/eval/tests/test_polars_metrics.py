@@ -0,0 +1,62 @@
+import numpy as np
+import polars as pl
+from numpy.testing import assert_allclose, assert_array_equal
+from aktipp.eval import (
+    ak_score,
+    ak_score_expr,
+    evaluation_report,
+    mean_ak_score,
+    multi_mean_poisson_deviance,
+)
+
+
+def test_evaluation_report():
+    rng = np.random.default_rng(0)
+    n_games = 200
+    predictions = pl.DataFrame(
+        {
+            "league_id": rng.integers(1, 3, n_games),
+            "season_name": "2023/2024",
+            "match_day": rng.integers(1, 4, n_games),
+            "goals_team_1": rng.integers(0, 4, n_games),
+            "goals_team_2": rng.integers(0, 4, n_games),
+            "goals_team_1_pred": rng.integers(0, 4, n_games),
+            "goals_team_2_pred": rng.integers(0, 4, n_games),
+            "expected_goals_team_1": rng.uniform(0.2, 3.0, n_games),
+            "expected_goals_team_2": rng.uniform(0.2, 3.0, n_games),
+        }
+    )
+
+    report = evaluation_report(
+        predictions.lazy(),
+        expected_goals_team_1="expected_goals_team_1",
+        expected_goals_team_2="expected_goals_team_2",
+    ).collect()
+
+    for (league_id, _, match_day), group in predictions.group_by(
+        ["league_id", "season_name", "match_day"]
+    ):
+        row = report.filter(
+            (pl.col("league_id") == league_id) & (pl.col("match_day") == match_day)
+        )
+        y_true = group.select("goals_team_1", "goals_team_2").to_numpy()
+        y_pred = group.select("goals_team_1_pred", "goals_team_2_pred").to_numpy()
+        y_expected = group.select(
+            "expected_goals_team_1", "expected_goals_team_2"
+        ).to_numpy()
+
+        assert row["games"].item() == len(group)
+        assert_allclose(row["mean_ak_score"].item(), mean_ak_score(y_true, y_pred))
+        assert_allclose(
+            row["multi_mean_poisson_deviance"].item(),
+            multi_mean_poisson_deviance(y_true, y_expected),
+        )
+
+    # per row scores match ak_score
+    assert_array_equal(
+        predictions.select(ak_score_expr()).to_series(),
+        ak_score(
+            predictions.select("goals_team_1", "goals_team_2").to_numpy(),
+            predictions.select("goals_team_1_pred", "goals_team_2_pred").to_numpy(),
+        ),
+    )
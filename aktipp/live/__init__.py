@@ -0,0 +1,23 @@
+import importlib
+
+# attributes are imported on first access, see aktipp.__getattr__
+_LAZY_IMPORTS = {
+    "LivePollerOpenligadb": ".poller_openligadb",
+    "update_openligadb": ".poller_openligadb",
+}
+
+__all__ = [
+    "LivePollerOpenligadb",
+    "update_openligadb",
+]
+
+
+def __getattr__(name: str):
+    if name in _LAZY_IMPORTS:
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(__all__)
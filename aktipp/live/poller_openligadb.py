@@ -0,0 +1,441 @@
+import asyncio
+import json
+import logging
+import os
+import time
+import urllib.error
+import urllib.request
+from collections.abc import Callable
+
+import polars as pl
+
+from .._storage import _validate_storage_profile, _write_parquet
+from ..etl._schema import _apply_dtype_profile
+from ..etl._team_based_views import _create_team_based_views
+from ..etl.clean import (
+    DEFAULT_FEATURES,
+    WIDE_FEATURES,
+    _clean_openligadb,
+    required_columns_openligadb,
+)
+from ..etl.standings import _create_standings_openligadb
+from ..normalize.normalize_openligadb import LAYOUTS, _normalize_openligadb
+from ..scraping.scrape_openligadb import OPENLIGADB_URL
+from ..tracing import trace_stage
+
+logger = logging.getLogger(__name__)
+
+# marks matches whose lastUpdateDateTime has not been seen yet
+_UNSEEN = object()
+
+
+def _write_parquet_atomic(
+    data: pl.DataFrame, path: str, artifact: str, storage_profile: str
+) -> None:
+    """Write a parquet file via a temporary file, so readers never see a partially
+    written file."""
+    _write_parquet(data, f"{path}.tmp", artifact, storage_profile)
+    os.replace(f"{path}.tmp", path)
+
+
+def update_openligadb(
+    data: list[dict],
+    match_results_data_path: str,
+    standings_data_path: str,
+    dtype_profile: str = "compact",
+    storage_profile: str = "default",
+    layout: str = "long",
+    features: list[str] | None = None,
+) -> pl.DataFrame:
+    """Push changed matches through normalize, clean and standings incrementally.
+    The clean rows of the matches are replaced in the clean match results and the
+    standings of the affected league seasons are rebuilt, the standings of all
+    other league seasons are kept as they are.
+
+    Parameters
+    ----------
+    data : list[dict]
+        Changed matches in the format of https://api.openligadb.de/getmatchdata.
+    match_results_data_path : str
+        Path to the clean match results parquet file, created if it does not exist.
+    standings_data_path : str
+        Path to the standings parquet file, created if it does not exist.
+    dtype_profile : str, default="compact"
+        "compact" - smallest integer types that fit the values, Float32 and Enum.
+        "wide" - the Int64, Int32, Float64 and String types polars infers.
+    storage_profile : str, default="default"
+        "default" - the polars defaults, unsorted.
+        "hot" - lz4 and small row groups sorted by league and match day.
+        "archive" - zstd level 19 and large row groups sorted by league and match day.
+    layout : str, default="long"
+        Layout the clean match results were normalized with, "long" for one row per
+        result or "wide" for one row per match, see normalize_season_openligadb.
+    features : list[str] | None, default=None
+        Features of the clean match results, see clean_openligadb. None for
+        DEFAULT_FEATURES with the long and WIDE_FEATURES with the wide layout.
+
+    Returns
+    -------
+    changed : pl.DataFrame
+        Clean match results of the changed matches.
+    """
+
+    _validate_storage_profile(storage_profile)
+    if layout not in LAYOUTS:
+        raise ValueError(f"layout must be in {LAYOUTS}")
+    if features is None:
+        features = WIDE_FEATURES if layout == "wide" else DEFAULT_FEATURES
+
+    with trace_stage("update_openligadb", matches=len(data)) as stage:
+        # normalize and clean only the columns the clean match results consist of
+        # leagues 50 & 4570 are incomplete and should be disregarded
+        meta, record_keys = required_columns_openligadb(features)
+        normalized = _normalize_openligadb(
+            data, "matchResults", meta, record_keys, layout
+        ).filter(~pl.col("leagueId").is_in([50, 4570]))
+        changed = _clean_openligadb(
+            normalized.lazy(), features, dtype_profile
+        ).collect()
+        stage.add_rows_in(changed)
+
+        match_results = changed
+        if os.path.isfile(match_results_data_path):
+            previous = pl.read_parquet(match_results_data_path)
+            match_results = pl.concat(
+                [
+                    previous.filter(
+                        ~pl.col("match_id").is_in(changed["match_id"].unique())
+                    ).cast(dict(changed.schema)),
+                    changed,
+                ],
+                how="vertical",
+            )
+        _write_parquet_atomic(
+            match_results, match_results_data_path, "clean", storage_profile
+        )
+        stage.add_output(match_results_data_path)
+
+        # Filter match results of the affected league seasons
+        # - Only consider final results
+        # - Disregard relegation games
+        # - Disregard games without a final result
+        leagues = changed["league_id"].unique()
+        match_results_filtered = match_results.lazy().filter(
+            (pl.col("league_id").is_in(leagues))
+            & (pl.col("result_name")=="Endergebnis")
+            & (~pl.col("match_day_name").str.to_lowercase().str.contains("relegation"))
+            & (pl.col("result_class").is_not_null())
+        )  # fmt: skip
+
+        standings = _apply_dtype_profile(
+            _create_standings_openligadb(
+                _create_team_based_views(match_results_filtered, 1, "overall"),
+                _create_team_based_views(match_results_filtered, 2, "overall"),
+            ),
+            "standings",
+            dtype_profile,
+        ).collect()
+        if os.path.isfile(standings_data_path):
+            previous = pl.read_parquet(standings_data_path)
+            standings = pl.concat(
+                [
+                    previous.filter(~pl.col("league_id").is_in(leagues)).cast(
+                        dict(standings.schema)
+                    ),
+                    standings,
+                ],
+                how="vertical",
+            )
+        _write_parquet_atomic(
+            standings, standings_data_path, "standings", storage_profile
+        )
+        stage.add_output(standings_data_path)
+
+    return changed
+
+
+class _RateLimiter:
+    """Space out requests to at most rate requests per second."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class LivePollerOpenligadb:
+    """Poll the current match day of some leagues and push changed matches into the
+    clean match results and the standings.
+
+    Every poll requests the current match day and its last change date of every
+    league. Only if the last change date moved, the matches of the match day are
+    requested and the matches with a new lastUpdateDateTime are passed to
+    update_openligadb. Once the next match day became current, the previous one is
+    polled the same way until its last change date has not moved for settle_polls
+    polls, so late results and corrections are not missed. Requests are rate limited over all leagues and retried with
+    exponential backoff on connection errors, server errors and 429.
+
+    Parameters
+    ----------
+    leagues : list[str]
+        List of string identifiers, e.g. ['bl1', 'bl2'].
+    season : int
+        Year indicating the start of the current season, e.g. 2024.
+    match_results_data_path : str
+        Path to the clean match results parquet file, e.g. from clean_openligadb.
+    standings_data_path : str
+        Path to the standings parquet file, e.g. from create_standings_openligadb.
+    base_url : str, default=OPENLIGADB_URL
+        Base url of the openligadb api or a mirror of it.
+    interval : float, default=60.0
+        Seconds between two polls.
+    requests_per_second : float, default=2.0
+        Maximum number of requests per second.
+    max_retries : int, default=5
+        Number of retries of a failed request.
+    backoff_base : float, default=1.0
+        Seconds before the first retry, doubled for every further retry.
+    backoff_max : float, default=300.0
+        Maximum seconds between two retries.
+    timeout : float, default=10.0
+        Timeout of a request in seconds.
+    dtype_profile : str, default="compact"
+        "compact" or "wide", see update_openligadb.
+    storage_profile : str, default="default"
+        "default", "hot" or "archive", see update_openligadb.
+    layout : str, default="long"
+        "long" or "wide", the layout of the clean match results, see
+        update_openligadb.
+    features : list[str] | None, default=None
+        Features of the clean match results, see update_openligadb.
+    settle_polls : int, default=10
+        Number of polls a match day is still polled without a change of its last
+        change date after it stopped being the current match day.
+    on_update : Callable[[pl.DataFrame], None] | None, default=None
+        Called with the clean match results of the changed matches after every
+        update, e.g. to rebuild features.
+    """
+
+    def __init__(
+        self,
+        leagues: list[str],
+        season: int,
+        match_results_data_path: str,
+        standings_data_path: str,
+        base_url: str = OPENLIGADB_URL,
+        interval: float = 60.0,
+        requests_per_second: float = 2.0,
+        max_retries: int = 5,
+        backoff_base: float = 1.0,
+        backoff_max: float = 300.0,
+        timeout: float = 10.0,
+        dtype_profile: str = "compact",
+        storage_profile: str = "default",
+        layout: str = "long",
+        features: list[str] | None = None,
+        settle_polls: int = 10,
+        on_update: Callable[[pl.DataFrame], None] | None = None,
+    ):
+        if requests_per_second <= 0:
+            raise ValueError("requests_per_second must be positive.")
+        if settle_polls < 1:
+            raise ValueError("settle_polls must be at least 1.")
+        _validate_storage_profile(storage_profile)
+        if layout not in LAYOUTS:
+            raise ValueError(f"layout must be in {LAYOUTS}")
+        self.leagues = leagues
+        self.season = season
+        self.match_results_data_path = match_results_data_path
+        self.standings_data_path = standings_data_path
+        self.base_url = base_url
+        self.interval = interval
+        self.requests_per_second = requests_per_second
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.dtype_profile = dtype_profile
+        self.storage_profile = storage_profile
+        self.layout = layout
+        self.features = features
+        self.settle_polls = settle_polls
+        self.on_update = on_update
+        # last change date and number of polls without a change per league and
+        # match day, last update per match and polled match days per league
+        self._last_change = {}
+        self._unchanged_polls = {}
+        self._last_update = {}
+        self._match_days = {}
+        self._rate_limiter = None
+
+    def _urlopen(self, url: str) -> bytes:
+        with urllib.request.urlopen(url, timeout=self.timeout) as response:
+            return response.read()
+
+    async def _get_json(self, path: str):
+        """Request a path of the api with rate limiting and exponential backoff."""
+        for attempt in range(self.max_retries + 1):
+            await self._rate_limiter.wait()
+            try:
+                contents = await asyncio.to_thread(
+                    self._urlopen, f"{self.base_url}{path}"
+                )
+                return json.loads(contents)
+            except (urllib.error.URLError, TimeoutError, ConnectionError) as error:
+                # client errors other than too many requests will not go away
+                if isinstance(error, urllib.error.HTTPError) and (
+                    error.code < 500 and error.code != 429
+                ):
+                    raise
+                if attempt == self.max_retries:
+                    raise
+                await asyncio.sleep(
+                    min(self.backoff_max, self.backoff_base * 2**attempt)
+                )
+
+    async def _poll_match_day(
+        self, league: str, match_day: int
+    ) -> tuple[list[dict], str]:
+        """Changed matches and the last change date of a match day of a league."""
+        last_change = await self._get_json(
+            f"/getlastchangedate/{league}/{self.season}/{match_day}"
+        )
+        if self._last_change.get((league, match_day)) == last_change:
+            return [], last_change
+
+        matches = await self._get_json(
+            f"/getmatchdata/{league}/{self.season}/{match_day}"
+        )
+        changed = [
+            match
+            for match in matches
+            if self._last_update.get(match["matchID"], _UNSEEN)
+            != match["lastUpdateDateTime"]
+        ]
+        return changed, last_change
+
+    async def _poll_league(
+        self, league: str
+    ) -> tuple[int, dict[int, tuple[list[dict], str]]]:
+        """Changed matches of the current match day of a league and of the earlier
+        match days that have not settled yet."""
+        current_group = await self._get_json(f"/getcurrentgroup/{league}")
+        current_match_day = current_group["groupOrderID"]
+        match_days = sorted(self._match_days.get(league, set()) | {current_match_day})
+
+        polls = await asyncio.gather(
+            *[self._poll_match_day(league, match_day) for match_day in match_days]
+        )
+        return current_match_day, dict(zip(match_days, polls, strict=True))
+
+    async def poll_once(self) -> pl.DataFrame | None:
+        """Poll all leagues once and update the pipeline outputs with the changed
+        matches.
+
+        Returns
+        -------
+        changed : pl.DataFrame | None
+            Clean match results of the changed matches, None if nothing changed.
+        """
+        if self._rate_limiter is None:
+            self._rate_limiter = _RateLimiter(self.requests_per_second)
+
+        polls = await asyncio.gather(
+            *[self._poll_league(league) for league in self.leagues]
+        )
+        changed_matches = [
+            match
+            for _, match_day_polls in polls
+            for changed, _ in match_day_polls.values()
+            for match in changed
+        ]
+
+        changed = None
+        if changed_matches:
+            changed = await asyncio.to_thread(
+                update_openligadb,
+                changed_matches,
+                self.match_results_data_path,
+                self.standings_data_path,
+                self.dtype_profile,
+                self.storage_profile,
+                self.layout,
+                self.features,
+            )
+
+        # the state only moves on after a successful update, so failed updates
+        # are retried with the next poll
+        for match in changed_matches:
+            self._last_update[match["matchID"]] = match["lastUpdateDateTime"]
+        for league, (current_match_day, match_day_polls) in zip(
+            self.leagues, polls, strict=True
+        ):
+            match_days = set()
+            for match_day, (_, last_change) in match_day_polls.items():
+                key = (league, match_day)
+                if self._last_change.get(key) == last_change:
+                    self._unchanged_polls[key] += 1
+                else:
+                    self._last_change[key] = last_change
+                    self._unchanged_polls[key] = 0
+                # late corrections of a match day still arrive after the next one
+                # became current, it is polled until its last change date settled
+                if (
+                    match_day == current_match_day
+                    or self._unchanged_polls[key] < self.settle_polls
+                ):
+                    match_days.add(match_day)
+                else:
+                    del self._last_change[key], self._unchanged_polls[key]
+            self._match_days[league] = match_days
+
+        if changed is not None and self.on_update is not None:
+            self.on_update(changed)
+        return changed
+
+    async def run(self, n_polls: int | None = None) -> None:
+        """Poll every interval seconds. Polls that fail, after all retries of their
+        requests or in the update and the on_update callback, are logged and
+        skipped. After consecutive failed polls the wait before the next one backs
+        off like the retries of a request, but never below interval.
+
+        Parameters
+        ----------
+        n_polls : int | None, default=None
+            Number of polls, None to poll until cancelled.
+        """
+        poll = failures = 0
+        while n_polls is None or poll < n_polls:
+            try:
+                changed = await self.poll_once()
+            except (urllib.error.URLError, TimeoutError, ConnectionError) as error:
+                failures += 1
+                logger.warning("Poll failed and will be retried: %s", error)
+            except Exception:
+                # e.g. a failing parquet write or on_update, one bad poll must not
+                # end the poller
+                failures += 1
+                logger.exception("Poll failed and will be retried.")
+            else:
+                failures = 0
+                if changed is not None:
+                    logger.info(
+                        "%s matches have been updated.", changed["match_id"].n_unique()
+                    )
+            poll += 1
+            if n_polls is None or poll < n_polls:
+                delay = self.interval
+                if failures:
+                    delay = max(
+                        delay,
+                        min(self.backoff_max, self.backoff_base * 2 ** (failures - 1)),
+                    )
+                await asyncio.sleep(delay)
@@ -0,0 +1,293 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+
+from aktipp.etl import WIDE_FEATURES, clean_openligadb, create_standings_openligadb
+from aktipp.etl.clean import DEFAULT_FEATURES
+from aktipp.live import LivePollerOpenligadb
+from aktipp.normalize import normalize_many_seasons_openligadb
+from aktipp.scraping import generate_season_openligadb
+from aktipp.scraping.generate_openligadb import _generate_season_openligadb
+
+
+class _ScriptedHandler(BaseHTTPRequestHandler):
+    """Serve the current state of a scripted season, the first requests fail with
+    the scripted errors."""
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.n_requests += 1
+            if server.errors:
+                self.send_error(server.errors.pop(0))
+                return
+            parts = self.path.strip("/").split("/")
+            matches = server.matches
+            if parts[0] == "getcurrentgroup":
+                body = {"groupOrderID": server.match_day}
+            elif parts[0] == "getlastchangedate":
+                match_day = int(parts[3])
+                body = max(
+                    match["lastUpdateDateTime"] or ""
+                    for match in matches
+                    if match["group"]["groupOrderID"] == match_day
+                )
+            elif parts[0] == "getmatchdata":
+                match_day = int(parts[3])
+                server.n_match_data += 1
+                body = [
+                    match
+                    for match in matches
+                    if match["group"]["groupOrderID"] == match_day
+                ]
+            else:
+                self.send_error(404)
+                return
+
+        contents = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(contents)))
+        self.end_headers()
+        self.wfile.write(contents)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _start_server(matches: list[dict], match_day: int, errors: list[int]):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ScriptedHandler)
+    server.lock = threading.Lock()
+    server.matches, server.match_day, server.errors = matches, match_day, errors
+    server.n_requests = server.n_match_data = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def _update(match: dict, minute: int) -> dict:
+    """A match with a distinct lastUpdateDateTime, like a live score change."""
+    return {**match, "lastUpdateDateTime": f"2024-08-22T17:{minute:02d}:00"}
+
+
+def _run_pipeline(data_path: str, match_days_played: int, layout: str = "long"):
+    generate_season_openligadb(
+        "bl1", 2024, data_path, n_teams=6, match_days_played=match_days_played
+    )
+    normalize_many_seasons_openligadb(["bl1"], [2024], data_path, layout=layout)
+    clean_openligadb(
+        data_path,
+        "matchResults",
+        WIDE_FEATURES if layout == "wide" else DEFAULT_FEATURES,
+    )
+    create_standings_openligadb(
+        data_path + "matchResults_clean.parquet", data_path + "standings.parquet"
+    )
+
+
+@pytest.mark.parametrize("layout", ["long", "wide"])
+def test_live_poller_openligadb(tmp_path, layout):
+    live_path, batch_path = tmp_path / "live", tmp_path / "batch"
+    live_path.mkdir()
+    batch_path.mkdir()
+    _run_pipeline(f"{live_path}/", match_days_played=3, layout=layout)
+
+    # the current match day 4 is played while the poller watches it
+    season = _generate_season_openligadb("bl1", 2024, 6, match_days_played=3)
+    played = _generate_season_openligadb("bl1", 2024, 6, match_days_played=4)
+    server, url = _start_server(season, match_day=4, errors=[])
+    updates = []
+    poller = LivePollerOpenligadb(
+        ["bl1"],
+        2024,
+        f"{live_path}/matchResults_clean.parquet",
+        f"{live_path}/standings.parquet",
+        base_url=url,
+        requests_per_second=100.0,
+        layout=layout,
+        on_update=updates.append,
+    )
+
+    async def script():
+        # the first poll sees the unplayed matches, the second one nothing new
+        await poller.poll_once()
+        assert await poller.poll_once() is None
+        assert server.n_match_data == 1
+
+        # score changes of two matches
+        with server.lock:
+            server.matches = [
+                _update(played[index], 10) if index in [9, 10] else match
+                for index, match in enumerate(season)
+            ]
+        changed = await poller.poll_once()
+        assert sorted(changed["match_id"].unique()) == [
+            played[9]["matchID"],
+            played[10]["matchID"],
+        ]
+
+        # the last match of the match day
+        with server.lock:
+            server.matches = [
+                _update(played[index], 20) if index == 11 else match
+                for index, match in enumerate(server.matches)
+            ]
+        changed = await poller.poll_once()
+        assert list(changed["match_id"].unique()) == [played[11]["matchID"]]
+
+    asyncio.run(script())
+    server.shutdown()
+    server.server_close()
+    assert len(updates) == 3
+
+    _run_pipeline(f"{batch_path}/", match_days_played=4, layout=layout)
+    sort = ["league_id", "team_id", "match_day"]
+    assert_frame_equal(
+        pl.read_parquet(live_path / "standings.parquet").sort(sort),
+        pl.read_parquet(batch_path / "standings.parquet").sort(sort),
+    )
+    assert_frame_equal(
+        pl.read_parquet(live_path / "matchResults_clean.parquet").sort(
+            "match_id", "result_name"
+        ),
+        pl.read_parquet(batch_path / "matchResults_clean.parquet").sort(
+            "match_id", "result_name"
+        ),
+        check_dtypes=False,
+    )
+
+
+def test_live_poller_openligadb_previous_match_day(tmp_path):
+    live_path, batch_path = tmp_path / "live", tmp_path / "batch"
+    live_path.mkdir()
+    batch_path.mkdir()
+    _run_pipeline(f"{live_path}/", match_days_played=3)
+
+    season = _generate_season_openligadb("bl1", 2024, 6, match_days_played=3)
+    played = _generate_season_openligadb("bl1", 2024, 6, match_days_played=4)
+    server, url = _start_server(season, match_day=4, errors=[])
+    poller = LivePollerOpenligadb(
+        ["bl1"],
+        2024,
+        f"{live_path}/matchResults_clean.parquet",
+        f"{live_path}/standings.parquet",
+        base_url=url,
+        requests_per_second=100.0,
+        settle_polls=2,
+    )
+
+    async def script():
+        await poller.poll_once()
+
+        # match day 5 becomes current before the results of match day 4 arrive
+        with server.lock:
+            server.matches, server.match_day = played, 5
+        changed = await poller.poll_once()
+        assert sorted(changed["match_id"].unique()) == sorted(
+            match["matchID"] for match in played[9:15]
+        )
+        assert await poller.poll_once() is None
+
+        # a late correction of match day 4 is still picked up
+        with server.lock:
+            server.matches = [
+                _update(match, 45) if index == 9 else match
+                for index, match in enumerate(played)
+            ]
+        changed = await poller.poll_once()
+        assert list(changed["match_id"].unique()) == [played[9]["matchID"]]
+
+        # match day 4 has settled after 2 polls without a change and is dropped
+        assert await poller.poll_once() is None
+        assert await poller.poll_once() is None
+        n_requests = server.n_requests
+        assert await poller.poll_once() is None
+        # getcurrentgroup and getlastchangedate of match day 5
+        assert server.n_requests - n_requests == 2
+
+    asyncio.run(script())
+    server.shutdown()
+    server.server_close()
+
+    _run_pipeline(f"{batch_path}/", match_days_played=4)
+    sort = ["league_id", "team_id", "match_day"]
+    assert_frame_equal(
+        pl.read_parquet(live_path / "standings.parquet").sort(sort),
+        pl.read_parquet(batch_path / "standings.parquet").sort(sort),
+    )
+
+
+def test_live_poller_openligadb_failed_update(tmp_path, caplog):
+    data_path = f"{tmp_path}/"
+    _run_pipeline(data_path, match_days_played=3)
+
+    season = _generate_season_openligadb("bl1", 2024, 6, match_days_played=3)
+    played = _generate_season_openligadb("bl1", 2024, 6, match_days_played=4)
+    server, url = _start_server(season, match_day=4, errors=[])
+    updates = []
+
+    def on_update(changed: pl.DataFrame) -> None:
+        # the first update fails after the results of match day 4 arrived
+        if not updates:
+            with server.lock:
+                server.matches = played
+            updates.append(None)
+            raise RuntimeError("on_update failed")
+        updates.append(changed)
+
+    poller = LivePollerOpenligadb(
+        ["bl1"],
+        2024,
+        data_path + "matchResults_clean.parquet",
+        data_path + "standings.parquet",
+        base_url=url,
+        interval=0.0,
+        requests_per_second=100.0,
+        backoff_base=0.01,
+        on_update=on_update,
+    )
+    asyncio.run(poller.run(n_polls=3))
+    server.shutdown()
+    server.server_close()
+
+    # the poller keeps running after the failed poll
+    assert "on_update failed" in caplog.text
+    assert len(updates) == 2
+    assert sorted(updates[1]["match_id"].unique()) == sorted(
+        match["matchID"] for match in played[9:12]
+    )
+
+
+def test_live_poller_openligadb_invalid_settle_polls():
+    with pytest.raises(ValueError):
+        LivePollerOpenligadb(["bl1"], 2024, "", "", settle_polls=0)
+
+
+def test_live_poller_openligadb_backoff(tmp_path):
+    data_path = f"{tmp_path}/"
+    _run_pipeline(data_path, match_days_played=4)
+
+    # server errors and too many requests are retried with backoff
+    season = _generate_season_openligadb("bl1", 2024, 6, match_days_played=4)
+    server, url = _start_server(season, match_day=4, errors=[503, 429, 500])
+    poller = LivePollerOpenligadb(
+        ["bl1"],
+        2024,
+        data_path + "matchResults_clean.parquet",
+        data_path + "standings.parquet",
+        base_url=url,
+        requests_per_second=100.0,
+        backoff_base=0.01,
+    )
+    standings = pl.read_parquet(data_path + "standings.parquet")
+    changed = asyncio.run(poller.poll_once())
+    server.shutdown()
+    server.server_close()
+
+    # 3 failed requests and getcurrentgroup, getlastchangedate and getmatchdata
+    assert server.n_requests == 6
+    assert changed["match_id"].n_unique() == 3
+    assert_frame_equal(pl.read_parquet(data_path + "standings.parquet"), standings)
@@ -0,0 +1,25 @@
+import importlib
+
+# attributes are imported on first access, see aktipp.__getattr__
+_LAZY_IMPORTS = {
+    "PoissonGoalModel": ".poisson",
+    "exponential_decay_weights": ".poisson",
+    "walk_forward_predict": ".poisson",
+}
+
+__all__ = [
+    "PoissonGoalModel",
+    "exponential_decay_weights",
+    "walk_forward_predict",
+]
+
+
+def __getattr__(name: str):
+    if name in _LAZY_IMPORTS:
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(__all__)
@@ -0,0 +1,436 @@
+import numpy as np
+from numpy.typing import ArrayLike
+
+from ..eval.optimal_tip import poisson_score_probabilities
+
+
+def exponential_decay_weights(age: ArrayLike, half_life: float) -> np.ndarray:
+    """Weights halving every half_life, e.g. to weight recent games higher.
+
+    Parameters
+    ----------
+    age : ArrayLike
+        Age of every sample, e.g. the number of match days before the cutoff.
+    half_life : float
+        Age at which a sample has half the weight of a sample with age 0.
+
+    Returns
+    -------
+    weights : np.ndarray
+        Weight of every sample.
+    """
+    if half_life <= 0:
+        raise ValueError("half_life must be positive.")
+    return 0.5 ** (np.asarray(age, dtype=np.float64) / half_life)
+
+
+def _dixon_coles_tau(
+    goals_1: np.ndarray,
+    goals_2: np.ndarray,
+    rate_1: np.ndarray,
+    rate_2: np.ndarray,
+    rho: float,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Dixon-Coles correction of the low scoring results and its derivatives.
+
+    Parameters
+    ----------
+    goals_1, goals_2 : np.ndarray
+        Goals of the home and the away team.
+    rate_1, rate_2 : np.ndarray
+        Expected goals of the home and the away team.
+    rho : float
+        Dependence parameter.
+
+    Returns
+    -------
+    tau : tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+        Correction factor and its derivatives with respect to rate_1, rate_2 and rho.
+    """
+    tau = np.ones_like(rate_1)
+    d_rate_1 = np.zeros_like(rate_1)
+    d_rate_2 = np.zeros_like(rate_1)
+    d_rho = np.zeros_like(rate_1)
+
+    nil_nil = (goals_1 == 0) & (goals_2 == 0)
+    tau[nil_nil] = 1 - rate_1[nil_nil] * rate_2[nil_nil] * rho
+    d_rate_1[nil_nil] = -rate_2[nil_nil] * rho
+    d_rate_2[nil_nil] = -rate_1[nil_nil] * rho
+    d_rho[nil_nil] = -rate_1[nil_nil] * rate_2[nil_nil]
+
+    nil_one = (goals_1 == 0) & (goals_2 == 1)
+    tau[nil_one] = 1 + rate_1[nil_one] * rho
+    d_rate_1[nil_one] = rho
+    d_rho[nil_one] = rate_1[nil_one]
+
+    one_nil = (goals_1 == 1) & (goals_2 == 0)
+    tau[one_nil] = 1 + rate_2[one_nil] * rho
+    d_rate_2[one_nil] = rho
+    d_rho[one_nil] = rate_2[one_nil]
+
+    one_one = (goals_1 == 1) & (goals_2 == 1)
+    tau[one_one] = 1 - rho
+    d_rho[one_one] = -1
+
+    return tau, d_rate_1, d_rate_2, d_rho
+
+
+def _negative_log_likelihood(
+    parameters: np.ndarray,
+    team: np.ndarray,
+    opponent: np.ndarray,
+    home: np.ndarray,
+    y: np.ndarray,
+    weights: np.ndarray,
+    alpha: float,
+    dixon_coles: bool,
+) -> tuple[float, np.ndarray]:
+    """Penalized negative log-likelihood of the goal model and its gradient.
+
+    Parameters
+    ----------
+    parameters : np.ndarray
+        Parameters [intercept, home_advantage, rho, attack..., defence...].
+    team, opponent : np.ndarray
+        Index of the team and the opponent of every row.
+    home : np.ndarray
+        1 for the home team, 0 for the away team.
+    y : np.ndarray
+        Goals scored by the team.
+    weights : np.ndarray
+        Weight of every row.
+    alpha : float
+        Strength of the ridge penalty on the attack and defence ratings.
+    dixon_coles : bool
+        Add the Dixon-Coles correction. Rows of a match are adjacent, home first.
+
+    Returns
+    -------
+    loss : tuple[float, np.ndarray]
+        Value and gradient with respect to the parameters.
+    """
+    n_teams = (len(parameters) - 3) // 2
+    intercept, home_advantage, rho = parameters[:3]
+    attack = parameters[3 : 3 + n_teams]
+    defence = parameters[3 + n_teams :]
+
+    log_rate = intercept + attack[team] - defence[opponent]
+    log_rate += home_advantage * home
+    rate = np.exp(log_rate)
+
+    # negative poisson log-likelihood without the constant log(y!)
+    value = np.dot(weights, rate - y * log_rate)
+    residual = weights * (rate - y)
+
+    if dixon_coles:
+        tau, d_rate_1, d_rate_2, d_rho = _dixon_coles_tau(
+            y[0::2], y[1::2], rate[0::2], rate[1::2], rho
+        )
+        tau = np.maximum(tau, 1e-10)
+        match_weights = weights[0::2]
+        value -= np.dot(match_weights, np.log(tau))
+        # chain rule through rate = exp(log_rate)
+        residual[0::2] -= match_weights * d_rate_1 * rate[0::2] / tau
+        residual[1::2] -= match_weights * d_rate_2 * rate[1::2] / tau
+        gradient_rho = -np.dot(match_weights, d_rho / tau)
+    else:
+        gradient_rho = 0.0
+
+    value += 0.5 * alpha * (np.dot(attack, attack) + np.dot(defence, defence))
+    gradient = np.empty_like(parameters)
+    gradient[0] = residual.sum()
+    gradient[1] = np.dot(residual, home)
+    gradient[2] = gradient_rho
+    gradient[3 : 3 + n_teams] = np.bincount(team, weights=residual, minlength=n_teams)
+    gradient[3 : 3 + n_teams] += alpha * attack
+    gradient[3 + n_teams :] = -np.bincount(
+        opponent, weights=residual, minlength=n_teams
+    )
+    gradient[3 + n_teams :] += alpha * defence
+    return value, gradient
+
+
+class PoissonGoalModel:
+    """Poisson model for the goals of a team with attack and defence ratings of all
+    teams and a home advantage:
+
+        log(expected goals) = intercept + attack[team] - defence[opponent]
+                              + home_advantage * home_team
+
+    The ratings are shrunk towards 0 with a ridge penalty, which also makes them
+    identifiable. Optionally the Dixon-Coles correction for the dependence of low
+    scoring results is fitted.
+
+    Parameters
+    ----------
+    alpha : float, default=1.0
+        Strength of the ridge penalty on the attack and defence ratings.
+    dixon_coles : bool, default=False
+        Fit the Dixon-Coles dependence parameter rho. The rows of a match must be
+        adjacent with the home team first, like in the output of
+        FeatureBuilderOpenligadb.get_features sorted by match_id and home_team.
+    warm_start : bool, default=False
+        Start the optimization from the parameters of the previous fit. Teams unknown
+        to the previous fit start with ratings of 0.
+    max_iter : int, default=200
+        Maximum number of L-BFGS-B iterations.
+    tol : float, default=1e-8
+        Tolerance of the projected gradient for L-BFGS-B.
+
+    Attributes
+    ----------
+    teams_ : np.ndarray
+        Sorted ids of all teams seen during fit.
+    attack_ : np.ndarray
+        Attack rating of every team in teams_.
+    defence_ : np.ndarray
+        Defence rating of every team in teams_.
+    intercept_ : float
+        Log of the expected goals of an average away team.
+    home_advantage_ : float
+        Additive home advantage on the log scale.
+    rho_ : float
+        Dixon-Coles dependence parameter, 0 without dixon_coles.
+    n_iter_ : int
+        Number of iterations of the last fit.
+    """
+
+    def __init__(
+        self,
+        alpha: float = 1.0,
+        dixon_coles: bool = False,
+        warm_start: bool = False,
+        max_iter: int = 200,
+        tol: float = 1e-8,
+    ):
+        self.alpha = alpha
+        self.dixon_coles = dixon_coles
+        self.warm_start = warm_start
+        self.max_iter = max_iter
+        self.tol = tol
+
+    @staticmethod
+    def _validate_X(X: ArrayLike) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim != 2 or X.shape[1] != 3:
+            raise ValueError(
+                "X must have the three columns team_id, opponent_id and home_team."
+            )
+        return X
+
+    def _team_index(self, team_ids: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Position of every team id in teams_ and a mask of the known ids."""
+        index = np.clip(np.searchsorted(self.teams_, team_ids), 0, len(self.teams_) - 1)
+        return index, self.teams_[index] == team_ids
+
+    def _initial_parameters(self, teams: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """Parameters [intercept, home_advantage, rho, attack..., defence...]."""
+        n_teams = len(teams)
+        parameters = np.zeros(3 + 2 * n_teams)
+        if self.warm_start and hasattr(self, "teams_"):
+            index, known = self._team_index(teams)
+            parameters[:3] = self.intercept_, self.home_advantage_, self.rho_
+            parameters[3 : 3 + n_teams][known] = self.attack_[index[known]]
+            parameters[3 + n_teams :][known] = self.defence_[index[known]]
+        else:
+            parameters[0] = np.log(max(np.mean(y), 1e-6))
+        return parameters
+
+    def fit(
+        self, X: ArrayLike, y: ArrayLike, sample_weight: ArrayLike | None = None
+    ) -> "PoissonGoalModel":
+        """Fit the model by maximizing the penalized log-likelihood with L-BFGS-B
+        and analytic gradients.
+
+        Parameters
+        ----------
+        X : ArrayLike
+            Array of shape (n_samples, 3) with the columns team_id, opponent_id and
+            home_team, i.e. one row per team and match.
+        y : ArrayLike
+            Goals scored by the team.
+        sample_weight : ArrayLike | None, default=None
+            Weight of every row, e.g. from exponential_decay_weights. With
+            dixon_coles the weight of the home row is used for the correction.
+
+        Returns
+        -------
+        self : PoissonGoalModel
+            Fitted model.
+        """
+        from scipy.optimize import minimize
+
+        X = self._validate_X(X)
+        y = np.asarray(y, dtype=np.float64)
+        if len(y) != len(X):
+            raise ValueError("X and y must have the same number of rows.")
+        if np.any(y < 0):
+            raise ValueError("Goals must be non-negative.")
+        weights = (
+            np.ones(len(y))
+            if sample_weight is None
+            else np.asarray(sample_weight, dtype=np.float64)
+        )
+        if self.dixon_coles and (
+            len(X) % 2 != 0
+            or np.any(X[0::2, 0] != X[1::2, 1])
+            or np.any(X[0::2, 2] != 1)
+            or np.any(X[1::2, 2] != 0)
+        ):
+            raise ValueError(
+                "dixon_coles needs the rows of a match adjacent, home team first."
+            )
+
+        teams, team_index = np.unique(X[:, :2], return_inverse=True)
+        team_index = team_index.reshape(-1, 2)
+        team, opponent = team_index[:, 0], team_index[:, 1]
+        home = X[:, 2]
+        n_teams = len(teams)
+
+        # rho is fixed at 0 without dixon_coles
+        rho_bounds = (-0.3, 0.3) if self.dixon_coles else (0.0, 0.0)
+        result = minimize(
+            _negative_log_likelihood,
+            self._initial_parameters(teams, y),
+            args=(team, opponent, home, y, weights, self.alpha, self.dixon_coles),
+            jac=True,
+            method="L-BFGS-B",
+            bounds=[(None, None), (None, None), rho_bounds]
+            + [(None, None)] * (2 * n_teams),
+            options={"maxiter": self.max_iter, "gtol": self.tol},
+        )
+
+        self.teams_ = teams
+        self.intercept_, self.home_advantage_, self.rho_ = (
+            float(value) for value in result.x[:3]
+        )
+        self.attack_ = result.x[3 : 3 + n_teams]
+        self.defence_ = result.x[3 + n_teams :]
+        self.n_iter_ = result.nit
+        return self
+
+    def predict(self, X: ArrayLike) -> np.ndarray:
+        """Predict the expected goals. Teams unknown to the fit get ratings of 0.
+
+        Parameters
+        ----------
+        X : ArrayLike
+            Array of shape (n_samples, 3) with the columns team_id, opponent_id and
+            home_team.
+
+        Returns
+        -------
+        y_pred : np.ndarray
+            Expected goals of the team.
+        """
+        X = self._validate_X(X)
+        team, team_known = self._team_index(X[:, 0])
+        opponent, opponent_known = self._team_index(X[:, 1])
+        log_rate = (
+            self.intercept_
+            + np.where(team_known, self.attack_[team], 0.0)
+            - np.where(opponent_known, self.defence_[opponent], 0.0)
+            + self.home_advantage_ * X[:, 2]
+        )
+        return np.exp(log_rate)
+
+    def predict_score_probabilities(
+        self, X: ArrayLike, max_goals: int = 10
+    ) -> np.ndarray:
+        """Predict the probability of every result including the Dixon-Coles
+        correction. The result can be passed to eval.optimal_tip.
+
+        Parameters
+        ----------
+        X : ArrayLike
+            Array of shape (2 * n_matches, 3) with the columns team_id, opponent_id
+            and home_team. The rows of a match must be adjacent with the home team
+            first.
+        max_goals : int, default=10
+            Highest number of goals per team.
+
+        Returns
+        -------
+        score_probabilities : np.ndarray
+            Array of shape (n_matches, max_goals + 1, max_goals + 1). The element
+            [i, g1, g2] is the probability of the result g1:g2 in match i.
+        """
+        rates = self.predict(X)
+        if len(rates) % 2 != 0:
+            raise ValueError("X needs two rows per match.")
+        rates = rates.reshape(-1, 2)
+        probabilities = poisson_score_probabilities(rates, max_goals)
+        if self.rho_ != 0:
+            goals_1, goals_2 = np.meshgrid([0, 1], [0, 1], indexing="ij")
+            tau, *_ = _dixon_coles_tau(
+                np.broadcast_to(goals_1, (len(rates), 2, 2)),
+                np.broadcast_to(goals_2, (len(rates), 2, 2)),
+                np.broadcast_to(
+                    rates[:, 0, np.newaxis, np.newaxis], (len(rates), 2, 2)
+                ),
+                np.broadcast_to(
+                    rates[:, 1, np.newaxis, np.newaxis], (len(rates), 2, 2)
+                ),
+                self.rho_,
+            )
+            probabilities[:, :2, :2] *= tau
+        return probabilities
+
+
+def walk_forward_predict(
+    model: PoissonGoalModel,
+    X: ArrayLike,
+    y: ArrayLike,
+    periods: ArrayLike,
+    half_life: float | None = None,
+    min_train_periods: int = 1,
+) -> np.ndarray:
+    """Refit a model before every period on all earlier periods and predict the
+    period. With warm_start every fit starts from the parameters of the previous
+    period, so a refit after a single match day needs only a few iterations.
+
+    Parameters
+    ----------
+    model : PoissonGoalModel
+        Model to refit, usually with warm_start=True. It is modified in place and
+        holds the fit of the last period afterwards.
+    X : ArrayLike
+        Array of shape (n_samples, 3) with the columns team_id, opponent_id and
+        home_team.
+    y : ArrayLike
+        Goals scored by the team.
+    periods : ArrayLike
+        Non-decreasing period of every row, e.g. a running index of the match days.
+    half_life : float | None, default=None
+        Half-life of the training weights in periods. None for equal weights.
+    min_train_periods : int, default=1
+        Number of periods used for training before the first prediction.
+
+    Returns
+    -------
+    y_pred : np.ndarray
+        Expected goals of every row, NaN for the rows of the first periods.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    periods = np.asarray(periods)
+    if np.any(np.diff(periods) < 0):
+        raise ValueError("periods must be sorted.")
+
+    boundaries = np.concatenate(
+        [[0], np.flatnonzero(np.diff(periods)) + 1, [len(periods)]]
+    )
+    y_pred = np.full(len(y), np.nan)
+    for start, end in zip(
+        boundaries[min_train_periods:-1],
+        boundaries[min_train_periods + 1 :],
+        strict=True,
+    ):
+        sample_weight = None
+        if half_life is not None:
+            sample_weight = exponential_decay_weights(
+                periods[start] - periods[:start], half_life
+            )
+        model.fit(X[:start], y[:start], sample_weight)
+        y_pred[start:end] = model.predict(X[start:end])
+    return y_pred
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+from scipy.optimize import approx_fprime
+
+from aktipp.models.poisson import (
+    PoissonGoalModel,
+    _negative_log_likelihood,
+    walk_forward_predict,
+)
+
+
+def _simulate(n_teams=8, n_rounds=40, seed=0):
+    """Simulate long team-match rows, home row first, with known ratings."""
+    rng = np.random.default_rng(seed)
+    attack = rng.normal(0, 0.3, n_teams)
+    defence = rng.normal(0, 0.3, n_teams)
+    rows, goals, periods = [], [], []
+    for period in range(n_rounds):
+        teams = rng.permutation(n_teams)
+        for home, away in teams.reshape(-1, 2):
+            rates = np.exp(
+                [
+                    0.1 + 0.3 + attack[home] - defence[away],
+                    0.1 + attack[away] - defence[home],
+                ]
+            )
+            goals += list(rng.poisson(rates))
+            rows += [[home + 100, away + 100, 1], [away + 100, home + 100, 0]]
+            periods += [period, period]
+    return np.array(rows, dtype=float), np.array(goals, dtype=float), np.array(periods)
+
+
+@pytest.mark.parametrize("dixon_coles", [False, True])
+def test_gradient(dixon_coles):
+    X, y, _ = _simulate(n_rounds=5)
+    teams, index = np.unique(X[:, :2], return_inverse=True)
+    index = index.reshape(-1, 2)
+    parameters = np.random.default_rng(1).normal(0, 0.1, 3 + 2 * len(teams))
+    args = (index[:, 0], index[:, 1], X[:, 2], y, np.linspace(0.5, 1, len(y)), 0.5)
+    args += (dixon_coles,)
+    if not dixon_coles:
+        parameters[2] = 0.0
+
+    _, gradient = _negative_log_likelihood(parameters, *args)
+    numerical = approx_fprime(
+        parameters, lambda p: _negative_log_likelihood(p, *args)[0], 1e-7
+    )
+    np.testing.assert_allclose(gradient, numerical, rtol=1e-4, atol=1e-4)
+
+
+def test_fit_and_warm_start():
+    X, y, periods = _simulate(n_rounds=200)
+    model = PoissonGoalModel(alpha=0.1).fit(X, y)
+    assert abs(model.home_advantage_ - 0.3) < 0.1
+    assert model.rho_ == 0
+
+    # a warm started refit with one more round needs fewer iterations
+    cutoff = np.searchsorted(periods, 199)
+    model_cold = PoissonGoalModel(alpha=0.1).fit(X[:cutoff], y[:cutoff])
+    model_warm = PoissonGoalModel(alpha=0.1, warm_start=True).fit(
+        X[: cutoff - 8], y[: cutoff - 8]
+    )
+    model_warm.fit(X[:cutoff], y[:cutoff])
+    assert model_warm.n_iter_ < model_cold.n_iter_
+    np.testing.assert_allclose(
+        model_warm.predict(X[cutoff:]), model_cold.predict(X[cutoff:]), rtol=1e-4
+    )
+
+    model = PoissonGoalModel(dixon_coles=True).fit(X, y)
+    probabilities = model.predict_score_probabilities(X[:4])
+    assert probabilities.shape == (2, 11, 11)
+    np.testing.assert_allclose(probabilities.sum(axis=(1, 2)), 1, atol=1e-3)
+
+
+def test_walk_forward_predict():
+    X, y, periods = _simulate(n_rounds=10)
+    y_pred = walk_forward_predict(
+        PoissonGoalModel(warm_start=True), X, y, periods, half_life=5
+    )
+    assert np.all(np.isnan(y_pred[periods == 0]))
+    assert np.all(y_pred[periods > 0] > 0)
@@ -1,6 +1,20 @@
-from .normalize_openligadb import (
-    normalize_season_openligadb,
-    normalize_many_seasons_openligadb,
-)
+import importlib
+
+# attributes are imported on first access, see aktipp.__getattr__
+_LAZY_IMPORTS = {
+    "normalize_season_openligadb": ".normalize_openligadb",
+    "normalize_many_seasons_openligadb": ".normalize_openligadb",
+}
 
 __all__ = ["normalize_season_openligadb", "normalize_many_seasons_openligadb"]
+
+
+def __getattr__(name: str):
+    if name in _LAZY_IMPORTS:
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(__all__)
@@ -1,10 +1,94 @@
-import json
-import os
+import logging
+
 import polars as pl
 
+from .._raw_archive import _find_raw_season, _read_raw_season
+from .._storage import _validate_storage_profile, _write_parquet
+from ..etl.clean import (
+    DEFAULT_FEATURES,
+    GOALS_FEATURES,
+    WIDE_FEATURES,
+    required_columns_openligadb,
+)
+from ..tracing import trace_stage
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA_INPUT = {
+    "matchID": pl.Int64,
+    "matchDateTime": pl.String,
+    "timeZoneID": pl.String,
+    "leagueId": pl.Int64,
+    "leagueName": pl.String,
+    "leagueSeason": pl.Int64,
+    "leagueShortcut": pl.String,
+    "matchDateTimeUTC": pl.String,
+    "group.groupName": pl.String,
+    "group.groupOrderID": pl.Int64,
+    "group.groupID": pl.Int64,
+    "team1.teamId": pl.Int64,
+    "team1.teamName": pl.String,
+    "team1.shortName": pl.String,
+    "team1.teamIconUrl": pl.String,
+    "team1.teamGroupName": pl.String,
+    "team2.teamId": pl.Int64,
+    "team2.teamName": pl.String,
+    "team2.shortName": pl.String,
+    "team2.teamIconUrl": pl.String,
+    "team2.teamGroupName": pl.String,
+    "lastUpdateDateTime": pl.String,
+    "matchIsFinished": pl.Int64,
+    "location": pl.String,
+    "numberOfViewers": pl.Int64,
+    "matchResults": pl.List,
+    "goals": pl.Unknown,
+}
+
+_SCHEMA_RECORDS = {
+    "matchResults": {
+        "resultID": pl.Int64,
+        "resultName": pl.String,
+        "pointsTeam1": pl.Int64,
+        "pointsTeam2": pl.Int64,
+        "resultOrderID": pl.Int64,
+        "resultTypeID": pl.Int64,
+        "resultDescription": pl.String,
+    },
+    "goals": {
+        "goalID": pl.Int64,
+        "scoreTeam1": pl.Int64,
+        "scoreTeam2": pl.Int64,
+        "matchMinute": pl.Int64,
+        "goalGetterID": pl.Int64,
+        "goalGetterName": pl.String,
+        "isPenalty": pl.Boolean,
+        "isOwnFoal": pl.Boolean,
+        "isOvertime": pl.Boolean,
+        "comment": pl.String,
+    },
+}
+
+# layouts of the normalized match results
+# - long: one row per record, i.e. separate rows for the half time and the final
+#   result of a match, each with all meta data
+# - wide: one row per match, the record keys hold the final result and the half time
+#   result is added in the columns of _HALF_TIME_KEYS
+LAYOUTS = ["long", "wide"]
+
+# resultTypeID of the match results
+_RESULT_TYPE_HALF_TIME = 1
+_RESULT_TYPE_FINAL = 2
+
+# half time columns of the wide layout and the record keys they are taken from
+_HALF_TIME_KEYS = {
+    "halfTimePointsTeam1": "pointsTeam1",
+    "halfTimePointsTeam2": "pointsTeam2",
+}
+
 
 def _check_season_openligadb_exists(league: str, season: str, data_path: str) -> bool:
-    """Check if a league season combination as available as json.
+    """Check if a league season combination as available as json, plain or
+    compressed.
 
     Parameters
     ----------
@@ -21,7 +105,7 @@ def _check_season_openligadb_exists(league: str, season: str, data_path: str) ->
     result : bool
         True if league season combination is available.
     """
-    return os.path.isfile(data_path + f"{league}_{season}.json")
+    return _find_raw_season(data_path, league, season) is not None
 
 
 def normalize_season_openligadb(
@@ -29,13 +113,20 @@ def normalize_season_openligadb(
     season: str,
     data_path: str,
     records: str = "matchResults",
-    meta: str | list[str] = "all",
+    meta: str | list[str] | None = None,
+    record_keys: str | list[str] | None = None,
+    storage_profile: str = "default",
+    layout: str = "long",
+    features: list[str] | None = None,
 ) -> None:
     """Normalize a season from json into a relational table and dump it as parquet.
     The openligadb json files currently contain two seperate lists of records. One
     list for 'matchResults' and one list for 'goals'. Both record lists can be
-    normalized individually. By default the normalization includes all available
-    meta data, but can be reduced to a subset.
+    normalized individually. By default the normalization only includes the meta
+    data and record keys clean_openligadb needs for the features, but any subset or
+    all of them can be selected. The json is read from 'league_season.json' or its
+    compressed variants 'league_season.json.gz' and 'league_season.json.zst', which
+    are decompressed as a stream while reading.
 
     Parameters
     ----------
@@ -48,9 +139,29 @@ def normalize_season_openligadb(
         Path where the data should be read from json and dumped as normalized parquet.
     records : str, default="matchResults"
         List of the records to be normalized.
-    meta : str | list[str], default="all"
-        Meta data to be used in normalization. "all" indicates all available meta data.
-        Otherwise a list, e.g. ["matchID"] with desired meta data can be passed.
+    meta : str | list[str] | None, default=None
+        Meta data to be used in normalization. None for the meta data the features
+        need, see etl.required_columns_openligadb. "all" indicates all available
+        meta data. Otherwise a list, e.g. ["matchID"] with desired meta data can be
+        passed.
+    record_keys : str | list[str] | None, default=None
+        Record keys to be used in normalization. None for the keys the features
+        need, "all" for all keys of the records. Otherwise a list, e.g.
+        ["pointsTeam1"] with desired keys can be passed.
+    storage_profile : str, default="default"
+        "default" - the polars defaults, unsorted.
+        "hot" - lz4 and small row groups sorted by league and match day.
+        "archive" - zstd level 19 and large row groups sorted by league and match day.
+    layout : str, default="long"
+        "long" - one row per record, e.g. one for the half time and one for the final
+        result of a match.
+        "wide" - one row per match for the 'matchResults'. The record keys hold the
+        final result, the half time goals are added as 'halfTimePointsTeam1' and
+        'halfTimePointsTeam2'. Halves the rows of the following stages.
+    features : list[str] | None, default=None
+        Features the records are cleaned up into, they decide the columns of meta
+        and record_keys left at None. None for etl.DEFAULT_FEATURES,
+        etl.WIDE_FEATURES with layout "wide" and etl.GOALS_FEATURES for 'goals'.
     """
 
     # validate records
@@ -58,118 +169,182 @@ def normalize_season_openligadb(
     if records not in valid_records:
         raise ValueError(f"{records} is not in {valid_records}.")
 
+    # validate layout
+    if layout not in LAYOUTS:
+        raise ValueError(f"layout must be in {LAYOUTS}")
+    if layout == "wide" and records != "matchResults":
+        raise ValueError("layout 'wide' is only available for 'matchResults'.")
+
+    # only the columns clean up needs for the features are normalized by default
+    if meta is None or record_keys is None:
+        if features is None:
+            features = (
+                GOALS_FEATURES
+                if records == "goals"
+                else WIDE_FEATURES
+                if layout == "wide"
+                else DEFAULT_FEATURES
+            )
+        required_meta, required_record_keys = required_columns_openligadb(features)
+        if meta is None:
+            meta = required_meta
+        if record_keys is None:
+            record_keys = required_record_keys
+
     # validate meta data
-    valid_meta = [
-        "matchID",
-        "matchDateTime",
-        "timeZoneID",
-        "leagueId",
-        "leagueName",
-        "leagueSeason",
-        "leagueShortcut",
-        "matchDateTimeUTC",
-        "group.groupName",
-        "group.groupOrderID",
-        "group.groupID",
-        "team1.teamId",
-        "team1.teamName",
-        "team1.shortName",
-        "team1.teamIconUrl",
-        "team1.teamGroupName",
-        "team2.teamId",
-        "team2.teamName",
-        "team2.shortName",
-        "team2.teamIconUrl",
-        "team2.teamGroupName",
-        "lastUpdateDateTime",
-        "matchIsFinished",
-        "location",
-        "numberOfViewers",
-    ]
+    valid_meta = [column for column in _SCHEMA_INPUT if column not in _SCHEMA_RECORDS]
 
     if isinstance(meta, str):
         if meta == "all":
             meta = valid_meta
         else:
-            raise ValueError("meta should be 'all' or subset of {valid_meta}")
+            raise ValueError(f"meta should be 'all' or subset of {valid_meta}")
     elif isinstance(meta, list):
-        elements_valid = [element in valid_meta for element in meta]
-        if not all(elements_valid):
-            elements_invalid = meta[~elements_valid]
+        elements_invalid = [element for element in meta if element not in valid_meta]
+        if elements_invalid:
             raise ValueError(f"{elements_invalid} are not in {valid_meta}")
     else:
-        raise ValueError("meta should be 'all' or subset of {valid_meta}")
-
-    # read json data
-    with open(data_path + f"{league}_{season}.json", "r") as file:
-        data = json.load(file)
-
-    # normalize data and dump as parquet file
-    schema_input = {
-        "matchID": pl.Int64,
-        "matchDateTime": pl.String,
-        "timeZoneID": pl.String,
-        "leagueId": pl.Int64,
-        "leagueName": pl.String,
-        "leagueSeason": pl.Int64,
-        "leagueShortcut": pl.String,
-        "matchDateTimeUTC": pl.String,
-        "group.groupName": pl.String,
-        "group.groupOrderID": pl.Int64,
-        "group.groupID": pl.Int64,
-        "team1.teamId": pl.Int64,
-        "team1.teamName": pl.String,
-        "team1.shortName": pl.String,
-        "team1.teamIconUrl": pl.String,
-        "team1.teamGroupName": pl.String,
-        "team2.teamId": pl.Int64,
-        "team2.teamName": pl.String,
-        "team2.shortName": pl.String,
-        "team2.teamIconUrl": pl.String,
-        "team2.teamGroupName": pl.String,
-        "lastUpdateDateTime": pl.String,
-        "matchIsFinished": pl.Int64,
-        "location": pl.String,
-        "numberOfViewers": pl.Int64,
-        "matchResults": pl.List,
-        "goals": pl.Unknown,
-    }
-    schema_records = {
-        "matchResults": {
-            "resultID": pl.Int64,
-            "resultName": pl.String,
-            "pointsTeam1": pl.Int64,
-            "pointsTeam2": pl.Int64,
-            "resultOrderID": pl.Int64,
-            "resultTypeID": pl.Int64,
-            "resultDescription": pl.String,
-        },
-        "goals": {
-            "goalID": pl.Int64,
-            "scoreTeam1": pl.Int64,
-            "scoreTeam2": pl.Int64,
-            "matchMinute": pl.Int64,
-            "goalGetterID": pl.Int64,
-            "goalGetterName": pl.String,
-            "isPenalty": pl.Boolean,
-            "isOwnFoal": pl.Boolean,
-            "isOvertime": pl.Boolean,
-            "comment": pl.String,
-        },
-    }
-    record_keys = list(schema_records[records].keys())
-
-    df = pl.json_normalize(data=data, schema=schema_input)
-
-    # Info message, if there are no results
-    if isinstance(df[records].explode().dtype, pl.Null):
-        print(f"{league} {season} has no {records}. Only meta data.")
-
-    df.explode(records)  \
-        .cast({records: pl.Struct(schema_records[records])}) \
+        raise ValueError(f"meta should be 'all' or subset of {valid_meta}")
+
+    # validate record keys
+    valid_record_keys = list(_SCHEMA_RECORDS[records])
+    if layout == "wide":
+        valid_record_keys += list(_HALF_TIME_KEYS)
+    if isinstance(record_keys, str):
+        if record_keys == "all":
+            record_keys = valid_record_keys
+        else:
+            raise ValueError(
+                f"record_keys should be 'all' or subset of {valid_record_keys}"
+            )
+    elif isinstance(record_keys, list):
+        elements_invalid = [
+            element for element in record_keys if element not in valid_record_keys
+        ]
+        if elements_invalid:
+            raise ValueError(f"{elements_invalid} are not in {valid_record_keys}")
+    else:
+        raise ValueError(
+            f"record_keys should be 'all' or subset of {valid_record_keys}"
+        )
+
+    with trace_stage(
+        "normalize_season_openligadb",
+        league=league,
+        season=season,
+        records=records,
+        layout=layout,
+    ) as stage:
+        # read json data, compressed files are decompressed while they are read
+        raw_season_path = _find_raw_season(data_path, league, season)
+        if raw_season_path is None:
+            raise FileNotFoundError(f"{league} {season} is not in {data_path}.")
+        data = _read_raw_season(raw_season_path)
+        stage.add_rows_in(len(data))
+
+        # Info message, if there are no results
+        if not any(match.get(records) for match in data):
+            logger.warning("%s %s has no %s. Only meta data.", league, season, records)
+
+        # normalize data and dump as parquet file
+        _write_parquet(
+            _normalize_openligadb(data, records, meta, record_keys, layout),
+            data_path + f"{league}_{season}_{records}.parquet",
+            "normalized",
+            storage_profile,
+        )
+        stage.add_output(data_path + f"{league}_{season}_{records}.parquet")
+
+
+def _normalize_openligadb(
+    data: list[dict],
+    records: str,
+    meta: list[str],
+    record_keys: list[str] | None = None,
+    layout: str = "long",
+) -> pl.DataFrame:
+    """Normalize openligadb match records into a relational table.
+
+    Parameters
+    ----------
+    data : list[dict]
+        Match records in the format of https://api.openligadb.de/getmatchdata.
+    records : str
+        List of the records to be normalized, "matchResults" or "goals".
+    meta : list[str]
+        Meta data to be used in normalization.
+    record_keys : list[str] | None, default=None
+        Record keys to be used in normalization. None for all keys.
+    layout : str, default="long"
+        "long" or "wide", see normalize_season_openligadb.
+
+    Returns
+    -------
+    normalized : pl.DataFrame
+        One row per record with the meta data of its match, or one row per match
+        for the wide layout.
+    """
+
+    if record_keys is None:
+        record_keys = list(_SCHEMA_RECORDS[records])
+        if layout == "wide":
+            record_keys += list(_HALF_TIME_KEYS)
+
+    # only the selected meta data is extracted from the json
+    schema = {column: _SCHEMA_INPUT[column] for column in [*meta, records]}
+    df = pl.json_normalize(data=data, schema=schema)
+
+    if layout == "wide":
+        return _pivot_match_results(df, meta, record_keys)
+
+    return df.explode(records)  \
+        .cast({records: pl.Struct(_SCHEMA_RECORDS[records])}) \
         .unnest(records) \
-        .select(meta + record_keys) \
-        .write_parquet(data_path + f"{league}_{season}_{records}.parquet")  # fmt: skip
+        .select(meta + record_keys)  # fmt: skip
+
+
+def _pivot_match_results(
+    df: pl.DataFrame, meta: list[str], record_keys: list[str]
+) -> pl.DataFrame:
+    """Pivot the match results of every match into a single row. Matches without a
+    final or half time result, e.g. future matches, have nulls in their columns.
+
+    Parameters
+    ----------
+    df : pl.DataFrame
+        One row per match with the list of its 'matchResults'.
+    meta : list[str]
+        Meta data to be used in normalization.
+    record_keys : list[str]
+        Record keys of the final result and columns of _HALF_TIME_KEYS.
+
+    Returns
+    -------
+    normalized : pl.DataFrame
+        One row per match with the meta data and the results.
+    """
+    results = pl.col("matchResults").cast(
+        pl.List(pl.Struct(_SCHEMA_RECORDS["matchResults"]))
+    )
+
+    def result_of_type(result_type: int) -> pl.Expr:
+        return results.list.eval(
+            pl.element().filter(
+                pl.element().struct.field("resultTypeID") == result_type
+            )
+        ).list.first()
+
+    final = result_of_type(_RESULT_TYPE_FINAL)
+    half_time = result_of_type(_RESULT_TYPE_HALF_TIME)
+    return df.select(
+        *meta,
+        *[
+            half_time.struct.field(_HALF_TIME_KEYS[key]).alias(key)
+            if key in _HALF_TIME_KEYS
+            else final.struct.field(key).alias(key)
+            for key in record_keys
+        ],
+    )
 
 
 def normalize_many_seasons_openligadb(
@@ -177,7 +352,11 @@ def normalize_many_seasons_openligadb(
     seasons: list[int],
     data_path: str,
     records: str = "matchResults",
-    meta: str | list[str] = "all",
+    meta: str | list[str] | None = None,
+    record_keys: str | list[str] | None = None,
+    storage_profile: str = "default",
+    layout: str = "long",
+    features: list[str] | None = None,
 ) -> None:
     """Normalize many seasons from json into a relational table and dump them as
     parquet.
@@ -193,15 +372,52 @@ def normalize_many_seasons_openligadb(
         Path where the data should be read from json and dumped as normalized parquet.
     records : str, default="matchResults"
         List of the records to be normalized.
-    meta : str | list[str], default="all"
-        Meta data to be used in normalization. "all" indicates all available meta data.
-        Otherwise a list, e.g. ["matchID"] with desired meta data can be passed.
+    meta : str | list[str] | None, default=None
+        Meta data to be used in normalization. None for the meta data the features
+        need, see etl.required_columns_openligadb. "all" indicates all available
+        meta data. Otherwise a list, e.g. ["matchID"] with desired meta data can be
+        passed.
+    record_keys : str | list[str] | None, default=None
+        Record keys to be used in normalization. None for the keys the features
+        need, "all" for all keys of the records. Otherwise a list, e.g.
+        ["pointsTeam1"] with desired keys can be passed.
+    storage_profile : str, default="default"
+        "default" - the polars defaults, unsorted.
+        "hot" - lz4 and small row groups sorted by league and match day.
+        "archive" - zstd level 19 and large row groups sorted by league and match day.
+    layout : str, default="long"
+        "long" - one row per record.
+        "wide" - one row per match with the final and the half time result, see
+        normalize_season_openligadb.
+    features : list[str] | None, default=None
+        Features the records are cleaned up into, they decide the columns of meta
+        and record_keys left at None. None for etl.DEFAULT_FEATURES,
+        etl.WIDE_FEATURES with layout "wide" and etl.GOALS_FEATURES for 'goals'.
     """
 
-    for league in leagues:
-        for season in seasons:
-            if _check_season_openligadb_exists(league, season, data_path):
-                normalize_season_openligadb(league, season, data_path, records, meta)
-                print(f"{league} {season} has been normalized.")
-            else:
-                print(f"{league} {season} is not available and will be skipped.")
+    _validate_storage_profile(storage_profile)
+    if layout not in LAYOUTS:
+        raise ValueError(f"layout must be in {LAYOUTS}")
+
+    with trace_stage(
+        "normalize_many_seasons_openligadb", records=records, layout=layout
+    ):
+        for league in leagues:
+            for season in seasons:
+                if _check_season_openligadb_exists(league, season, data_path):
+                    normalize_season_openligadb(
+                        league,
+                        season,
+                        data_path,
+                        records,
+                        meta,
+                        record_keys,
+                        storage_profile,
+                        layout,
+                        features,
+                    )
+                    logger.info("%s %s has been normalized.", league, season)
+                else:
+                    logger.warning(
+                        "%s %s is not available and will be skipped.", league, season
+                    )
@@ -1,6 +1,31 @@
-from .scrape_openligadb import scrape_season_openligadb, scrape_many_seasons_openligadb
+import importlib
+
+# attributes are imported on first access, see aktipp.__getattr__
+_LAZY_IMPORTS = {
+    "generate_season_openligadb": ".generate_openligadb",
+    "generate_many_seasons_openligadb": ".generate_openligadb",
+    "MirrorOpenligadb": ".mirror_openligadb",
+    "OPENLIGADB_URL": ".scrape_openligadb",
+    "scrape_season_openligadb": ".scrape_openligadb",
+    "scrape_many_seasons_openligadb": ".scrape_openligadb",
+}
 
 __all__ = [
+    "generate_season_openligadb",
+    "generate_many_seasons_openligadb",
+    "MirrorOpenligadb",
+    "OPENLIGADB_URL",
     "scrape_season_openligadb",
     "scrape_many_seasons_openligadb",
 ]
+
+
+def __getattr__(name: str):
+    if name in _LAZY_IMPORTS:
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(__all__)
@@ -0,0 +1,355 @@
+import csv
+import datetime
+import zlib
+from importlib import resources
+
+import numpy as np
+
+from .._raw_archive import _write_raw_season
+from ..etl import mapper
+
+# raw league names as they appear in openligadb, see league_mapper.csv
+_LEAGUE_NAMES = {
+    "bl1": "1. Fußball-Bundesliga",
+    "bl2": "2. Fußball-Bundesliga",
+    "bl3": "3. Fußball-Liga",
+}
+
+# ids are allocated per league season from the position of the league and the
+# season, so they are unique for up to _MAX_LEAGUES leagues with the n * (n - 1)
+# matches of every team count in team_mapper.csv and fit the UInt32 match ids of
+# the compact dtype profile
+_FIRST_SEASON = 1900
+_N_SEASONS = 200
+_MAX_LEAGUES = 2_000
+_MATCH_ID_STRIDE = 10_000
+
+
+def _stable_hash(value: str) -> int:
+    """Hash that is stable across interpreter runs, unlike hash()."""
+    return zlib.crc32(value.encode())
+
+
+def _load_teams() -> list[tuple[int, str]]:
+    """Load all unique teams from the team mapper.
+
+    Returns
+    -------
+    teams : list[tuple[int, str]]
+        List of (team_id, team_name) for every team whose raw id is its unique id.
+    """
+    team_mapper_path = resources.files(mapper) / "team_mapper.csv"
+    with team_mapper_path.open(encoding="utf-8", newline="") as file:
+        return [
+            (int(row["team_id_raw"]), row["team_name"])
+            for row in csv.DictReader(file)
+            if row["team_id_raw"] == row["team_id_unique"]
+        ]
+
+
+def _load_league_names() -> list[str]:
+    """Load all raw league names from the league mapper.
+
+    Returns
+    -------
+    league_names : list[str]
+        List of the raw league names.
+    """
+    league_mapper_path = resources.files(mapper) / "league_mapper.csv"
+    with league_mapper_path.open(encoding="utf-8", newline="") as file:
+        return [row["league_name_raw"] for row in csv.DictReader(file)]
+
+
+def _round_robin(n_teams: int) -> list[list[tuple[int, int]]]:
+    """Create a double round robin schedule with the circle method.
+
+    Parameters
+    ----------
+    n_teams : int
+        Number of teams, must be even.
+
+    Returns
+    -------
+    schedule : list[list[tuple[int, int]]]
+        List of match days, each a list of (home, away) team indices.
+    """
+    teams = list(range(n_teams))
+    first_half = []
+    for match_day in range(n_teams - 1):
+        pairings = []
+        for i in range(n_teams // 2):
+            home, away = teams[i], teams[n_teams - 1 - i]
+            # alternate home rights of the fixed team
+            if i == 0 and match_day % 2 == 1:
+                home, away = away, home
+            pairings.append((home, away))
+        first_half.append(pairings)
+        teams = [teams[0], teams[-1]] + teams[1:-1]
+    second_half = [[(away, home) for home, away in day] for day in first_half]
+    return first_half + second_half
+
+
+def _generate_season_openligadb(
+    league: str,
+    season: int,
+    n_teams: int = 18,
+    match_days_played: int | None = None,
+    seed: int = 0,
+    league_index: int = 0,
+) -> list[dict]:
+    """Generate the openligadb records of one synthetic season.
+
+    Parameters
+    ----------
+    league : str
+        String identifier from the league, e.g. 'bl1'.
+    season : int
+        Year indicating the start of a season, e.g. 2023 for the 2023/2024 season.
+    n_teams : int, default=18
+        Number of teams, must be even and at most the number of teams in
+        team_mapper.csv.
+    match_days_played : int | None, default=None
+        Number of match days with results. None for a completed season.
+    seed : int, default=0
+        Seed for the random number generator.
+    league_index : int, default=0
+        Position of the league among the generated leagues, the ids of the league
+        are derived from it.
+
+    Returns
+    -------
+    data : list[dict]
+        Records in the format of https://api.openligadb.de/getmatchdata.
+    """
+    teams = _load_teams()
+    if n_teams % 2 != 0 or not 2 <= n_teams <= len(teams):
+        raise ValueError(f"n_teams must be even and between 2 and {len(teams)}.")
+    if not 0 <= league_index < _MAX_LEAGUES:
+        raise ValueError(f"league_index must be between 0 and {_MAX_LEAGUES - 1}.")
+    if not _FIRST_SEASON <= season < _FIRST_SEASON + _N_SEASONS:
+        raise ValueError(
+            f"season must be between {_FIRST_SEASON} and "
+            f"{_FIRST_SEASON + _N_SEASONS - 1}."
+        )
+
+    league_hash = _stable_hash(league)
+    league_names = _load_league_names()
+    league_name = _LEAGUE_NAMES.get(
+        league, league_names[league_hash % len(league_names)]
+    )
+    season_index = league_index * _N_SEASONS + season - _FIRST_SEASON
+    league_id = 100_000 + season_index
+
+    # teams and their strengths are fixed per league, results vary per season
+    rng_league = np.random.default_rng([seed, league_hash])
+    team_indices = rng_league.choice(len(teams), size=n_teams, replace=False)
+    attack = rng_league.normal(0.0, 0.2, n_teams)
+    defence = rng_league.normal(0.0, 0.2, n_teams)
+    rng = np.random.default_rng([seed, league_hash, season])
+
+    schedule = _round_robin(n_teams)
+    n_match_days = len(schedule)
+    if match_days_played is None:
+        match_days_played = n_match_days
+
+    home = np.array([home for day in schedule for home, _ in day])
+    away = np.array([away for day in schedule for _, away in day])
+    goals_home = rng.poisson(np.exp(0.35 + attack[home] - defence[away]))
+    goals_away = rng.poisson(np.exp(0.1 + attack[away] - defence[home]))
+
+    season_start = datetime.datetime(season, 8, 1, 15, 30)
+    data = []
+    for match_index, (team_1, team_2) in enumerate(zip(home, away, strict=True)):
+        match_day = match_index // (n_teams // 2) + 1
+        match_id = season_index * _MATCH_ID_STRIDE + match_index + 1
+        match_date = season_start + datetime.timedelta(days=7 * (match_day - 1))
+        is_finished = match_day <= match_days_played
+
+        match_results = []
+        goals = []
+        if is_finished:
+            # goal events in chronological order with the scoring team
+            n_goals = goals_home[match_index] + goals_away[match_index]
+            minutes = np.sort(rng.integers(1, 91, n_goals))
+            scorers = rng.permutation(
+                np.repeat([1, 2], [goals_home[match_index], goals_away[match_index]])
+            )
+            score = {1: 0, 2: 0}
+            for goal_index, (minute, scorer) in enumerate(
+                zip(minutes, scorers, strict=True)
+            ):
+                score[scorer] += 1
+                team_id = teams[team_indices[team_1 if scorer == 1 else team_2]][0]
+                goal_getter_id = team_id * 100 + int(rng.integers(1, 26))
+                goals.append(
+                    {
+                        "goalID": match_id * 100 + goal_index,
+                        "scoreTeam1": score[1],
+                        "scoreTeam2": score[2],
+                        "matchMinute": int(minute),
+                        "goalGetterID": goal_getter_id,
+                        "goalGetterName": f"Player {goal_getter_id}",
+                        "isPenalty": bool(rng.random() < 0.1),
+                        "isOwnFoal": bool(rng.random() < 0.03),
+                        "isOvertime": False,
+                        "comment": None,
+                    }
+                )
+            half_time = minutes <= 45
+            match_results = [
+                {
+                    "resultID": match_id * 2 + 1,
+                    "resultName": "Endergebnis",
+                    "pointsTeam1": int(goals_home[match_index]),
+                    "pointsTeam2": int(goals_away[match_index]),
+                    "resultOrderID": 2,
+                    "resultTypeID": 2,
+                    "resultDescription": "Ergebnis nach Ende der offiziellen Spielzeit",
+                },
+                {
+                    "resultID": match_id * 2,
+                    "resultName": "Halbzeit",
+                    "pointsTeam1": int(np.sum(half_time & (scorers == 1))),
+                    "pointsTeam2": int(np.sum(half_time & (scorers == 2))),
+                    "resultOrderID": 1,
+                    "resultTypeID": 1,
+                    "resultDescription": "Ergebnis nach Ende der ersten Halbzeit",
+                },
+            ]
+
+        team_records = []
+        for team in [team_1, team_2]:
+            team_id, team_name = teams[team_indices[team]]
+            team_records.append(
+                {
+                    "teamId": team_id,
+                    "teamName": team_name,
+                    "shortName": team_name[:12],
+                    "teamIconUrl": f"https://example.org/teamicons/{team_id}.png",
+                    "teamGroupName": None,
+                }
+            )
+
+        data.append(
+            {
+                "matchID": match_id,
+                "matchDateTime": match_date.isoformat(),
+                "timeZoneID": "W. Europe Standard Time",
+                "leagueId": league_id,
+                "leagueName": f"{league_name} {season}/{season + 1}",
+                "leagueSeason": season,
+                "leagueShortcut": league,
+                "matchDateTimeUTC": (
+                    match_date - datetime.timedelta(hours=2)
+                ).isoformat()
+                + "Z",
+                "group": {
+                    "groupName": f"{match_day}. Spieltag",
+                    "groupOrderID": match_day,
+                    "groupID": league_id * 1_000 + match_day,
+                },
+                "team1": team_records[0],
+                "team2": team_records[1],
+                "lastUpdateDateTime": (
+                    (match_date + datetime.timedelta(hours=2)).isoformat()
+                    if is_finished
+                    else None
+                ),
+                "matchIsFinished": is_finished,
+                "matchResults": match_results,
+                "goals": goals,
+                "location": None,
+                "numberOfViewers": None,
+            }
+        )
+
+    return data
+
+
+def generate_season_openligadb(
+    league: str,
+    season: int,
+    data_path: str,
+    n_teams: int = 18,
+    match_days_played: int | None = None,
+    seed: int = 0,
+    compression: str | None = None,
+    league_index: int = 0,
+) -> None:
+    """Generate a synthetic season in the openligadb format and dump it as json. The
+    dumped file will be named 'league_season.json', just like a scraped season, so
+    the whole pipeline can be run offline and at arbitrary scale. The output is
+    deterministic for a given seed.
+
+    Parameters
+    ----------
+    league : str
+        String identifier from the league, e.g. 'bl1'. Unknown identifiers get a
+        league name from league_mapper.csv.
+    season : int
+        Year indicating the start of a season, e.g. 2023 for the 2023/2024 season.
+    data_path : str
+        Path where the data should be dumped as json.
+    n_teams : int, default=18
+        Number of teams, must be even and at most the number of teams in
+        team_mapper.csv.
+    match_days_played : int | None, default=None
+        Number of match days with results. None for a completed season.
+    seed : int, default=0
+        Seed for the random number generator.
+    compression : str | None, default=None
+        None for plain json, "gzip" or "zstd" to compress the dumped file.
+    league_index : int, default=0
+        Position of the league among the generated leagues, the ids of the league
+        are derived from it. Leagues generated into the same data_path need
+        distinct positions, generate_many_seasons_openligadb assigns them.
+    """
+    data = _generate_season_openligadb(
+        league, season, n_teams, match_days_played, seed, league_index
+    )
+    _write_raw_season(data, data_path, league, season, compression)
+
+
+def generate_many_seasons_openligadb(
+    leagues: list[str],
+    seasons: list[int],
+    data_path: str,
+    n_teams: int = 18,
+    seed: int = 0,
+    compression: str | None = None,
+) -> None:
+    """Generate many synthetic seasons of many leagues in the openligadb format. Dump
+    the individual combinations of league and season as json named like
+    'league_season.json'.
+
+    Parameters
+    ----------
+    leagues: list[str]
+        List of string identifiers, e.g. ['bl1', 'bl2'].
+    seasons: list[int]
+        List of years for multiple seasons.
+    data_path : str
+        Path where the data should be dumped as json.
+    n_teams : int, default=18
+        Number of teams per league. The ids of a league are derived from its
+        position in leagues, so they are unique across all leagues and seasons.
+    seed : int, default=0
+        Seed for the random number generator.
+    compression : str | None, default=None
+        None for plain json, "gzip" or "zstd" to compress the dumped files.
+    """
+
+    if len(set(leagues)) != len(leagues):
+        raise ValueError("leagues must be unique.")
+
+    for league_index, league in enumerate(leagues):
+        for season in seasons:
+            generate_season_openligadb(
+                league,
+                season,
+                data_path,
+                n_teams,
+                seed=seed,
+                compression=compression,
+                league_index=league_index,
+            )
@@ -0,0 +1,178 @@
+import json
+import os
+import re
+import threading
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .._raw_archive import _find_raw_season, _open_raw_season
+
+_SEASON_FILE = re.compile(r"(.+)_(\d+)\.json(?:\.gz|\.zst)?")
+_MATCH_DATA_PATH = re.compile(r"(?:/api)?/getmatchdata/([^/]+)/(\d+)")
+
+
+class _UpstreamError(Exception):
+    """The upstream of a mirror is unreachable."""
+
+
+class _MirrorHandler(BaseHTTPRequestHandler):
+    """Serve getavailableleagues and getmatchdata from the files of a mirror."""
+
+    server: "_MirrorServer"
+
+    def do_GET(self):
+        path = self.path.split("?")[0].rstrip("/")
+        try:
+            if path in ["/getavailableleagues", "/api/getavailableleagues"]:
+                body = self.server.mirror._available_leagues()
+            elif (match := _MATCH_DATA_PATH.fullmatch(path)) is not None:
+                body = self.server.mirror._match_data(match[1], int(match[2]))
+            else:
+                body = None
+        except _UpstreamError as error:
+            self.send_error(502, str(error))
+            return
+
+        if body is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _MirrorServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], mirror: "MirrorOpenligadb"):
+        super().__init__(address, _MirrorHandler)
+        self.mirror = mirror
+
+
+class MirrorOpenligadb:
+    """Local HTTP mirror of the openligadb api for offline runs. It serves
+    getavailableleagues and getmatchdata/{league}/{season} from a directory with
+    one 'league_season.json' file per season, i.e. the layout written by the
+    scraper and the generator, so any raw data directory can be replayed.
+    Compressed season files are decompressed before they are served. The list
+    of available leagues is read from 'getavailableleagues.json' if it exists and
+    derived from the season files otherwise.
+
+    With an upstream url, requests for missing files are forwarded upstream and the
+    responses are recorded to the directory, so the next run replays them without
+    network access. Requests that cannot reach the upstream are answered with 502.
+
+    Parameters
+    ----------
+    mirror_path : str
+        Directory of the mirror files.
+    upstream_url : str | None, default=None
+        Base url of the api responses are recorded from, e.g.
+        "https://api.openligadb.de". None to only replay recorded responses.
+    host : str, default="127.0.0.1"
+        Host the server binds to.
+    port : int, default=0
+        Port the server binds to, 0 for a free port.
+
+    Examples
+    --------
+    >>> with MirrorOpenligadb("mirror/", upstream_url=OPENLIGADB_URL) as mirror:
+    ...     scrape_many_seasons_openligadb(["bl1"], [2023], "raw/", mirror.url)
+    """
+
+    def __init__(
+        self,
+        mirror_path: str,
+        upstream_url: str | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.mirror_path = mirror_path
+        self.upstream_url = upstream_url
+        self.host = host
+        self.port = port
+        self._server = None
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        """Base url of the running mirror."""
+        if self._server is None:
+            raise ValueError("The mirror is not running, call start first.")
+        return f"http://{self.host}:{self._server.server_port}"
+
+    def start(self) -> "MirrorOpenligadb":
+        """Start serving in a background thread."""
+        os.makedirs(self.mirror_path, exist_ok=True)
+        self._server = _MirrorServer((self.host, self.port), self)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "MirrorOpenligadb":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _record(self, path: str, file_name: str) -> bytes | None:
+        """Forward a request upstream and store the response. Raises _UpstreamError
+        if the upstream is unreachable."""
+        if self.upstream_url is None:
+            return None
+        try:
+            body = urllib.request.urlopen(f"{self.upstream_url}{path}").read()
+        except urllib.error.HTTPError:
+            return None
+        except OSError as error:
+            # URLError and timeouts, the client gets a 502 instead of a dropped
+            # connection
+            raise _UpstreamError(f"{self.upstream_url} is unreachable: {error}")
+        # write to a temporary file first, so concurrent readers never see a
+        # partially written response
+        file_path = os.path.join(self.mirror_path, file_name)
+        with self._lock:
+            with open(f"{file_path}.tmp", "wb") as file:
+                file.write(body)
+            os.replace(f"{file_path}.tmp", file_path)
+        return body
+
+    def _available_leagues(self) -> bytes | None:
+        file_path = os.path.join(self.mirror_path, "getavailableleagues.json")
+        if os.path.isfile(file_path):
+            with open(file_path, "rb") as file:
+                return file.read()
+        if self.upstream_url is not None:
+            return self._record("/getavailableleagues", "getavailableleagues.json")
+
+        seasons = [
+            _SEASON_FILE.fullmatch(name) for name in os.listdir(self.mirror_path)
+        ]
+        return json.dumps(
+            [
+                {"leagueShortcut": season[1], "leagueSeason": season[2]}
+                for season in seasons
+                if season is not None
+            ]
+        ).encode()
+
+    def _match_data(self, league: str, season: int) -> bytes | None:
+        file_path = _find_raw_season(os.path.join(self.mirror_path, ""), league, season)
+        if file_path is not None:
+            with _open_raw_season(file_path) as file:
+                return file.read()
+        return self._record(
+            f"/getmatchdata/{league}/{season}", f"{league}_{season}.json"
+        )
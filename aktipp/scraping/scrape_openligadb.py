@@ -1,8 +1,40 @@
 import json
+import logging
 import urllib.request
 
+from .._raw_archive import _validate_compression, _write_raw_season
+from ..tracing import trace_stage
 
-def _check_season_openligadb_exists(league: str, season: int) -> bool:
+logger = logging.getLogger(__name__)
+
+OPENLIGADB_URL = "https://api.openligadb.de"
+
+
+def _available_seasons_openligadb(
+    base_url: str = OPENLIGADB_URL,
+) -> set[tuple[str, int]]:
+    """Retrieve all league season combinations available at openligadb.
+
+    Parameters
+    ----------
+    base_url : str, default=OPENLIGADB_URL
+        Base url of the openligadb api or a mirror of it.
+
+    Returns
+    -------
+    result : set[tuple[str, int]]
+        Available combinations as (league, season).
+    """
+    contents = urllib.request.urlopen(f"{base_url}/getavailableleagues").read()
+    return {
+        (league_season["leagueShortcut"], int(league_season["leagueSeason"]))
+        for league_season in json.loads(contents)
+    }
+
+
+def _check_season_openligadb_exists(
+    league: str, season: int, base_url: str = OPENLIGADB_URL
+) -> bool:
     """Check if a league season combination as available at openligadb.
 
     Parameters
@@ -12,32 +44,27 @@ def _check_season_openligadb_exists(league: str, season: int) -> bool:
         list can be retrieved from https://api.openligadb.de/getavailableleagues.
     season : int
         Year indicating the start of a season, e.g. 2023 for the 2023/2024 season.
+    base_url : str, default=OPENLIGADB_URL
+        Base url of the openligadb api or a mirror of it.
 
     Returns
     -------
     result : bool
         True if league season combination is available.
     """
-    # retrieve all available leagues
-    contents = urllib.request.urlopen(
-        "https://api.openligadb.de/getavailableleagues"
-    ).read()
-    available_leagues = json.loads(contents)
+    return (league, season) in _available_seasons_openligadb(base_url)
 
-    # parse league season combinations into a list of tuples (league, season)
-    league_season_list = []
-    for league_season in available_leagues:
-        league_season_list.append(
-            (league_season["leagueShortcut"], int(league_season["leagueSeason"]))
-        )
 
-    # check if league season combination is available
-    return (league, season) in league_season_list
-
-
-def scrape_season_openligadb(league: str, season: int, data_path: str) -> None:
+def scrape_season_openligadb(
+    league: str,
+    season: int,
+    data_path: str,
+    base_url: str = OPENLIGADB_URL,
+    compression: str | None = None,
+) -> None:
     """Load all games from one season of a league from openligadb and dump it as json.
-    The dumped file will named 'league_season.json'.
+    The dumped file will named 'league_season.json', with '.gz' or '.zst' appended
+    if it is compressed.
 
     Parameters
     ----------
@@ -48,21 +75,32 @@ def scrape_season_openligadb(league: str, season: int, data_path: str) -> None:
         Year indicating the start of a season, e.g. 2023 for the 2023/2024 season.
     data_path : str
         Path where the data should be dumped as json.
+    base_url : str, default=OPENLIGADB_URL
+        Base url of the openligadb api or a mirror of it, e.g. the url of a
+        MirrorOpenligadb.
+    compression : str | None, default=None
+        None for plain json, "gzip" or "zstd" to compress the dumped file.
     """
 
-    # read data from openligadb and parse as json
-    contents = urllib.request.urlopen(
-        f"http://www.openligadb.de/api/getmatchdata/{league}/{season}"
-    ).read()
-    data = json.loads(contents)
+    with trace_stage("scrape_season_openligadb", league=league, season=season) as stage:
+        # read data from openligadb and parse as json
+        contents = urllib.request.urlopen(
+            f"{base_url}/getmatchdata/{league}/{season}"
+        ).read()
+        data = json.loads(contents)
+        stage.add_rows_out(len(data))
 
-    # dump data as json
-    with open(f"{data_path}{league}_{season}.json", "w") as file:
-        json.dump(data, file)
+        # dump data as json
+        path = _write_raw_season(data, data_path, league, season, compression)
+        stage.add_output(path)
 
 
 def scrape_many_seasons_openligadb(
-    leagues: list[str], seasons: list[int], data_path: str
+    leagues: list[str],
+    seasons: list[int],
+    data_path: str,
+    base_url: str = OPENLIGADB_URL,
+    compression: str | None = None,
 ) -> None:
     """Load all games from many seasons of many leagues from openligadb. Dump the
     individual combinations of league and season as json named like
@@ -77,12 +115,26 @@ def scrape_many_seasons_openligadb(
         List of years for multiple seasons.
     data_path : str
         Path where the data should be dumped as json.
+    base_url : str, default=OPENLIGADB_URL
+        Base url of the openligadb api or a mirror of it, e.g. the url of a
+        MirrorOpenligadb.
+    compression : str | None, default=None
+        None for plain json, "gzip" or "zstd" to compress the dumped files.
     """
 
-    for league in leagues:
-        for season in seasons:
-            if _check_season_openligadb_exists(league, season):
-                scrape_season_openligadb(league, season, data_path)
-                print(f"{league} {season} has been loaded.")
-            else:
-                print(f"{league} {season} is not available and will be skipped.")
+    _validate_compression(compression)
+
+    with trace_stage("scrape_many_seasons_openligadb"):
+        # the available seasons are retrieved once instead of once per season
+        available_seasons = _available_seasons_openligadb(base_url)
+        for league in leagues:
+            for season in seasons:
+                if (league, season) in available_seasons:
+                    scrape_season_openligadb(
+                        league, season, data_path, base_url, compression
+                    )
+                    logger.info("%s %s has been loaded.", league, season)
+                else:
+                    logger.warning(
+                        "%s %s is not available and will be skipped.", league, season
+                    )
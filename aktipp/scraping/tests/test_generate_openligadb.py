@@ -0,0 +1,73 @@
+import json
+
+import polars as pl
+import pytest
+
+from aktipp.normalize import normalize_many_seasons_openligadb
+from aktipp.scraping.generate_openligadb import (
+    _generate_season_openligadb,
+    generate_many_seasons_openligadb,
+    generate_season_openligadb,
+)
+
+
+def test_generate_season_openligadb(tmp_path):
+    generate_season_openligadb("bl1", 2023, f"{tmp_path}/", n_teams=6, seed=1)
+    with open(tmp_path / "bl1_2023.json") as file:
+        data = json.load(file)
+
+    # double round robin, every team plays every other team home and away
+    assert len(data) == 6 * 5
+    assert {match["group"]["groupOrderID"] for match in data} == set(range(1, 11))
+    assert len({(m["team1"]["teamId"], m["team2"]["teamId"]) for m in data}) == 30
+
+    for match in data:
+        final_result, half_time_result = match["matchResults"]
+        assert match["leagueName"] == "1. Fußball-Bundesliga 2023/2024"
+        assert final_result["resultName"] == "Endergebnis"
+        assert half_time_result["resultName"] == "Halbzeit"
+        assert len(match["goals"]) == (
+            final_result["pointsTeam1"] + final_result["pointsTeam2"]
+        )
+        if match["goals"]:
+            assert match["goals"][-1]["scoreTeam1"] == final_result["pointsTeam1"]
+            assert match["goals"][-1]["scoreTeam2"] == final_result["pointsTeam2"]
+
+    # deterministic for a given seed
+    assert data == _generate_season_openligadb("bl1", 2023, n_teams=6, seed=1)
+
+
+def test_generate_season_openligadb_match_days_played():
+    data = _generate_season_openligadb("bl2", 2023, n_teams=4, match_days_played=2)
+
+    played = [match for match in data if match["matchIsFinished"]]
+    assert len(played) == 4
+    assert all(match["group"]["groupOrderID"] <= 2 for match in played)
+    assert all(
+        match["matchResults"] == [] for match in data if not match["matchIsFinished"]
+    )
+
+
+def test_generate_many_seasons_openligadb_unique_ids(tmp_path):
+    data_path = f"{tmp_path}/"
+    # l17 and l83 share a crc32 bucket, 40 teams play more than 999 matches
+    leagues = ["l17", "l83", "bl1", "bl2"]
+    generate_many_seasons_openligadb(leagues, [2023, 2024], data_path, n_teams=40)
+    normalize_many_seasons_openligadb(
+        leagues, [2023, 2024], data_path, meta="all", record_keys="all"
+    )
+
+    results = pl.read_parquet(data_path + "*_matchResults.parquet")
+    assert len(results) == len(leagues) * 2 * 40 * 39 * 2
+    assert results["resultID"].is_unique().all()
+    assert results.select(pl.col("matchID").n_unique()).item() == len(results) // 2
+    league_seasons = results.select("leagueId", "leagueShortcut", "leagueSeason")
+    assert league_seasons.unique().height == league_seasons["leagueId"].n_unique()
+    assert league_seasons["leagueId"].n_unique() == len(leagues) * 2
+    # match ids fit the UInt32 of the compact dtype profile
+    assert results["matchID"].max() < 2**32
+
+    with pytest.raises(ValueError):
+        generate_many_seasons_openligadb(["bl1", "bl1"], [2023], data_path)
+    with pytest.raises(ValueError):
+        _generate_season_openligadb("bl1", 2023, league_index=-1)
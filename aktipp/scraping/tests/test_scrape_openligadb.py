@@ -0,0 +1,66 @@
+import json
+import os
+import urllib.error
+
+import pytest
+
+from aktipp.scraping import (
+    MirrorOpenligadb,
+    generate_many_seasons_openligadb,
+    scrape_many_seasons_openligadb,
+    scrape_season_openligadb,
+)
+
+
+def test_scrape_many_seasons_openligadb_mirror(tmp_path):
+    raw_path, scraped_path = tmp_path / "raw", tmp_path / "scraped"
+    raw_path.mkdir()
+    scraped_path.mkdir()
+    generate_many_seasons_openligadb(["bl1", "bl2"], [2022, 2023], f"{raw_path}/", 4)
+
+    # any raw data directory can be replayed
+    with MirrorOpenligadb(f"{raw_path}/") as mirror:
+        scrape_many_seasons_openligadb(
+            ["bl1", "bl3"], [2023, 2024], f"{scraped_path}/", mirror.url
+        )
+
+    assert sorted(os.listdir(scraped_path)) == ["bl1_2023.json"]
+    with open(raw_path / "bl1_2023.json") as raw, open(
+        scraped_path / "bl1_2023.json"
+    ) as scraped:
+        assert json.load(raw) == json.load(scraped)
+
+
+def test_mirror_openligadb_record_replay(tmp_path):
+    raw_path, mirror_path = tmp_path / "raw", tmp_path / "mirror"
+    raw_path.mkdir()
+    generate_many_seasons_openligadb(["bl1"], [2022, 2023], f"{raw_path}/", 4)
+
+    # record from an upstream, here another mirror standing in for openligadb
+    with MirrorOpenligadb(f"{raw_path}/") as upstream, MirrorOpenligadb(
+        f"{mirror_path}/", upstream.url
+    ) as mirror:
+        scrape_many_seasons_openligadb(["bl1"], [2023], f"{tmp_path}/", mirror.url)
+    assert sorted(os.listdir(mirror_path)) == [
+        "bl1_2023.json",
+        "getavailableleagues.json",
+    ]
+
+    # replay without the upstream, seasons that were not recorded are missing
+    os.remove(tmp_path / "bl1_2023.json")
+    with MirrorOpenligadb(f"{mirror_path}/") as mirror:
+        scrape_many_seasons_openligadb(["bl1"], [2023], f"{tmp_path}/", mirror.url)
+        with pytest.raises(urllib.error.HTTPError):
+            scrape_season_openligadb("bl1", 2022, f"{tmp_path}/", mirror.url)
+    assert os.path.isfile(tmp_path / "bl1_2023.json")
+
+
+def test_mirror_openligadb_upstream_unreachable(tmp_path):
+    # nothing listens on the port of a closed mirror
+    with MirrorOpenligadb(f"{tmp_path}/upstream/") as upstream:
+        upstream_url = upstream.url
+
+    mirror = MirrorOpenligadb(f"{tmp_path}/mirror/", upstream_url)
+    with mirror, pytest.raises(urllib.error.HTTPError) as error:
+        scrape_season_openligadb("bl1", 2023, f"{tmp_path}/", mirror.url)
+    assert error.value.code == 502
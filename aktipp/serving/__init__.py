@@ -0,0 +1,27 @@
+import importlib
+
+# attributes are imported on first access, see aktipp.__getattr__
+_LAZY_IMPORTS = {
+    "export_snapshot_openligadb": ".snapshot",
+    "load_snapshot_openligadb": ".snapshot",
+    "QueryServiceOpenligadb": ".query_service",
+    "SNAPSHOT_TABLES": ".snapshot",
+}
+
+__all__ = [
+    "export_snapshot_openligadb",
+    "load_snapshot_openligadb",
+    "QueryServiceOpenligadb",
+    "SNAPSHOT_TABLES",
+]
+
+
+def __getattr__(name: str):
+    if name in _LAZY_IMPORTS:
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(__all__)
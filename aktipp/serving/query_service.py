@@ -0,0 +1,365 @@
+import collections
+import io
+import json
+import os
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import polars as pl
+
+# response formats and their content types
+FORMATS = {
+    "json": "application/json; charset=utf-8",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+
+class _Artifact:
+    """A parquet artifact indexed by league_id, match_day and team. The rows are
+    sorted by the index and partitioned by league_id, within a league the rows of
+    a match day range are found by binary search. The artifact is reloaded when
+    the modification time or the size of the file change.
+
+    Parameters
+    ----------
+    path : str
+        Path to the parquet file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.version = 0
+        self._signature = None
+        # partitions per league_id, empty frame with the schema and team column
+        self._index = None
+        self._lock = threading.Lock()
+
+    def _stat(self) -> tuple[int, int]:
+        stat = os.stat(self.path)
+        return stat.st_mtime_ns, stat.st_size
+
+    @property
+    def columns(self) -> list[str]:
+        return self._index[1].columns
+
+    @property
+    def team_column(self) -> str:
+        return self._index[2]
+
+    def refresh(self) -> int:
+        """Reload the artifact if its file changed. While a file is missing or
+        cannot be read, e.g. during a rewrite, the loaded version is kept.
+
+        Returns
+        -------
+        version : int
+            Version of the loaded file, increased with every reload.
+        """
+        try:
+            signature = self._stat()
+        except FileNotFoundError:
+            if self._index is None:
+                raise
+            return self.version
+        if signature == self._signature:
+            return self.version
+        with self._lock:
+            # another thread may have reloaded the file meanwhile
+            if signature != self._signature:
+                try:
+                    self._index = self._load()
+                except (OSError, pl.exceptions.ComputeError):
+                    if self._index is None:
+                        raise
+                    return self.version
+                self._signature = signature
+                self.version += 1
+            return self.version
+
+    def _load(self) -> tuple[dict, pl.DataFrame, str]:
+        data = pl.read_parquet(self.path)
+        team_column = next(
+            (column for column in ["team_id", "team_id_1"] if column in data.columns),
+            None,
+        )
+        columns_missing = [
+            column
+            for column in ["league_id", "match_day"]
+            if column not in data.columns
+        ]
+        if columns_missing or team_column is None:
+            raise ValueError(
+                f"{self.path} needs league_id, match_day and team_id or team_id_1."
+            )
+
+        data = data.sort(["league_id", "match_day", team_column])
+        leagues = data.partition_by(
+            "league_id", as_dict=True, include_key=True, maintain_order=True
+        )
+        return leagues, data.clear(), team_column
+
+    def query(
+        self,
+        league_id: int | None = None,
+        match_day: tuple[int | None, int | None] = (None, None),
+        team_id: int | None = None,
+    ) -> pl.DataFrame:
+        """Rows of the artifact matching the filters.
+
+        Parameters
+        ----------
+        league_id : int | None, default=None
+            League season, None for all.
+        match_day : tuple[int | None, int | None], default=(None, None)
+            First and last match day, None for no bound.
+        team_id : int | None, default=None
+            Team, None for all.
+
+        Returns
+        -------
+        result : pl.DataFrame
+            Matching rows sorted by league_id, match_day and team.
+        """
+        # the index is replaced at once, so concurrent queries see either the old
+        # or the new file
+        leagues, schema, team_column = self._index
+        if league_id is None:
+            partitions = list(leagues.values())
+        else:
+            partitions = [leagues[(league_id,)]] if (league_id,) in leagues else []
+
+        first, last = match_day
+        result = []
+        for partition in partitions:
+            match_days = partition["match_day"]
+            start = 0 if first is None else match_days.search_sorted(first, "left")
+            end = (
+                len(partition)
+                if last is None
+                else match_days.search_sorted(last, "right")
+            )
+            result.append(partition.slice(start, end - start))
+
+        result = pl.concat(result, how="vertical") if result else schema
+        if team_id is not None:
+            result = result.filter(pl.col(team_column) == team_id)
+        return result
+
+
+class _QueryHandler(BaseHTTPRequestHandler):
+    """Serve GET /{artifact}?league_id=&match_day=&team_id=&format=."""
+
+    server: "_QueryServer"
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        name = url.path.strip("/")
+        try:
+            params = dict(urllib.parse.parse_qsl(url.query, strict_parsing=False))
+            status, content_type, body = self.server.service._respond(name, params)
+        except ValueError as error:
+            status, content_type = 400, FORMATS["json"]
+            body = json.dumps({"error": str(error)}).encode()
+        except Exception as error:
+            status, content_type = 500, FORMATS["json"]
+            body = json.dumps({"error": repr(error)}).encode()
+
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _QueryServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, address: tuple[str, int], service: "QueryServiceOpenligadb"):
+        super().__init__(address, _QueryHandler)
+        self.service = service
+
+
+class QueryServiceOpenligadb:
+    """Read-only local HTTP service over the parquet outputs of the pipeline, e.g.
+    standings, performance and features. Every artifact is loaded once and indexed
+    by league_id, match_day and team, so queries slice the loaded tables instead
+    of scanning the files. In openligadb a league_id identifies a league season.
+
+    Artifacts are queried with GET /{name} and the optional parameters
+    - league_id, e.g. league_id=4608
+    - match_day, a single match day or a range, e.g. match_day=10 or match_day=5-10
+    - team_id, matched against team_id or team_id_1 for features
+    - format, "json" (default) for a list of rows or "arrow" for an Arrow IPC stream
+    GET / lists the artifacts and their columns.
+
+    Responses are cached in a LRU cache. Every request compares the modification
+    time and size of the file, changed files are reloaded and their cached
+    responses are dropped. Requests are served concurrently by a thread per
+    connection, polars releases the GIL while it slices and serializes.
+
+    Parameters
+    ----------
+    artifacts : dict[str, str]
+        Names and paths of the parquet files, e.g.
+        {"standings": "data/standings.parquet"}.
+    host : str, default="127.0.0.1"
+        Host the server binds to.
+    port : int, default=0
+        Port the server binds to, 0 for a free port.
+    cache_size : int, default=1024
+        Maximum number of cached responses, 0 to disable caching.
+
+    Examples
+    --------
+    >>> with QueryServiceOpenligadb({"standings": "standings.parquet"}) as service:
+    ...     urllib.request.urlopen(f"{service.url}/standings?league_id=4608")
+    """
+
+    def __init__(
+        self,
+        artifacts: dict[str, str],
+        host: str = "127.0.0.1",
+        port: int = 0,
+        cache_size: int = 1024,
+    ):
+        if cache_size < 0:
+            raise ValueError("cache_size must be non-negative.")
+        self.artifacts = {name: _Artifact(path) for name, path in artifacts.items()}
+        self.host = host
+        self.port = port
+        self.cache_size = cache_size
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._cache = collections.OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._server = None
+
+    @property
+    def url(self) -> str:
+        """Base url of the running service."""
+        if self._server is None:
+            raise ValueError("The service is not running, call start first.")
+        return f"http://{self.host}:{self._server.server_port}"
+
+    def start(self) -> "QueryServiceOpenligadb":
+        """Load all artifacts and start serving in a background thread."""
+        for artifact in self.artifacts.values():
+            artifact.refresh()
+        self._server = _QueryServer((self.host, self.port), self)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "QueryServiceOpenligadb":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _respond(self, name: str, params: dict[str, str]) -> tuple[int, str, bytes]:
+        """Status, content type and body of a request."""
+        if name == "":
+            body = {
+                name: {
+                    "columns": artifact.columns,
+                    "team_column": artifact.team_column,
+                }
+                for name, artifact in self.artifacts.items()
+            }
+            return 200, FORMATS["json"], json.dumps(body).encode()
+        if name not in self.artifacts:
+            body = {"error": f"{name} is not in {list(self.artifacts)}"}
+            return 404, FORMATS["json"], json.dumps(body).encode()
+
+        query = _parse_query(params)
+        artifact = self.artifacts[name]
+        key = (name, artifact.refresh(), *query)
+        body = self._cache_get(key)
+        if body is None:
+            *filters, response_format = query
+            body = _serialize(artifact.query(*filters), response_format)
+            self._cache_put(key, body)
+        return 200, FORMATS[query[-1]], body
+
+    def _cache_get(self, key: tuple) -> bytes | None:
+        with self._cache_lock:
+            body = self._cache.get(key)
+            if body is None:
+                self.cache_misses += 1
+            else:
+                self.cache_hits += 1
+                self._cache.move_to_end(key)
+            return body
+
+    def _cache_put(self, key: tuple, body: bytes) -> None:
+        if self.cache_size == 0:
+            return
+        name, version = key[:2]
+        with self._cache_lock:
+            # responses of older versions of the artifact will never be hit again
+            for stale in [k for k in self._cache if k[0] == name and k[1] < version]:
+                del self._cache[stale]
+            self._cache[key] = body
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+
+def _parse_int(params: dict[str, str], name: str) -> int | None:
+    if name not in params:
+        return None
+    try:
+        return int(params[name])
+    except ValueError:
+        raise ValueError(f"{name} must be an integer.") from None
+
+
+def _parse_query(params: dict[str, str]) -> tuple:
+    """Validate the query parameters into league_id, match day range, team_id and
+    format."""
+    unknown = [
+        param
+        for param in params
+        if param not in ["league_id", "match_day", "team_id", "format"]
+    ]
+    if unknown:
+        raise ValueError(f"{unknown} are not valid query parameters.")
+
+    match_day = params.get("match_day")
+    if match_day is None:
+        match_days = (None, None)
+    else:
+        first, _, last = match_day.partition("-")
+        try:
+            match_days = (int(first), int(last or first))
+        except ValueError:
+            raise ValueError("match_day must be an integer or a range.") from None
+
+    response_format = params.get("format", "json")
+    if response_format not in FORMATS:
+        raise ValueError(f"format must be in {list(FORMATS)}")
+
+    return (
+        _parse_int(params, "league_id"),
+        match_days,
+        _parse_int(params, "team_id"),
+        response_format,
+    )
+
+
+def _serialize(data: pl.DataFrame, response_format: str) -> bytes:
+    if response_format == "arrow":
+        buffer = io.BytesIO()
+        data.write_ipc_stream(buffer)
+        return buffer.getvalue()
+    return data.write_json().encode()
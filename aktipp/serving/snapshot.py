@@ -0,0 +1,141 @@
+import os
+from importlib import resources
+
+import polars as pl
+
+from ..etl import mapper
+from ..tracing import trace_stage
+
+# tables of a snapshot, each one stored as 'name.arrow'
+SNAPSHOT_TABLES = ["matches", "standings", "performance", "teams", "leagues"]
+
+
+def _write_table(data: pl.DataFrame, path: str) -> None:
+    """Write a table as a single uncompressed record batch, which can be memory
+    mapped without copies. The file is replaced atomically, processes which still
+    map the previous file keep reading it until they reload.
+
+    Parameters
+    ----------
+    data : pl.DataFrame
+        Table to be written.
+    path : str
+        Path of the Arrow IPC file.
+    """
+    # string views of the newest Arrow format cannot be memory mapped by polars,
+    # large strings can and are readable by every Arrow implementation
+    data.rechunk().write_ipc(
+        f"{path}.tmp", compression="uncompressed", compat_level=pl.CompatLevel.oldest()
+    )
+    os.replace(f"{path}.tmp", path)
+
+
+def _teams_dimension(matches: pl.DataFrame) -> pl.DataFrame:
+    """One row per unique team with its name in team_mapper.csv. The ids have the
+    dtype of the team ids of the clean match results, so they can be joined."""
+    team_mapper = pl.read_csv(resources.files(mapper) / "team_mapper.csv")
+    return (
+        team_mapper.group_by("team_id_unique", maintain_order=True)
+        .agg(
+            # prefer the name of the raw id that is the unique id itself
+            pl.col("team_name")
+            .sort_by(pl.col("team_id_raw") != pl.col("team_id_unique"))
+            .first()
+        )
+        .select(
+            pl.col("team_id_unique").cast(matches["team_id_1"].dtype).alias("team_id"),
+            pl.col("team_name"),
+        )
+        .sort("team_id")
+    )
+
+
+def _leagues_dimension(matches: pl.DataFrame) -> pl.DataFrame:
+    """One row per league season of the clean match results. The league names are
+    already resolved by league_mapper.csv, which has no ids on its own."""
+    return (
+        matches.select("league_id", "league_name", "season_name")
+        .unique("league_id", keep="first", maintain_order=True)
+        .sort("league_id")
+    )
+
+
+def export_snapshot_openligadb(
+    snapshot_path: str,
+    match_results_data_path: str,
+    standings_data_path: str,
+    performance_data_path: str,
+) -> None:
+    """Export the clean match results, standings and performance plus the team and
+    league dimensions as a snapshot of uncompressed Arrow IPC files, one file per
+    table named like 'standings.arrow'. Workers load the snapshot with
+    load_snapshot_openligadb, which memory maps the files instead of decoding
+    parquet, so the tables are shared read-only in the page cache of all processes.
+
+    Parameters
+    ----------
+    snapshot_path : str
+        Directory of the snapshot, created if it does not exist.
+    match_results_data_path : str
+        Path to the clean match results parquet files.
+    standings_data_path : str
+        Path to the standings parquet file, e.g. from create_standings_openligadb.
+    performance_data_path : str
+        Path to the performance parquet file, e.g. from
+        create_performance_openligadb.
+    """
+
+    with trace_stage("export_snapshot_openligadb") as stage:
+        os.makedirs(snapshot_path, exist_ok=True)
+        matches = pl.read_parquet(match_results_data_path)
+        tables = {
+            "matches": matches,
+            "standings": pl.read_parquet(standings_data_path),
+            "performance": pl.read_parquet(performance_data_path),
+            "teams": _teams_dimension(matches),
+            "leagues": _leagues_dimension(matches),
+        }
+        for name, data in tables.items():
+            path = os.path.join(snapshot_path, f"{name}.arrow")
+            stage.add_rows_out(len(data))
+            _write_table(data, path)
+            stage.add_output(path)
+
+
+def load_snapshot_openligadb(
+    snapshot_path: str,
+    tables: list[str] | None = None,
+    memory_map: bool = True,
+) -> dict[str, pl.DataFrame]:
+    """Load the tables of a snapshot written by export_snapshot_openligadb.
+
+    Parameters
+    ----------
+    snapshot_path : str
+        Directory of the snapshot.
+    tables : list[str] | None, default=None
+        Tables to be loaded, a subset of SNAPSHOT_TABLES. None for all tables.
+    memory_map : bool, default=True
+        Memory map the files, so the tables are backed by the page cache and shared
+        between processes instead of being copied into every process.
+
+    Returns
+    -------
+    snapshot : dict[str, pl.DataFrame]
+        Tables by name.
+    """
+    if tables is None:
+        tables = SNAPSHOT_TABLES
+    tables_invalid = [table for table in tables if table not in SNAPSHOT_TABLES]
+    if tables_invalid:
+        raise ValueError(f"{tables_invalid} are not in {SNAPSHOT_TABLES}")
+
+    # rechunking would copy the mapped buffers, the tables are single chunks anyway
+    return {
+        table: pl.read_ipc(
+            os.path.join(snapshot_path, f"{table}.arrow"),
+            memory_map=memory_map,
+            rechunk=False,
+        )
+        for table in tables
+    }
@@ -0,0 +1,135 @@
+import io
+import json
+import os
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+
+from aktipp.etl import (
+    FeatureBuilderOpenligadb,
+    clean_openligadb,
+    create_performance_openligadb,
+    create_standings_openligadb,
+)
+from aktipp.normalize import normalize_many_seasons_openligadb
+from aktipp.scraping import generate_many_seasons_openligadb
+from aktipp.serving import QueryServiceOpenligadb
+
+
+@pytest.fixture
+def artifacts(tmp_path):
+    data_path = f"{tmp_path}/"
+    generate_many_seasons_openligadb(["bl1", "bl2"], [2022, 2023], data_path, 6)
+    normalize_many_seasons_openligadb(["bl1", "bl2"], [2022, 2023], data_path)
+    clean_openligadb(data_path, "matchResults")
+    match_results_path = data_path + "matchResults_clean.parquet"
+    create_standings_openligadb(match_results_path, data_path + "standings.parquet")
+    create_performance_openligadb(match_results_path, data_path + "performance.parquet")
+    FeatureBuilderOpenligadb().get_features(
+        match_results_path,
+        "",
+        {"overall_standings": data_path + "standings.parquet"},
+    ).collect().write_parquet(data_path + "features.parquet")
+    return {
+        name: data_path + f"{name}.parquet"
+        for name in ["standings", "performance", "features"]
+    }
+
+
+def _get(url: str) -> bytes:
+    with urllib.request.urlopen(url) as response:
+        return response.read()
+
+
+def test_query_service(artifacts):
+    standings = pl.read_parquet(artifacts["standings"])
+    features = pl.read_parquet(artifacts["features"])
+    league_id = standings["league_id"].max()
+    team_id = standings.filter(pl.col("league_id") == league_id)["team_id"][0]
+
+    with QueryServiceOpenligadb(artifacts) as service:
+        assert sorted(json.loads(_get(f"{service.url}/"))) == [
+            "features",
+            "performance",
+            "standings",
+        ]
+
+        rows = json.loads(
+            _get(f"{service.url}/standings?league_id={league_id}&match_day=3-5")
+        )
+        expected = standings.filter(
+            (pl.col("league_id") == league_id) & pl.col("match_day").is_between(3, 5)
+        ).sort(["match_day", "team_id"])
+        assert rows == expected.to_dicts()
+
+        # features are indexed by team_id_1, arrow keeps the dtypes
+        result = pl.read_ipc_stream(
+            io.BytesIO(_get(f"{service.url}/features?team_id={team_id}&format=arrow"))
+        )
+        assert_frame_equal(
+            result,
+            features.filter(pl.col("team_id_1") == team_id).sort(
+                ["league_id", "match_day", "team_id_1"]
+            ),
+        )
+
+        # the second request is served from the cache
+        _get(f"{service.url}/performance?league_id={league_id}")
+        _get(f"{service.url}/performance?league_id={league_id}")
+        assert service.cache_hits == 1
+
+        for query in ["standings?league_id=x", "standings?season=1", "missing"]:
+            with pytest.raises(urllib.error.HTTPError) as error:
+                _get(f"{service.url}/{query}")
+            assert error.value.code == (404 if query == "missing" else 400)
+
+
+def test_query_service_invalidation(artifacts):
+    standings = pl.read_parquet(artifacts["standings"])
+    league_id = standings["league_id"].max()
+    url_path = f"/standings?league_id={league_id}&match_day=1"
+
+    with QueryServiceOpenligadb(artifacts, cache_size=4) as service:
+        assert len(json.loads(_get(service.url + url_path))) == 6
+
+        # an atomic rewrite of the file drops the cached responses
+        standings.filter(pl.col("league_id") != league_id).write_parquet(
+            artifacts["standings"] + ".tmp"
+        )
+        os.replace(artifacts["standings"] + ".tmp", artifacts["standings"])
+        assert json.loads(_get(service.url + url_path)) == []
+        assert service.cache_hits == 0
+
+
+def test_query_service_concurrent(artifacts):
+    performance = pl.read_parquet(artifacts["performance"])
+    queries = [
+        (league_id, match_day)
+        for league_id in performance["league_id"].unique()
+        for match_day in range(1, 11)
+    ]
+
+    with QueryServiceOpenligadb(artifacts, cache_size=8) as service:
+
+        def query(league_id_match_day):
+            league_id, match_day = league_id_match_day
+            return json.loads(
+                _get(
+                    f"{service.url}/performance"
+                    f"?league_id={league_id}&match_day={match_day}"
+                )
+            )
+
+        with ThreadPoolExecutor(16) as executor:
+            results = list(executor.map(query, queries * 5))
+
+    for (league_id, match_day), rows in zip(queries * 5, results):
+        expected = performance.filter(
+            (pl.col("league_id") == league_id) & (pl.col("match_day") == match_day)
+        ).sort("team_id")
+        # float32 values are written with their shortest representation
+        assert_frame_equal(pl.DataFrame(rows, schema=expected.schema), expected)
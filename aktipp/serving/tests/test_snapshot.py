@@ -0,0 +1,60 @@
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+
+from aktipp.etl import (
+    clean_openligadb,
+    create_performance_openligadb,
+    create_standings_openligadb,
+)
+from aktipp.normalize import normalize_many_seasons_openligadb
+from aktipp.scraping import generate_many_seasons_openligadb
+from aktipp.serving import (
+    SNAPSHOT_TABLES,
+    export_snapshot_openligadb,
+    load_snapshot_openligadb,
+)
+
+
+def test_snapshot(tmp_path):
+    data_path = f"{tmp_path}/"
+    generate_many_seasons_openligadb(["bl1", "bl2"], [2022, 2023], data_path, 4)
+    normalize_many_seasons_openligadb(["bl1", "bl2"], [2022, 2023], data_path)
+    clean_openligadb(data_path, "matchResults")
+    paths = [
+        data_path + f"{name}.parquet"
+        for name in ["matchResults_clean", "standings", "performance"]
+    ]
+    create_standings_openligadb(paths[0], paths[1])
+    create_performance_openligadb(paths[0], paths[2])
+    export_snapshot_openligadb(data_path + "snapshot", *paths)
+
+    snapshot = load_snapshot_openligadb(data_path + "snapshot")
+    assert list(snapshot) == SNAPSHOT_TABLES
+    for name, path in zip(["matches", "standings", "performance"], paths):
+        assert_frame_equal(snapshot[name], pl.read_parquet(path))
+        assert snapshot[name].n_chunks() == 1
+
+    # every team and league season of the matches is in the dimensions
+    matches = snapshot["matches"]
+    assert (
+        matches.join(snapshot["teams"], left_on="team_id_1", right_on="team_id")[
+            "team_name"
+        ]
+        == matches["team_name_1"]
+    ).all()
+    assert sorted(snapshot["leagues"]["league_id"]) == sorted(
+        matches["league_id"].unique()
+    )
+
+    # a new export replaces the files, tables mapped before stay readable
+    export_snapshot_openligadb(data_path + "snapshot", *paths)
+    assert_frame_equal(
+        snapshot["standings"],
+        load_snapshot_openligadb(
+            data_path + "snapshot", ["standings"], memory_map=False
+        )["standings"],
+    )
+
+    with pytest.raises(ValueError):
+        load_snapshot_openligadb(data_path + "snapshot", ["goals"])
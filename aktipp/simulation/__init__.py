@@ -0,0 +1,25 @@
+import importlib
+
+# attributes are imported on first access, see aktipp.__getattr__
+_LAZY_IMPORTS = {
+    "current_standings_openligadb": ".season",
+    "remaining_fixtures_openligadb": ".season",
+    "simulate_season": ".season",
+}
+
+__all__ = [
+    "current_standings_openligadb",
+    "remaining_fixtures_openligadb",
+    "simulate_season",
+]
+
+
+def __getattr__(name: str):
+    if name in _LAZY_IMPORTS:
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(__all__)
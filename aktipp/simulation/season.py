@@ -0,0 +1,271 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import polars as pl
+
+# bit layout of the ranking key, goals_scored and goals_diff get 20 bits each
+_GOALS_BITS = 20
+_GOALS_DIFF_OFFSET = 1 << (_GOALS_BITS - 1)
+
+
+def _simulate_chunk(
+    seed: np.random.SeedSequence,
+    n_simulations: int,
+    team_1: np.ndarray,
+    team_2: np.ndarray,
+    rates: np.ndarray,
+    points: np.ndarray,
+    goals_diff: np.ndarray,
+    goals_scored: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Simulate the remaining matches of a season n_simulations times.
+
+    Parameters
+    ----------
+    seed : np.random.SeedSequence
+        Seed of the chunk.
+    n_simulations : int
+        Number of simulated seasons.
+    team_1, team_2 : np.ndarray
+        Index of the home and the away team of every remaining match.
+    rates : np.ndarray
+        Expected goals of shape (n_matches, 2).
+    points, goals_diff, goals_scored : np.ndarray
+        Current standings of every team.
+
+    Returns
+    -------
+    counts : tuple[np.ndarray, np.ndarray]
+        Number of simulations with team i at position j, shape (n_teams, n_teams),
+        and the sum of the final points of every team.
+    """
+    rng = np.random.default_rng(seed)
+    n_teams, n_matches = len(points), len(team_1)
+
+    goals = rng.poisson(rates, size=(n_simulations, n_matches, 2))
+    goals_1, goals_2 = goals[..., 0], goals[..., 1]
+    goals_diff_1 = goals_1 - goals_2
+    points_1 = 3 * (goals_diff_1 > 0) + (goals_diff_1 == 0)
+    points_2 = 3 * (goals_diff_1 < 0) + (goals_diff_1 == 0)
+
+    # scatter-add the matches into a (simulation, team) table as a product with the
+    # (match, team) incidence matrices, sums of small integers are exact in float32
+    home = np.zeros((n_matches, n_teams), dtype=np.float32)
+    home[np.arange(n_matches), team_1] = 1
+    away = np.zeros((n_matches, n_teams), dtype=np.float32)
+    away[np.arange(n_matches), team_2] = 1
+    incidence = np.concatenate([home, away])
+
+    def scatter_add(values: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+        return np.rint(values.astype(np.float32) @ matrix).astype(np.int64)
+
+    final_points = points + scatter_add(
+        np.concatenate([points_1, points_2], axis=1), incidence
+    )
+    final_goals_diff = goals_diff + scatter_add(goals_diff_1, home - away)
+    final_goals_scored = goals_scored + scatter_add(
+        np.concatenate([goals_1, goals_2], axis=1), incidence
+    )
+
+    # rank by points, goals_diff and goals_scored like the standings, ties share
+    # the best position (method="min")
+    key = (
+        (final_points << (2 * _GOALS_BITS))
+        | ((final_goals_diff + _GOALS_DIFF_OFFSET) << _GOALS_BITS)
+        | final_goals_scored
+    )
+    position = (key[:, np.newaxis, :] > key[:, :, np.newaxis]).sum(axis=2)
+
+    position_counts = np.bincount(
+        (np.arange(n_teams) * n_teams + position).ravel(), minlength=n_teams**2
+    ).reshape(n_teams, n_teams)
+    return position_counts, final_points.sum(axis=0)
+
+
+def simulate_season(
+    standings: pl.DataFrame,
+    fixtures: pl.DataFrame,
+    n_simulations: int = 100_000,
+    seed: int = 0,
+    n_jobs: int = 1,
+    chunk_size: int = 10_000,
+    relegation_places: int = 2,
+) -> pl.DataFrame:
+    """Monte Carlo simulation of the rest of a season. The goals of every remaining
+    match are drawn from independent poisson distributions and the final standings
+    are ranked like in create_standings_openligadb.
+
+    Parameters
+    ----------
+    standings : pl.DataFrame
+        Current standings with the columns team_id, points, goals_diff and
+        goals_scored, e.g. from current_standings_openligadb.
+    fixtures : pl.DataFrame
+        Remaining matches with the columns team_id_1, team_id_2,
+        expected_goals_team_1 and expected_goals_team_2, e.g. from
+        remaining_fixtures_openligadb with the predictions of a goal model.
+    n_simulations : int, default=100_000
+        Number of simulated seasons.
+    seed : int, default=0
+        Seed for the random number generator. Results do not depend on n_jobs.
+    n_jobs : int, default=1
+        Number of worker processes the chunks are distributed over.
+    chunk_size : int, default=10_000
+        Number of seasons simulated at once, limits the memory per process.
+    relegation_places : int, default=2
+        Number of positions at the bottom counted as relegation.
+
+    Returns
+    -------
+    probabilities : pl.DataFrame
+        One row per team with the expected points, the probability of the title,
+        of relegation and of every position in the columns position_1 to
+        position_n.
+    """
+    missing = [
+        column
+        for column in [
+            "team_id_1",
+            "team_id_2",
+            "expected_goals_team_1",
+            "expected_goals_team_2",
+        ]
+        if column not in fixtures.columns
+    ]
+    if missing:
+        raise ValueError(f"{missing} are not in fixtures.")
+    if n_simulations < 1 or chunk_size < 1:
+        raise ValueError("n_simulations and chunk_size must be positive.")
+
+    # teams without a standings row, e.g. before the first match day, start at 0
+    team_ids = np.unique(
+        np.concatenate(
+            [
+                standings["team_id"].to_numpy(),
+                fixtures["team_id_1"].to_numpy(),
+                fixtures["team_id_2"].to_numpy(),
+            ]
+        )
+    )
+    current = (
+        pl.DataFrame({"team_id": team_ids})
+        .cast({"team_id": standings["team_id"].dtype})
+        .join(standings, on="team_id", how="left")
+        .fill_null(0)
+    )
+    points = current["points"].to_numpy().astype(np.int64)
+    goals_diff = current["goals_diff"].to_numpy().astype(np.int64)
+    goals_scored = current["goals_scored"].to_numpy().astype(np.int64)
+
+    team_1 = np.searchsorted(team_ids, fixtures["team_id_1"].to_numpy())
+    team_2 = np.searchsorted(team_ids, fixtures["team_id_2"].to_numpy())
+    rates = fixtures.select("expected_goals_team_1", "expected_goals_team_2").to_numpy()
+    if np.any(rates < 0) or np.any(np.isnan(rates)):
+        raise ValueError("Expected goals must be non-negative.")
+
+    chunks = [chunk_size] * (n_simulations // chunk_size)
+    if n_simulations % chunk_size:
+        chunks.append(n_simulations % chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(chunks))
+    arguments = (team_1, team_2, rates, points, goals_diff, goals_scored)
+
+    if n_jobs == 1:
+        results = [
+            _simulate_chunk(chunk_seed, size, *arguments)
+            for chunk_seed, size in zip(seeds, chunks, strict=True)
+        ]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=n_jobs, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            results = list(
+                executor.map(
+                    _simulate_chunk,
+                    seeds,
+                    chunks,
+                    *[[argument] * len(chunks) for argument in arguments],
+                )
+            )
+
+    position_counts = sum(result[0] for result in results)
+    points_sum = sum(result[1] for result in results)
+    n_teams = len(team_ids)
+    position_probabilities = position_counts / n_simulations
+
+    return pl.DataFrame(
+        {
+            "team_id": current["team_id"],
+            "expected_points": points_sum / n_simulations,
+            "title": position_probabilities[:, 0],
+            "relegation": position_probabilities[:, n_teams - relegation_places :].sum(
+                axis=1
+            ),
+            **{
+                f"position_{position + 1}": position_probabilities[:, position]
+                for position in range(n_teams)
+            },
+        }
+    ).sort("expected_points", descending=True)
+
+
+def current_standings_openligadb(
+    standings_data_path: str, league_id: int
+) -> pl.DataFrame:
+    """Latest standings of every team of a league season.
+
+    Parameters
+    ----------
+    standings_data_path : str
+        Path to the standings parquet file of create_standings_openligadb.
+    league_id : int
+        Id of the league season.
+
+    Returns
+    -------
+    standings : pl.DataFrame
+        One row per team with team_id, points, goals_diff and goals_scored.
+    """
+    return (
+        pl.scan_parquet(standings_data_path)
+        .filter(pl.col("league_id") == league_id)
+        .filter(pl.col("match_day") == pl.col("match_day").max().over("team_id"))
+        .select("team_id", "points", "goals_diff", "goals_scored")
+        .collect()
+    )
+
+
+def remaining_fixtures_openligadb(
+    match_results_data_path: str, league_id: int
+) -> pl.DataFrame:
+    """Matches of a league season without a final result.
+
+    Parameters
+    ----------
+    match_results_data_path : str
+        Path to the clean match results parquet files.
+    league_id : int
+        Id of the league season.
+
+    Returns
+    -------
+    fixtures : pl.DataFrame
+        One row per remaining match with match_id, match_day, team_id_1 and
+        team_id_2.
+    """
+    match_results = pl.scan_parquet(match_results_data_path)
+    finished = match_results.filter(
+        (pl.col("league_id") == league_id)
+        & (pl.col("result_name") == "Endergebnis")
+        & (pl.col("result_class").is_not_null())
+    ).select("match_id")
+    return (
+        match_results.filter(
+            (pl.col("league_id") == league_id)
+            & (~pl.col("match_day_name").str.to_lowercase().str.contains("relegation"))
+        )
+        .join(finished, on="match_id", how="anti")
+        .select("match_id", "match_day", "team_id_1", "team_id_2")
+        .unique("match_id", maintain_order=True)
+        .collect()
+    )
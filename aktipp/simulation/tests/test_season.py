@@ -0,0 +1,116 @@
+import numpy as np
+import polars as pl
+import pytest
+
+from aktipp.etl import clean_openligadb, create_standings_openligadb
+from aktipp.normalize import normalize_many_seasons_openligadb
+from aktipp.scraping import generate_season_openligadb
+from aktipp.simulation import (
+    current_standings_openligadb,
+    remaining_fixtures_openligadb,
+    simulate_season,
+)
+
+STANDINGS = pl.DataFrame(
+    {
+        "team_id": [10, 20, 30, 40],
+        "points": [9, 9, 4, 1],
+        "goals_diff": [3, 3, -2, -4],
+        "goals_scored": [7, 5, 4, 2],
+    }
+)
+FIXTURES = pl.DataFrame(
+    {
+        "team_id_1": [10, 30, 20, 40],
+        "team_id_2": [20, 40, 30, 10],
+        "expected_goals_team_1": [1.6, 1.2, 1.8, 0.9],
+        "expected_goals_team_2": [1.1, 1.0, 0.8, 1.5],
+    }
+)
+
+
+def test_simulate_season_ranking():
+    # without goals every match is a draw, so the final standings are known
+    fixtures = FIXTURES.with_columns(
+        pl.lit(0.0).alias("expected_goals_team_1"),
+        pl.lit(0.0).alias("expected_goals_team_2"),
+    )
+    probabilities = simulate_season(STANDINGS, fixtures, n_simulations=100)
+    final = (
+        STANDINGS.with_columns(pl.col("points") + 2)
+        .with_columns(
+            pl.struct(["points", "goals_diff", "goals_scored"])
+            .rank(descending=True, method="min")
+            .alias("rank")
+        )
+        .join(probabilities, on="team_id")
+    )
+    for row in final.iter_rows(named=True):
+        assert row[f"position_{row['rank']}"] == 1.0
+        assert row["expected_points"] == row["points"]
+    assert final.filter(pl.col("team_id") == 10)["title"].item() == 1.0
+    assert final.filter(pl.col("team_id") == 40)["relegation"].item() == 1.0
+
+
+def test_simulate_season_probabilities():
+    kwargs = {"n_simulations": 20_000, "seed": 1, "chunk_size": 3_000}
+    probabilities = simulate_season(STANDINGS, FIXTURES, **kwargs)
+    positions = probabilities.select(pl.col("^position_.*$")).to_numpy()
+    assert np.allclose(positions.sum(axis=1), 1.0)
+    assert probabilities.equals(simulate_season(STANDINGS, FIXTURES, **kwargs))
+    assert probabilities.equals(
+        simulate_season(STANDINGS, FIXTURES, n_jobs=2, **kwargs)
+    )
+
+    # expected points against the exact poisson result probabilities
+    goals = np.arange(30)
+    log_factorial = np.cumsum(np.log(np.maximum(goals, 1)))
+    expected_points = dict(zip(STANDINGS["team_id"], STANDINGS["points"], strict=True))
+    for row in FIXTURES.iter_rows(named=True):
+        p_1, p_2 = (
+            np.exp(goals * np.log(rate) - rate - log_factorial)
+            for rate in [row["expected_goals_team_1"], row["expected_goals_team_2"]]
+        )
+        p = np.outer(p_1, p_2)
+        win, draw, loss = np.tril(p, -1).sum(), np.trace(p), np.triu(p, 1).sum()
+        expected_points[row["team_id_1"]] += 3 * win + draw
+        expected_points[row["team_id_2"]] += 3 * loss + draw
+    for row in probabilities.iter_rows(named=True):
+        assert row["expected_points"] == pytest.approx(
+            expected_points[row["team_id"]], abs=0.05
+        )
+
+    with pytest.raises(ValueError):
+        simulate_season(STANDINGS, FIXTURES.drop("expected_goals_team_2"))
+
+
+def test_simulate_season_openligadb(tmp_path):
+    data_path = f"{tmp_path}/"
+    generate_season_openligadb("bl1", 2023, data_path, n_teams=6, match_days_played=7)
+    normalize_many_seasons_openligadb(["bl1"], [2023], data_path)
+    clean_openligadb(data_path, "matchResults")
+    create_standings_openligadb(
+        data_path + "matchResults_clean.parquet", data_path + "standings.parquet"
+    )
+    league_id = pl.read_parquet(data_path + "matchResults_clean.parquet")["league_id"][
+        0
+    ]
+
+    standings = current_standings_openligadb(data_path + "standings.parquet", league_id)
+    fixtures = remaining_fixtures_openligadb(
+        data_path + "matchResults_clean.parquet", league_id
+    )
+    assert len(standings) == 6
+    assert len(fixtures) == 3 * 3
+    assert fixtures["match_day"].min() == 8
+
+    probabilities = simulate_season(
+        standings,
+        fixtures.with_columns(
+            pl.lit(1.5).alias("expected_goals_team_1"),
+            pl.lit(1.2).alias("expected_goals_team_2"),
+        ),
+        n_simulations=1_000,
+    )
+    assert probabilities["title"].sum() >= 1.0
+    assert len(probabilities) == 6
@@ -0,0 +1,37 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+
+def _loaded_modules(statement: str) -> list[str]:
+    """Run a statement in a fresh interpreter and return the heavy modules loaded."""
+    script = (
+        f"import json, sys\n{statement}\n"
+        "print(json.dumps([name for name in ['numpy', 'polars', 'sklearn'] "
+        "if name in sys.modules]))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, check=True, text=True
+    ).stdout
+    return json.loads(output)
+
+
+@pytest.mark.parametrize(
+    "module", ["aktipp", "aktipp.scraping", "aktipp.normalize", "aktipp.etl"]
+)
+def test_import_is_lazy(module):
+    assert _loaded_modules(f"import {module}") == []
+
+
+def test_attribute_access_imports():
+    assert "polars" in _loaded_modules("import aktipp\naktipp.etl.clean_openligadb")
+    assert "sklearn" not in _loaded_modules("import aktipp.eval")
+
+    import aktipp
+
+    assert callable(aktipp.eval.walk_forward_backtest)
+    assert "clean_openligadb" in dir(aktipp.etl)
+    with pytest.raises(AttributeError):
+        aktipp.etl.does_not_exist
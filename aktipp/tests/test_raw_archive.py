@@ -0,0 +1,62 @@
+import json
+import os
+import urllib.request
+
+import polars as pl
+import pytest
+
+from aktipp._raw_archive import RAW_COMPRESSIONS, _read_raw_season
+from aktipp.normalize import normalize_many_seasons_openligadb
+from aktipp.scraping import MirrorOpenligadb, generate_season_openligadb
+
+
+@pytest.mark.parametrize("compression", ["gzip", "zstd"])
+def test_raw_archive_compression(tmp_path, compression):
+    plain_path, compressed_path = tmp_path / "plain", tmp_path / "compressed"
+    plain_path.mkdir()
+    compressed_path.mkdir()
+    generate_season_openligadb("bl1", 2023, f"{plain_path}/", n_teams=6)
+    generate_season_openligadb(
+        "bl1", 2023, f"{compressed_path}/", n_teams=6, compression=compression
+    )
+
+    file_name = f"bl1_2023{RAW_COMPRESSIONS[compression]}"
+    assert os.listdir(compressed_path) == [file_name]
+    assert (
+        os.path.getsize(compressed_path / file_name)
+        < os.path.getsize(plain_path / "bl1_2023.json") / 5
+    )
+    data = _read_raw_season(str(compressed_path / file_name))
+    assert data == _read_raw_season(str(plain_path / "bl1_2023.json"))
+
+    # normalization finds and decompresses the compressed season
+    for data_path in [plain_path, compressed_path]:
+        normalize_many_seasons_openligadb(["bl1"], [2023], f"{data_path}/")
+    assert pl.read_parquet(compressed_path / "bl1_2023_matchResults.parquet").equals(
+        pl.read_parquet(plain_path / "bl1_2023_matchResults.parquet")
+    )
+
+    # the mirror serves the decompressed json
+    with MirrorOpenligadb(f"{compressed_path}/") as mirror:
+        contents = urllib.request.urlopen(f"{mirror.url}/getmatchdata/bl1/2023").read()
+    assert json.loads(contents) == data
+
+
+def test_raw_archive_recompression(tmp_path):
+    data_path = f"{tmp_path}/"
+    generate_season_openligadb("bl1", 2023, data_path, n_teams=6, match_days_played=2)
+
+    # switching an archive to compression replaces the outdated plain json
+    generate_season_openligadb("bl1", 2023, data_path, n_teams=6, compression="zstd")
+    assert os.listdir(tmp_path) == ["bl1_2023.json.zst"]
+    generate_season_openligadb("bl1", 2023, data_path, n_teams=6, compression="gzip")
+    assert os.listdir(tmp_path) == ["bl1_2023.json.gz"]
+
+    normalize_many_seasons_openligadb(["bl1"], [2023], data_path)
+    normalized = pl.read_parquet(data_path + "bl1_2023_matchResults.parquet")
+    assert normalized["pointsTeam1"].null_count() == 0
+
+
+def test_raw_archive_invalid_compression(tmp_path):
+    with pytest.raises(ValueError):
+        generate_season_openligadb("bl1", 2023, f"{tmp_path}/", compression="bz2")
@@ -0,0 +1,78 @@
+import polars as pl
+import pyarrow.parquet as pq
+import pytest
+from polars.testing import assert_frame_equal
+
+from aktipp._storage import STORAGE_PROFILES, _write_parquet
+from aktipp.etl import clean_openligadb, create_standings_openligadb
+from aktipp.normalize import normalize_many_seasons_openligadb
+from aktipp.scraping import generate_many_seasons_openligadb
+
+
+@pytest.mark.parametrize("storage_profile", ["hot", "archive"])
+def test_storage_profiles(tmp_path, storage_profile):
+    data_path = f"{tmp_path}/"
+    generate_many_seasons_openligadb(["bl1", "bl2"], [2022, 2023], data_path, 6)
+    normalize_many_seasons_openligadb(["bl1", "bl2"], [2022, 2023], data_path)
+    clean_openligadb(data_path, "matchResults")
+    create_standings_openligadb(
+        data_path + "matchResults_clean.parquet", data_path + "standings.parquet"
+    )
+    clean_openligadb(data_path, "matchResults", storage_profile=storage_profile)
+    create_standings_openligadb(
+        data_path + "matchResults_clean.parquet",
+        data_path + "standings_profile.parquet",
+        storage_profile=storage_profile,
+    )
+
+    # same rows in the sort order of the artifact
+    sort = ["league_id", "match_day", "team_id"]
+    standings = pl.read_parquet(data_path + "standings_profile.parquet")
+    assert_frame_equal(standings, standings.sort(sort))
+    assert_frame_equal(
+        standings, pl.read_parquet(data_path + "standings.parquet").sort(sort)
+    )
+
+    metadata = pq.ParquetFile(data_path + "standings_profile.parquet").metadata
+    column = metadata.row_group(0).column(0)
+    assert (
+        column.compression == STORAGE_PROFILES[storage_profile]["compression"].upper()
+    )
+    assert column.statistics.has_min_max
+
+    with pytest.raises(ValueError):
+        create_standings_openligadb(
+            data_path + "matchResults_clean.parquet",
+            data_path + "standings.parquet",
+            storage_profile="fast",
+        )
+
+
+def test_storage_profile_row_groups(tmp_path, monkeypatch):
+    data = pl.DataFrame(
+        {
+            "league_id": [2, 1, 2, 1] * 250,
+            "match_day": list(range(1000)),
+            "team_id": [1] * 1000,
+            "team_name": ["a", "b"] * 500,
+        }
+    )
+    monkeypatch.setitem(
+        STORAGE_PROFILES,
+        "plain",
+        STORAGE_PROFILES["hot"] | {"row_group_size": 100, "dictionary": False},
+    )
+    for storage_profile in ["hot", "plain"]:
+        path = str(tmp_path / f"{storage_profile}.parquet")
+        _write_parquet(data.lazy(), path, "standings", storage_profile)
+        assert_frame_equal(pl.read_parquet(path), data.sort(["league_id", "match_day"]))
+
+    # sorted row groups cover a single league, which filters can skip
+    metadata = pq.ParquetFile(tmp_path / "plain.parquet").metadata
+    assert metadata.num_row_groups == 10
+    league_ids = [
+        (group.column(0).statistics.min, group.column(0).statistics.max)
+        for group in map(metadata.row_group, range(metadata.num_row_groups))
+    ]
+    assert league_ids == [(1, 1)] * 5 + [(2, 2)] * 5
+    assert "RLE_DICTIONARY" not in metadata.row_group(0).column(3).encodings
@@ -0,0 +1,79 @@
+import json
+
+from aktipp.etl import (
+    FeatureBuilderOpenligadb,
+    clean_openligadb,
+    create_standings_openligadb,
+)
+from aktipp.normalize import normalize_many_seasons_openligadb
+from aktipp.scraping import generate_many_seasons_openligadb
+from aktipp.tracing import trace
+
+
+def test_trace(tmp_path):
+    data_path = f"{tmp_path}/"
+    generate_many_seasons_openligadb(["bl1"], [2022, 2023], data_path, n_teams=4)
+
+    with trace(tmp_path / "trace.json") as tracer:
+        normalize_many_seasons_openligadb(["bl1"], [2022, 2023], data_path)
+        clean_openligadb(data_path, "matchResults")
+        create_standings_openligadb(
+            data_path + "matchResults_clean.parquet",
+            data_path + "standings.parquet",
+        )
+
+    stages = {stage.name: stage for stage in tracer.stages}
+    assert [stage.name for stage in tracer.stages] == [
+        "normalize_season_openligadb",
+        "normalize_season_openligadb",
+        "normalize_many_seasons_openligadb",
+        "clean_openligadb",
+        "create_standings_openligadb",
+    ]
+    assert stages["normalize_season_openligadb"].parent == (
+        "normalize_many_seasons_openligadb"
+    )
+
+    # 12 matches per season with a final and a half time result each
+    assert stages["normalize_season_openligadb"].rows_in == 12
+    assert stages["normalize_season_openligadb"].rows_out == 24
+    assert stages["clean_openligadb"].rows_out == 48
+    assert stages["create_standings_openligadb"].rows_in == 24
+    assert stages["create_standings_openligadb"].rows_out == 48
+    assert stages["clean_openligadb"].bytes_written > 0
+    for stage in tracer.stages:
+        assert stage.rss_end_mb > 0
+        assert stage.rss_delta_mb >= 0
+    assert "query" in stages["create_standings_openligadb"].plans
+    assert stages["clean_openligadb"].wall_time_s > 0
+
+    with open(tmp_path / "trace.json") as file:
+        assert len(json.load(file)) == 5
+
+
+def test_trace_stage_without_tracer(tmp_path):
+    data_path = f"{tmp_path}/"
+    generate_many_seasons_openligadb(["bl1"], [2023], data_path, n_teams=4)
+
+    # stages run without an active tracer
+    normalize_many_seasons_openligadb(["bl1"], [2023], data_path)
+
+    with trace() as tracer:
+        pass
+    assert tracer.stages == []
+
+
+def test_trace_profile(tmp_path):
+    data_path = f"{tmp_path}/"
+    generate_many_seasons_openligadb(["bl1"], [2023], data_path, n_teams=4)
+    normalize_many_seasons_openligadb(["bl1"], [2023], data_path)
+    clean_openligadb(data_path, "matchResults")
+
+    # the lazy features query is executed by the profile inside the stage
+    with trace(profile=True) as tracer:
+        FeatureBuilderOpenligadb().get_features(
+            data_path + "matchResults_clean.parquet", "", {}
+        )
+    (stage,) = tracer.stages
+    assert stage.name == "build_features_query"
+    assert stage.profiles["query"]
@@ -0,0 +1,252 @@
+import contextlib
+import contextvars
+import json
+import logging
+import os
+import resource
+import sys
+import time
+from collections.abc import Iterator
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import polars as pl
+
+logger = logging.getLogger(__name__)
+
+_CURRENT_TRACER = contextvars.ContextVar("aktipp_tracer", default=None)
+
+
+def _peak_rss_mb() -> float:
+    """Peak resident set size of the current process in MB, i.e. the high-water
+    mark since the process started."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes everywhere else
+    return peak / 1024**2 if sys.platform == "darwin" else peak / 1024
+
+
+def _current_rss_mb() -> float | None:
+    """Current resident set size of the current process in MB, None where it is not
+    available without further dependencies, i.e. outside of Linux."""
+    try:
+        with open("/proc/self/statm") as file:
+            pages = int(file.read().split()[1])
+    except OSError:
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE") / 1024**2
+
+
+def _count_rows(data: "pl.LazyFrame | pl.DataFrame | int") -> int:
+    """Count the rows of a frame. LazyFrames are executed for that."""
+    if isinstance(data, int):
+        return data
+    if hasattr(data, "collect"):
+        import polars as pl
+
+        return data.select(pl.len()).collect().item()
+    return len(data)
+
+
+class StageTrace:
+    """Measurements of one pipeline stage. Stages report rows, outputs and query
+    plans through the add_* and capture_plan methods.
+
+    Memory is reported per stage as the current RSS at the start and the end of the
+    stage and as rss_delta_mb, the growth of the process peak RSS during the stage,
+    which is 0 if the stage stayed below the peak of an earlier stage.
+    process_peak_rss_mb is the peak of the whole process at the end of the stage.
+    """
+
+    def __init__(self, name: str, parent: str | None, profile: bool, **attributes):
+        self.name = name
+        self.parent = parent
+        self.attributes = attributes
+        self.profile = profile
+        self.wall_time_s = None
+        self.cpu_time_s = None
+        self.rows_in = None
+        self.rows_out = None
+        self.bytes_written = None
+        self.rss_start_mb = None
+        self.rss_end_mb = None
+        self.rss_delta_mb = None
+        self.process_peak_rss_mb = None
+        self.plans = {}
+        self.profiles = {}
+
+    def add_rows_in(self, data: "pl.LazyFrame | pl.DataFrame | int") -> None:
+        """Add the rows of an input. LazyFrames are executed to count them."""
+        self.rows_in = (self.rows_in or 0) + _count_rows(data)
+
+    def add_rows_out(self, data: "pl.LazyFrame | pl.DataFrame | int") -> None:
+        """Add the rows of an output. LazyFrames are executed to count them."""
+        self.rows_out = (self.rows_out or 0) + _count_rows(data)
+
+    def add_output(self, path: str) -> None:
+        """Add the size of an output file. For parquet files the rows are added as
+        well, which only reads the file metadata."""
+        self.bytes_written = (self.bytes_written or 0) + os.path.getsize(path)
+        if path.endswith(".parquet"):
+            import polars as pl
+
+            self.add_rows_out(pl.scan_parquet(path))
+
+    def capture_plan(self, query: "pl.LazyFrame", name: str = "query") -> None:
+        """Capture the optimized plan of a lazy query. If the tracer was created with
+        profile=True, the query is executed with LazyFrame.profile() as well."""
+        self.plans[name] = query.explain()
+        if self.profile:
+            _, timings = query.profile()
+            self.profiles[name] = timings.to_dicts()
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "stage": self.name,
+            "parent": self.parent,
+            "attributes": self.attributes,
+            "wall_time_s": self.wall_time_s,
+            "cpu_time_s": self.cpu_time_s,
+            "rows_in": self.rows_in,
+            "rows_out": self.rows_out,
+            "bytes_written": self.bytes_written,
+            "rss_start_mb": self.rss_start_mb,
+            "rss_end_mb": self.rss_end_mb,
+            "rss_delta_mb": self.rss_delta_mb,
+            "process_peak_rss_mb": self.process_peak_rss_mb,
+            "plans": self.plans,
+            "profiles": self.profiles,
+        }
+
+
+class _NullStageTrace(StageTrace):
+    """Stage trace used when tracing is disabled. Nothing is executed or recorded."""
+
+    def __init__(self):
+        super().__init__("", None, False)
+
+    def add_rows_in(self, data) -> None: ...
+
+    def add_rows_out(self, data) -> None: ...
+
+    def add_output(self, path) -> None: ...
+
+    def capture_plan(self, query, name="query") -> None: ...
+
+
+_NULL_STAGE_TRACE = _NullStageTrace()
+
+
+class Tracer:
+    """Collect the traces of all stages run while the tracer is active.
+
+    Parameters
+    ----------
+    profile : bool, default=False
+        Execute captured lazy queries with LazyFrame.profile() as well. This runs the
+        queries a second time.
+    """
+
+    def __init__(self, profile: bool = False):
+        self.profile = profile
+        self.stages = []
+        self._stack = []
+
+    @contextlib.contextmanager
+    def stage(self, name: str, **attributes) -> Iterator[StageTrace]:
+        """Trace a stage. Every finished stage is logged as json on the
+        'aktipp.tracing' logger.
+
+        Parameters
+        ----------
+        name : str
+            Name of the stage, usually the name of the function.
+        **attributes
+            Additional attributes, e.g. league and season.
+
+        Yields
+        ------
+        stage_trace : StageTrace
+            Trace of the stage.
+        """
+        parent = self._stack[-1].name if self._stack else None
+        stage_trace = StageTrace(name, parent, self.profile, **attributes)
+        self._stack.append(stage_trace)
+        stage_trace.rss_start_mb = _current_rss_mb()
+        peak_start = _peak_rss_mb()
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield stage_trace
+        finally:
+            stage_trace.wall_time_s = time.perf_counter() - wall_start
+            stage_trace.cpu_time_s = time.process_time() - cpu_start
+            stage_trace.rss_end_mb = _current_rss_mb()
+            stage_trace.process_peak_rss_mb = _peak_rss_mb()
+            stage_trace.rss_delta_mb = stage_trace.process_peak_rss_mb - peak_start
+            self._stack.pop()
+            self.stages.append(stage_trace)
+            logger.info(json.dumps(stage_trace.to_dict(), default=str))
+
+    def to_dicts(self) -> list[dict[str, Any]]:
+        return [stage_trace.to_dict() for stage_trace in self.stages]
+
+    def dump(self, path: str) -> None:
+        """Write all stage traces to a json file.
+
+        Parameters
+        ----------
+        path : str
+            Path of the json trace file.
+        """
+        with open(path, "w") as file:
+            json.dump(self.to_dicts(), file, indent=2, default=str)
+
+
+@contextlib.contextmanager
+def trace(path: str | None = None, profile: bool = False) -> Iterator[Tracer]:
+    """Activate tracing for all pipeline stages run inside the context.
+
+    Parameters
+    ----------
+    path : str | None, default=None
+        Path of a json trace file written when the context exits.
+    profile : bool, default=False
+        Execute captured lazy queries with LazyFrame.profile() as well.
+
+    Yields
+    ------
+    tracer : Tracer
+        The active tracer.
+    """
+    tracer = Tracer(profile=profile)
+    token = _CURRENT_TRACER.set(tracer)
+    try:
+        yield tracer
+    finally:
+        _CURRENT_TRACER.reset(token)
+        if path is not None:
+            tracer.dump(path)
+
+
+@contextlib.contextmanager
+def trace_stage(name: str, **attributes) -> Iterator[StageTrace]:
+    """Trace a stage with the active tracer. Without an active tracer a no-op trace
+    is yielded, so stages pay nothing for the instrumentation.
+
+    Parameters
+    ----------
+    name : str
+        Name of the stage, usually the name of the function.
+    **attributes
+        Additional attributes, e.g. league and season.
+
+    Yields
+    ------
+    stage_trace : StageTrace
+        Trace of the stage.
+    """
+    tracer = _CURRENT_TRACER.get()
+    if tracer is None:
+        yield _NULL_STAGE_TRACE
+    else:
+        with tracer.stage(name, **attributes) as stage_trace:
+            yield stage_trace
@@ -0,0 +1,177 @@
+import datetime
+import json
+import multiprocessing
+import platform
+import resource
+import sys
+import time
+from collections.abc import Callable
+
+
+def _peak_rss_mb() -> float:
+    """Peak resident set size of the current process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes everywhere else
+    return peak / 1024**2 if sys.platform == "darwin" else peak / 1024
+
+
+def _measure_worker(
+    setup: Callable | None, function: Callable, args: tuple, connection
+) -> None:
+    """Run setup untimed, then time function and send the measurements back."""
+    try:
+        context = setup(*args) if setup is not None else None
+        peak_before = _peak_rss_mb()
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        function(*args) if context is None else function(*args, context)
+        wall_time, cpu_time = (
+            time.perf_counter() - wall_start,
+            time.process_time() - cpu_start,
+        )
+        peak_after = _peak_rss_mb()
+        connection.send(
+            {
+                "wall_time_s": wall_time,
+                "cpu_time_s": cpu_time,
+                "peak_rss_mb": peak_after,
+                "rss_delta_mb": peak_after - peak_before,
+            }
+        )
+    except BaseException as error:
+        connection.send({"error": repr(error)})
+        raise
+    finally:
+        connection.close()
+
+
+def measure(
+    function: Callable, args: tuple = (), setup: Callable | None = None
+) -> dict:
+    """Measure wall time, CPU time and peak RSS of a function in a fresh process, so
+    the memory high-water mark is not polluted by previous measurements.
+
+    Parameters
+    ----------
+    function : Callable
+        Module level function to measure. If setup returns something other than None,
+        it is passed as additional last argument.
+    args : tuple, default=()
+        Arguments passed to setup and function.
+    setup : Callable | None, default=None
+        Module level function that runs untimed in the same process before function.
+
+    Returns
+    -------
+    measurement : dict
+        wall_time_s, cpu_time_s, peak_rss_mb and rss_delta_mb, i.e. the growth of
+        the peak RSS during function.
+    """
+    context = multiprocessing.get_context("spawn")
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(
+        target=_measure_worker, args=(setup, function, args, sender)
+    )
+    process.start()
+    sender.close()
+    result = receiver.recv()
+    process.join()
+    if "error" in result:
+        raise RuntimeError(f"{function.__name__} failed: {result['error']}")
+    return result
+
+
+def write_results(results: list[dict], path: str) -> None:
+    """Write benchmark results together with some environment metadata as json.
+
+    Parameters
+    ----------
+    results : list[dict]
+        List of measurements, each with a "stage" and a "scale" key.
+    path : str
+        Path of the json file.
+    """
+    import numpy as np
+    import polars as pl
+
+    with open(path, "w") as file:
+        json.dump(
+            {
+                "created": datetime.datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "numpy": np.__version__,
+                "polars": pl.__version__,
+                "results": results,
+            },
+            file,
+            indent=2,
+        )
+
+
+def compare_results(
+    results: list[dict],
+    baseline_path: str,
+    metrics: tuple[str, ...] = ("wall_time_s", "rss_delta_mb"),
+    tolerance: float = 0.2,
+    min_difference: dict[str, float] | None = None,
+) -> list[str]:
+    """Compare results against a stored baseline and report regressions.
+
+    Parameters
+    ----------
+    results : list[dict]
+        List of measurements, each with a "stage" and a "scale" key.
+    baseline_path : str
+        Path of a json file written by write_results.
+    metrics : tuple[str, ...], default=("wall_time_s", "rss_delta_mb")
+        Metrics to compare, lower is better.
+    tolerance : float, default=0.2
+        Allowed relative increase over the baseline.
+    min_difference : dict[str, float] | None, default=None
+        Absolute increase per metric that is always treated as noise. Defaults to
+        50 ms and 10 MB.
+
+    Returns
+    -------
+    regressions : list[str]
+        Human readable description of every regression.
+    """
+    if min_difference is None:
+        min_difference = {"wall_time_s": 0.05, "rss_delta_mb": 10.0}
+
+    with open(baseline_path) as file:
+        baseline = {
+            (result["stage"], result["scale"]): result
+            for result in json.load(file)["results"]
+        }
+
+    regressions = []
+    for result in results:
+        key = (result["stage"], result["scale"])
+        if key not in baseline:
+            continue
+        for metric in metrics:
+            if metric not in result or metric not in baseline[key]:
+                continue
+            new, old = result[metric], baseline[key][metric]
+            if new > old * (1 + tolerance) and new - old > min_difference.get(
+                metric, 0.0
+            ):
+                regressions.append(
+                    f"{key[0]} [{key[1]}] {metric}: {old:.3f} -> {new:.3f} "
+                    f"(+{(new / old - 1) * 100 if old else float('inf'):.0f}%)"
+                )
+    return regressions
+
+
+def print_results(results: list[dict], metrics: tuple[str, ...]) -> None:
+    """Print results as a table."""
+    header = ["stage", "scale", *metrics]
+    rows = [
+        [str(result["stage"]), str(result["scale"])]
+        + [f"{result[metric]:.3f}" for metric in metrics]
+        for result in results
+    ]
+    widths = [max(len(row[i]) for row in [header, *rows]) for i in range(len(header))]
+    for row in [header, *rows]:
+        print("  ".join(cell.ljust(width) for cell, width in zip(row, widths)))
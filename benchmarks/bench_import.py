@@ -0,0 +1,132 @@
+"""Benchmark the import time of the aktipp package and its subpackages.
+
+Every import runs in a fresh interpreter. Besides the time, the heavy third party
+modules loaded by the import are reported, so an eager import of polars or numpy is
+caught even if it happens to be fast on the current machine:
+
+    python -m benchmarks.bench_import --output bench_import.json
+    python -m benchmarks.bench_import --baseline bench_import.json
+
+The exit code is 1 if any import regressed against the baseline or loaded a heavy
+module it must not load.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+from ._common import compare_results, print_results, write_results
+
+HEAVY_MODULES = ["numpy", "polars", "scipy", "sklearn"]
+
+# heavy modules every import must not load
+IMPORTS = {
+    "aktipp": HEAVY_MODULES,
+    "aktipp.scraping": HEAVY_MODULES,
+    "aktipp.tracing": HEAVY_MODULES,
+    "aktipp.normalize": HEAVY_MODULES,
+    "aktipp.etl": HEAVY_MODULES,
+    "aktipp.eval": ["polars", "scipy", "sklearn"],
+    "aktipp.live": HEAVY_MODULES,
+    "aktipp.models": HEAVY_MODULES,
+    "aktipp.serving": HEAVY_MODULES,
+    "aktipp.simulation": HEAVY_MODULES,
+}
+
+_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+wall_time = time.perf_counter() - start
+print(json.dumps({{
+    "wall_time_s": wall_time,
+    "loaded": [name for name in {heavy_modules!r} if name in sys.modules],
+}}))
+"""
+
+
+def measure_import(module: str) -> dict:
+    """Measure the import of a module in a fresh interpreter.
+
+    Parameters
+    ----------
+    module : str
+        Name of the module, e.g. 'aktipp.scraping'.
+
+    Returns
+    -------
+    measurement : dict
+        wall_time_s of the import and the heavy modules loaded by it.
+    """
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            _SCRIPT.format(module=module, heavy_modules=HEAVY_MODULES),
+        ],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+    return json.loads(output)
+
+
+def run(modules: list[str], repeat: int = 5) -> list[dict]:
+    """Run the benchmarks.
+
+    Parameters
+    ----------
+    modules : list[str]
+        Names of the modules in IMPORTS.
+    repeat : int, default=5
+        Number of imports per module, the fastest import is reported.
+
+    Returns
+    -------
+    results : list[dict]
+        Measurements for every module.
+    """
+    results = []
+    for module in modules:
+        runs = [measure_import(module) for _ in range(repeat)]
+        result = min(runs, key=lambda run: run["wall_time_s"])
+        results.append({"stage": module, "scale": "import", **result})
+        print(f"{module} {result['wall_time_s'] * 1000:.1f}ms")
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modules", nargs="+", default=list(IMPORTS), choices=IMPORTS)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default="bench_import.json")
+    parser.add_argument("--baseline", default=None)
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    results = run(args.modules, args.repeat)
+    write_results(results, args.output)
+    print()
+    print_results(results, ("wall_time_s",))
+
+    regressions = [
+        f"{result['stage']} loads {', '.join(forbidden)}"
+        for result in results
+        if (forbidden := sorted(set(result["loaded"]) & set(IMPORTS[result["stage"]])))
+    ]
+    if args.baseline is not None:
+        regressions += compare_results(
+            results,
+            args.baseline,
+            metrics=("wall_time_s",),
+            tolerance=args.tolerance,
+            min_difference={"wall_time_s": 0.01},
+        )
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
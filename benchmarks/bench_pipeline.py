@@ -0,0 +1,318 @@
+"""Benchmark every pipeline stage on synthetic openligadb data at several scales.
+
+Every stage runs in a fresh process, which reports wall time, CPU time and the growth
+of the peak RSS. Results are stored as json and can be compared against a baseline:
+
+    python -m benchmarks.bench_pipeline --scales small medium --output bench.json
+    python -m benchmarks.bench_pipeline --baseline bench.json
+
+The exit code is 1 if any stage regressed against the baseline.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+import numpy as np
+import polars as pl
+
+from aktipp.etl import (
+    GOALS_FEATURES,
+    FeatureBuilderOpenligadb,
+    clean_openligadb,
+    create_goal_events_openligadb,
+    create_head_to_head_openligadb,
+    create_performance_openligadb,
+    create_ratings_openligadb,
+    create_standings_openligadb,
+)
+from aktipp.eval import ak_score
+from aktipp.normalize import normalize_many_seasons_openligadb
+from aktipp.scraping import (
+    MirrorOpenligadb,
+    generate_many_seasons_openligadb,
+    scrape_many_seasons_openligadb,
+)
+from aktipp.serving import export_snapshot_openligadb, load_snapshot_openligadb
+
+from ._common import compare_results, measure, print_results, write_results
+
+SCALES = {
+    "small": {"leagues": ["bl1"], "seasons": list(range(2014, 2024)), "n_teams": 18},
+    "medium": {
+        "leagues": ["bl1", "bl2", "bl3"],
+        "seasons": list(range(1990, 2024)),
+        "n_teams": 18,
+    },
+    "large": {
+        "leagues": [f"league{i}" for i in range(30)],
+        "seasons": list(range(1990, 2024)),
+        "n_teams": 18,
+    },
+    "xlarge": {
+        "leagues": [f"league{i}" for i in range(100)],
+        "seasons": list(range(1990, 2024)),
+        "n_teams": 18,
+    },
+}
+
+STAGES = [
+    "scrape",
+    "normalize",
+    "clean",
+    "standings",
+    "performance",
+    "standings_sharded",
+    "performance_sharded",
+    "ratings",
+    "head_to_head",
+    "goals",
+    "goal_events",
+    "features",
+    "snapshot",
+    "load_parquet",
+    "load_snapshot",
+    "ak_score",
+]
+
+# at least 2 jobs, otherwise a single core machine measures the unsharded path
+_N_JOBS = max(2, os.cpu_count() or 1)
+
+
+def _paths(work_path: str) -> dict[str, str]:
+    return {
+        "raw": os.path.join(work_path, "raw", ""),
+        "scraped": os.path.join(work_path, "scraped", ""),
+        "clean": os.path.join(work_path, "raw", "matchResults_clean.parquet"),
+        "standings": os.path.join(work_path, "standings.parquet"),
+        "performance": os.path.join(work_path, "performance.parquet"),
+        "sharded": os.path.join(work_path, "sharded.parquet"),
+        "ratings": os.path.join(work_path, "ratings.parquet"),
+        "head_to_head": os.path.join(work_path, "head_to_head.parquet"),
+        "goals": os.path.join(work_path, "raw", "goals_clean.parquet"),
+        "goal_events": os.path.join(work_path, "goal_events.parquet"),
+        "snapshot": os.path.join(work_path, "snapshot"),
+    }
+
+
+def _prepare(work_path: str, scale: dict) -> None:
+    """Generate the raw json files of a scale."""
+    paths = _paths(work_path)
+    os.makedirs(paths["raw"], exist_ok=True)
+    os.makedirs(paths["scraped"], exist_ok=True)
+    generate_many_seasons_openligadb(
+        scale["leagues"],
+        scale["seasons"],
+        paths["raw"],
+        scale["n_teams"],
+        compression=scale["compression"],
+    )
+
+
+def _setup_scrape(work_path: str, scale: dict) -> str:
+    """Start a local openligadb mirror of the raw json files."""
+    return MirrorOpenligadb(_paths(work_path)["raw"]).start().url
+
+
+def _bench_scrape(work_path: str, scale: dict, base_url: str) -> None:
+    scrape_many_seasons_openligadb(
+        scale["leagues"],
+        scale["seasons"],
+        _paths(work_path)["scraped"],
+        base_url,
+        scale["compression"],
+    )
+
+
+def _bench_normalize(work_path: str, scale: dict) -> None:
+    normalize_many_seasons_openligadb(
+        scale["leagues"], scale["seasons"], _paths(work_path)["raw"]
+    )
+
+
+def _bench_clean(work_path: str, scale: dict) -> None:
+    clean_openligadb(_paths(work_path)["raw"], "matchResults")
+
+
+def _bench_standings(work_path: str, scale: dict) -> None:
+    paths = _paths(work_path)
+    create_standings_openligadb(paths["clean"], paths["standings"])
+
+
+def _bench_performance(work_path: str, scale: dict) -> None:
+    paths = _paths(work_path)
+    create_performance_openligadb(paths["clean"], paths["performance"])
+
+
+def _bench_standings_sharded(work_path: str, scale: dict) -> None:
+    paths = _paths(work_path)
+    create_standings_openligadb(paths["clean"], paths["sharded"], n_jobs=_N_JOBS)
+
+
+def _bench_performance_sharded(work_path: str, scale: dict) -> None:
+    paths = _paths(work_path)
+    create_performance_openligadb(paths["clean"], paths["sharded"], n_jobs=_N_JOBS)
+
+
+def _bench_ratings(work_path: str, scale: dict) -> None:
+    paths = _paths(work_path)
+    create_ratings_openligadb(paths["clean"], paths["ratings"])
+
+
+def _bench_head_to_head(work_path: str, scale: dict) -> None:
+    paths = _paths(work_path)
+    create_head_to_head_openligadb(paths["clean"], paths["head_to_head"])
+
+
+def _bench_goals(work_path: str, scale: dict) -> None:
+    raw_path = _paths(work_path)["raw"]
+    normalize_many_seasons_openligadb(
+        scale["leagues"], scale["seasons"], raw_path, records="goals"
+    )
+    clean_openligadb(raw_path, "goals", features=GOALS_FEATURES)
+
+
+def _bench_goal_events(work_path: str, scale: dict) -> None:
+    paths = _paths(work_path)
+    create_goal_events_openligadb(paths["clean"], paths["goals"], paths["goal_events"])
+
+
+def _bench_features(work_path: str, scale: dict) -> None:
+    paths = _paths(work_path)
+    FeatureBuilderOpenligadb().get_features(
+        paths["clean"],
+        "",
+        {
+            "overall_standings": paths["standings"],
+            "overall_performance": paths["performance"],
+            "elo_ratings": paths["ratings"],
+            "head_to_head": paths["head_to_head"],
+            "goal_events": paths["goal_events"],
+        },
+    ).collect()
+
+
+def _bench_snapshot(work_path: str, scale: dict) -> None:
+    paths = _paths(work_path)
+    export_snapshot_openligadb(
+        paths["snapshot"], paths["clean"], paths["standings"], paths["performance"]
+    )
+
+
+def _bench_load_parquet(work_path: str, scale: dict) -> None:
+    # the warm start of a worker without a snapshot
+    paths = _paths(work_path)
+    for name in ["clean", "standings", "performance"]:
+        pl.read_parquet(paths[name])
+
+
+def _bench_load_snapshot(work_path: str, scale: dict) -> None:
+    load_snapshot_openligadb(
+        _paths(work_path)["snapshot"], ["matches", "standings", "performance"]
+    )
+
+
+def _setup_ak_score(work_path: str, scale: dict):
+    n_matches = len(scale["leagues"]) * len(scale["seasons"])
+    n_matches *= scale["n_teams"] * (scale["n_teams"] - 1)
+    rng = np.random.default_rng(0)
+    return (
+        rng.integers(0, 5, size=(n_matches, 2)),
+        rng.integers(0, 5, size=(n_matches, 2)),
+    )
+
+
+def _bench_ak_score(work_path: str, scale: dict, arrays) -> None:
+    ak_score(*arrays)
+
+
+_BENCHMARKS = {
+    "scrape": (_setup_scrape, _bench_scrape),
+    "normalize": (None, _bench_normalize),
+    "clean": (None, _bench_clean),
+    "standings": (None, _bench_standings),
+    "performance": (None, _bench_performance),
+    "standings_sharded": (None, _bench_standings_sharded),
+    "performance_sharded": (None, _bench_performance_sharded),
+    "ratings": (None, _bench_ratings),
+    "head_to_head": (None, _bench_head_to_head),
+    "goals": (None, _bench_goals),
+    "goal_events": (None, _bench_goal_events),
+    "features": (None, _bench_features),
+    "snapshot": (None, _bench_snapshot),
+    "load_parquet": (None, _bench_load_parquet),
+    "load_snapshot": (None, _bench_load_snapshot),
+    "ak_score": (_setup_ak_score, _bench_ak_score),
+}
+
+
+def run(
+    scales: list[str],
+    stages: list[str],
+    repeat: int = 1,
+    compression: str | None = None,
+) -> list[dict]:
+    """Run the benchmarks.
+
+    Parameters
+    ----------
+    scales : list[str]
+        Names of the scales in SCALES.
+    stages : list[str]
+        Names of the stages in STAGES. Stages depend on the output of the previous
+        stages, so later stages cannot run without the earlier ones.
+    repeat : int, default=1
+        Number of runs per stage, the fastest run is reported.
+    compression : str | None, default=None
+        Compression of the raw json files, None, "gzip" or "zstd".
+
+    Returns
+    -------
+    results : list[dict]
+        Measurements for every stage and scale.
+    """
+    results = []
+    for scale_name in scales:
+        scale = SCALES[scale_name] | {"compression": compression}
+        with tempfile.TemporaryDirectory() as work_path:
+            _prepare(work_path, scale)
+            for stage in STAGES:
+                if stage not in stages:
+                    continue
+                setup, function = _BENCHMARKS[stage]
+                runs = [
+                    measure(function, (work_path, scale), setup) for _ in range(repeat)
+                ]
+                result = min(runs, key=lambda run: run["wall_time_s"])
+                results.append({"stage": stage, "scale": scale_name, **result})
+                print(f"{stage} [{scale_name}] {result['wall_time_s']:.3f}s")
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", nargs="+", default=["small"], choices=SCALES)
+    parser.add_argument("--stages", nargs="+", default=STAGES, choices=STAGES)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--compression", default=None, choices=["gzip", "zstd"])
+    parser.add_argument("--output", default="bench_pipeline.json")
+    parser.add_argument("--baseline", default=None)
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    results = run(args.scales, args.stages, args.repeat, args.compression)
+    write_results(results, args.output)
+    print()
+    print_results(results, ("wall_time_s", "cpu_time_s", "peak_rss_mb", "rss_delta_mb"))
+
+    if args.baseline is not None:
+        regressions = compare_results(results, args.baseline, tolerance=args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+"""Benchmark the parquet storage profiles on the pipeline artifacts.
+
+For every profile and artifact the file size, the write time and the time of
+filtered scans by league and match day are reported, i.e. the filters the
+downstream stages and the query service apply:
+
+    python -m benchmarks.bench_storage --scales medium --output bench_storage.json
+    python -m benchmarks.bench_storage --baseline bench_storage.json
+
+The exit code is 1 if any profile regressed against the baseline.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import polars as pl
+
+from aktipp._storage import STORAGE_PROFILES, _write_parquet
+from aktipp.etl import (
+    clean_openligadb,
+    create_performance_openligadb,
+    create_standings_openligadb,
+)
+from aktipp.normalize import normalize_many_seasons_openligadb
+
+from ._common import compare_results, print_results, write_results
+from .bench_pipeline import SCALES, _paths, _prepare
+
+ARTIFACTS = ["clean", "standings", "performance"]
+
+METRICS = ("size_mb", "write_time_s", "scan_time_s")
+
+
+def _create_artifacts(work_path: str, scale: dict) -> None:
+    """Run the pipeline up to the benchmarked artifacts."""
+    paths = _paths(work_path)
+    normalize_many_seasons_openligadb(scale["leagues"], scale["seasons"], paths["raw"])
+    clean_openligadb(paths["raw"], "matchResults")
+    create_standings_openligadb(paths["clean"], paths["standings"])
+    create_performance_openligadb(paths["clean"], paths["performance"])
+
+
+def _scan_filters(data: pl.DataFrame, n_queries: int = 20) -> list[pl.Expr]:
+    """Filters of single leagues and match day ranges, spread over all leagues."""
+    league_ids = data["league_id"].unique().sort()
+    step = max(1, len(league_ids) // n_queries)
+    return [
+        (pl.col("league_id") == league_id) & pl.col("match_day").is_between(10, 12)
+        for league_id in league_ids[::step][:n_queries]
+    ]
+
+
+def _measure_profile(
+    data: pl.DataFrame,
+    path: str,
+    artifact: str,
+    profile: str,
+    filters: list[pl.Expr],
+    repeat: int,
+) -> dict:
+    """Write an artifact with a profile and scan it with filters, the fastest of
+    repeat runs is reported."""
+    write_times, scan_times = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _write_parquet(data, path, artifact, profile)
+        write_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for predicate in filters:
+            pl.scan_parquet(path).filter(predicate).collect()
+        scan_times.append(time.perf_counter() - start)
+
+    return {
+        "size_mb": os.path.getsize(path) / 1024**2,
+        "write_time_s": min(write_times),
+        "scan_time_s": min(scan_times),
+        "row_groups": _count_row_groups(path),
+    }
+
+
+def _count_row_groups(path: str) -> int:
+    import pyarrow.parquet as pq
+
+    return pq.ParquetFile(path).metadata.num_row_groups
+
+
+def run(scales: list[str], profiles: list[str], repeat: int = 3) -> list[dict]:
+    """Run the benchmarks.
+
+    Parameters
+    ----------
+    scales : list[str]
+        Names of the scales in SCALES.
+    profiles : list[str]
+        Names of the profiles in STORAGE_PROFILES.
+    repeat : int, default=3
+        Number of runs per profile and artifact, the fastest run is reported.
+
+    Returns
+    -------
+    results : list[dict]
+        Measurements for every profile, artifact and scale.
+    """
+    results = []
+    for scale_name in scales:
+        scale = SCALES[scale_name] | {"compression": None}
+        with tempfile.TemporaryDirectory() as work_path:
+            _prepare(work_path, scale)
+            _create_artifacts(work_path, scale)
+            paths = _paths(work_path)
+            for artifact in ARTIFACTS:
+                data = pl.read_parquet(paths[artifact])
+                filters = _scan_filters(data)
+                for profile in profiles:
+                    path = os.path.join(work_path, f"{artifact}_{profile}.parquet")
+                    result = _measure_profile(
+                        data, path, artifact, profile, filters, repeat
+                    )
+                    results.append(
+                        {"stage": f"{artifact}/{profile}", "scale": scale_name} | result
+                    )
+                    print(
+                        f"{artifact}/{profile} [{scale_name}] "
+                        f"{result['size_mb']:.2f} MB"
+                    )
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", nargs="+", default=["small"], choices=SCALES)
+    parser.add_argument(
+        "--profiles",
+        nargs="+",
+        default=list(STORAGE_PROFILES),
+        choices=STORAGE_PROFILES,
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default="bench_storage.json")
+    parser.add_argument("--baseline", default=None)
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    results = run(args.scales, args.profiles, args.repeat)
+    write_results(results, args.output)
+    print()
+    print_results(results, (*METRICS, "row_groups"))
+
+    if args.baseline is not None:
+        regressions = compare_results(
+            results,
+            args.baseline,
+            metrics=METRICS,
+            tolerance=args.tolerance,
+            min_difference={"size_mb": 0.1, "write_time_s": 0.05, "scan_time_s": 0.01},
+        )
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())